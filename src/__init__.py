@@ -4,17 +4,31 @@ Package src - Application de détection d'objets.
 
 Structure:
 ├── core/           # Logique métier
+│   ├── admission.py
+│   ├── cache.py
+│   ├── cancellation.py
 │   ├── constants.py
 │   ├── data_types.py
-│   └── detector.py
+│   ├── disk_cache.py
+│   ├── detector.py
+│   ├── model_store.py
+│   ├── pool.py
+│   └── scheduler.py
 ├── ui/             # Interface utilisateur
 │   ├── styles.py
 │   └── ui_components.py
 ├── utils/          # Utilitaires
+│   ├── boxes.py
 │   ├── colors.py
+│   ├── gallery.py
 │   ├── image_utils.py
+│   ├── masks.py
+│   ├── preview.py
+│   ├── render_cache.py
+│   ├── rle.py
 │   └── visualization.py
 ├── app.py          # Point d'entrée
+├── precompute_examples.py  # Précalcul des détections des exemples
 └── config.py       # Configuration
 """
 
@@ -4,16 +4,69 @@ Application Streamlit pour la détection d'objets.
 Interface utilisateur avancée avec support des masques.
 """
 
+import functools
 import sys
+import threading
+import uuid
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
 
 # Ajouter le répertoire src au path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import numpy as np
 import streamlit as st
+from PIL import Image
 
+from config import (
+    ADMISSION_TIMEOUT_S,
+    COMPARISON_COLUMNS,
+    DATA_DIR,
+    DETECTOR_MEMORY_BUDGET_MB,
+    GALLERY_THUMBNAIL_DIR,
+    GALLERY_THUMBNAIL_SIZE,
+    INPUT_PREPROCESSING,
+    MAX_CONCURRENT_INFERENCES,
+    MAX_QUEUED_REQUESTS,
+    MIN_THRESHOLD,
+    MODEL_STORE_DIR,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_DISK_CACHE,
+    PREDICTION_DISK_CACHE_MB,
+    PRELOAD_MODELS,
+    PREVIEW_FORMAT,
+    PREVIEW_MAX_WIDTH,
+    PREVIEW_QUALITY,
+    RENDER_CACHE_SIZE,
+    SCHEDULER_MAX_BATCH_SIZE,
+    SCHEDULER_MAX_WAIT_MS,
+    SEGMENTATION_VIEW_ALPHA,
+    TILED_INFERENCE_MIN_PIXELS,
+    TILE_SIZE,
+    TILE_OVERLAP,
+    UPLOAD_CACHE_MB,
+    UPLOAD_DECODE_SIDE
+)
+from core.admission import AdmissionController, AdmissionRejected
+from core.cache import PredictionCache, hash_image
+from core.cancellation import CancellationToken, SessionJobs
+from core.data_types import Detection
+from core.disk_cache import DiskPredictionCache
 from core.detector import ObjectDetector
-from utils.image_utils import image_to_array
+from core.model_store import ModelStore
+from core.pool import DetectorPool
+from core.scheduler import InferenceScheduler
+from utils.gallery import GalleryIndex
+from utils.image_utils import DecodedImageCache, image_size, image_to_array
+from utils.preview import (
+    PreviewEncoder,
+    TransferStats,
+    column_width,
+    encode_image,
+    resize_for_preview,
+    scale_detections
+)
+from utils.render_cache import RenderCache
 from ui.styles import inject_css
 from ui.ui_components import (
     render_sidebar,
@@ -45,13 +98,217 @@ inject_css()
 # =============================================================================
 
 @st.cache_resource
-def load_detector(model_name: str) -> ObjectDetector:
-    """Charge et met en cache le détecteur."""
-    detector = ObjectDetector(model_name)
+def get_prediction_cache() -> PredictionCache:
+    """Cache des sorties brutes du modèle, partagé entre les sessions."""
+    store = None
+    if PREDICTION_DISK_CACHE is not None:
+        # Second niveau sur disque : conservé entre les redémarrages
+        store = DiskPredictionCache(
+            PREDICTION_DISK_CACHE,
+            max_bytes=PREDICTION_DISK_CACHE_MB << 20,
+            min_score=MIN_THRESHOLD
+        )
+    return PredictionCache(max_entries=PREDICTION_CACHE_SIZE, store=store)
+
+
+@st.cache_resource
+def get_render_cache() -> RenderCache:
+    """Calques de rendu des détections, partagés entre les sessions et les onglets."""
+    return RenderCache(max_entries=RENDER_CACHE_SIZE)
+
+
+@st.cache_resource
+def get_upload_cache() -> DecodedImageCache:
+    """Images chargées déjà décodées, par empreinte du fichier."""
+    return DecodedImageCache(max_bytes=UPLOAD_CACHE_MB << 20)
+
+
+def decode_upload(data: bytes) -> Image.Image:
+    """
+    Décode une image chargée, une seule fois par fichier.
+    
+    Si le modèle ne voit qu'une version réduite de l'image (prétraitement
+    actif, pas d'analyse par tuiles), les JPEG sont décodés à taille réduite.
+    """
+    target_side = None
+    if UPLOAD_DECODE_SIDE is not None and INPUT_PREPROCESSING is not None:
+        width, height = image_size(data)
+        if width * height <= TILED_INFERENCE_MIN_PIXELS:
+            target_side = UPLOAD_DECODE_SIDE
+    return Image.fromarray(get_upload_cache().get(data, target_side))
+
+
+@st.cache_resource
+def get_gallery_index() -> GalleryIndex:
+    """Index des images d'exemple et de leurs vignettes, partagé entre les sessions."""
+    return GalleryIndex(DATA_DIR / "exemple", GALLERY_THUMBNAIL_DIR, GALLERY_THUMBNAIL_SIZE)
+
+
+@st.cache_resource
+def get_transfer_stats() -> TransferStats:
+    """Octets d'aperçus envoyés et temps d'encodage, cumulés sur les exécutions."""
+    return TransferStats()
+
+
+def load_detector(model_name: str, cache: PredictionCache) -> ObjectDetector:
+    """Crée, charge et préchauffe un détecteur (appelé par le thread de chargement)."""
+    detector = ObjectDetector(
+        model_name,
+        cache=cache,
+        preprocess=INPUT_PREPROCESSING,
+        model_store=ModelStore(MODEL_STORE_DIR)
+    )
     detector.load()
     return detector
 
 
+@st.cache_resource
+def get_result_reader(model_name: str) -> ObjectDetector:
+    """
+    Détecteur non chargé qui lit les résultats déjà en cache d'un modèle
+    (exemples précalculés, images déjà analysées) sans attendre le modèle.
+    """
+    return ObjectDetector(
+        model_name,
+        cache=get_prediction_cache(),
+        preprocess=INPUT_PREPROCESSING
+    )
+
+
+@st.cache_resource
+def get_schedulers() -> Dict[str, InferenceScheduler]:
+    """Ordonnanceurs d'inférence par modèle, partagés entre les sessions."""
+    return {}
+
+
+@st.cache_resource
+def get_schedulers_lock() -> threading.Lock:
+    """Verrou de création des ordonnanceurs."""
+    return threading.Lock()
+
+
+@st.cache_resource
+def get_detector_pool() -> DetectorPool:
+    """
+    Pool des détecteurs chargés, partagé entre les sessions.
+    
+    Créé à la première exécution du script, donc à la première visite : les
+    modèles de PRELOAD_MODELS commencent alors à se charger en arrière-plan.
+    """
+    schedulers = get_schedulers()
+    
+    schedulers_lock = get_schedulers_lock()
+    
+    def close_scheduler(model_name: str, detector: ObjectDetector) -> None:
+        with schedulers_lock:
+            scheduler = schedulers.get(model_name)
+            if scheduler is None or scheduler.detector is not detector:
+                return
+            del schedulers[model_name]
+        # Sans attendre : le thread termine les requêtes en file puis s'arrête
+        scheduler.close(timeout=0)
+    
+    pool = DetectorPool(
+        functools.partial(load_detector, cache=get_prediction_cache()),
+        memory_budget=DETECTOR_MEMORY_BUDGET_MB << 20,
+        on_evict=close_scheduler
+    )
+    for model_name in PRELOAD_MODELS:
+        pool.preload(model_name)
+    return pool
+
+
+def get_scheduler(detector: ObjectDetector) -> InferenceScheduler:
+    """Retourne l'ordonnanceur d'inférence d'un détecteur du pool."""
+    schedulers = get_schedulers()
+    previous = None
+    with get_schedulers_lock():
+        scheduler = schedulers.get(detector.model_name)
+        if scheduler is None or scheduler.detector is not detector:
+            # Détecteur rechargé après une éviction : l'ancien ordonnanceur
+            # est remplacé et arrêté
+            previous = scheduler
+            scheduler = InferenceScheduler(
+                detector,
+                max_batch_size=SCHEDULER_MAX_BATCH_SIZE,
+                max_wait=SCHEDULER_MAX_WAIT_MS / 1000,
+                workers=MAX_CONCURRENT_INFERENCES
+            )
+            schedulers[detector.model_name] = scheduler
+    if previous is not None:
+        # Sans attendre : le thread termine les requêtes en file puis s'arrête
+        previous.close(timeout=0)
+    return scheduler
+
+
+@st.cache_resource
+def get_admission_controller() -> AdmissionController:
+    """Contrôle d'admission des inférences, partagé entre les sessions."""
+    # Autant de places que de threads par ordonnanceur (voir get_scheduler)
+    return AdmissionController(
+        max_concurrent=MAX_CONCURRENT_INFERENCES,
+        max_queue=MAX_QUEUED_REQUESTS,
+        timeout=ADMISSION_TIMEOUT_S
+    )
+
+
+@st.cache_resource
+def get_session_jobs() -> SessionJobs:
+    """Inférence en cours de chaque session, partagé entre les sessions."""
+    return SessionJobs()
+
+
+# =============================================================================
+# DÉTECTION
+# =============================================================================
+
+def needs_tiling(image_np: np.ndarray) -> bool:
+    """Indique si l'image est assez grande pour être analysée par tuiles."""
+    return image_np.shape[0] * image_np.shape[1] > TILED_INFERENCE_MIN_PIXELS
+
+
+def run_detection(
+    detector: ObjectDetector,
+    image_np: np.ndarray,
+    config: Dict,
+    cancel_token: Optional[CancellationToken] = None,
+    on_wait: Optional[Callable[[float], None]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> List[Detection]:
+    """
+    Exécute la détection sur une image, par tuiles si elle est très grande.
+
+    on_wait et on_progress mettent à jour la page pendant l'analyse : Streamlit
+    n'interrompt un script (nouvelle exécution demandée) qu'à un appel st.*.
+    """
+    # Filtre de classes appliqué avant la construction des détections et des masques
+    allowed_classes = config['selected_classes'] or None
+    if needs_tiling(image_np):
+        # Très grande image : analyse par tuiles pour borner la mémoire
+        return detector.detect_tiled(
+            image_np,
+            tile_size=TILE_SIZE,
+            overlap=TILE_OVERLAP,
+            threshold=config['threshold'],
+            max_detections=config['max_detections'],
+            generate_approx_masks=config['generate_approx_masks'],
+            allowed_classes=allowed_classes,
+            cancel_token=cancel_token,
+            on_progress=on_progress
+        )
+    # Requête regroupée avec celles des autres sessions (modèles acceptant
+    # des lots) ou exécutée par l'un des threads de l'ordonnanceur
+    return get_scheduler(detector).detect(
+        image_np,
+        threshold=config['threshold'],
+        max_detections=config['max_detections'],
+        generate_approx_masks=config['generate_approx_masks'],
+        allowed_classes=allowed_classes,
+        cancel_token=cancel_token,
+        on_wait=on_wait
+    )
+
+
 # =============================================================================
 # APPLICATION PRINCIPALE
 # =============================================================================
@@ -65,20 +322,19 @@ def main():
     # Header
     render_header()
     
-    # Charger le modèle
-    try:
-        with st.spinner(f"Chargement du modèle {config['model_name']}..."):
-            detector = load_detector(config['model_name'])
-        st.sidebar.success("✅ Modèle chargé")
-    except Exception as e:
-        st.error(f"❌ Erreur de chargement du modèle: {e}")
-        return
+    # Lancer le chargement du modèle en arrière-plan : la page reste utilisable
+    pool = get_detector_pool()
+    model_name = config['model_name']
+    pool.preload(model_name)
+    model_status = st.sidebar.empty()
+    if pool.status(model_name) == 'loading':
+        model_status.info(f"⏳ Chargement du modèle {model_name} en arrière-plan...")
     
     # Zone principale
     st.markdown("---")
     
     # Chargement d'image
-    image = render_image_upload()
+    image = render_image_upload(decode=decode_upload, gallery=get_gallery_index())
     
     if image is None:
         st.info("👆 Chargez une image pour commencer la détection")
@@ -92,35 +348,208 @@ def main():
     # Détection
     st.markdown("---")
     
-    with st.spinner("🔍 Analyse en cours..."):
-        image_np = image_to_array(image)
-        detections = detector.detect(
-            image_np,
-            threshold=config['threshold'],
-            max_detections=config['max_detections'],
-            generate_approx_masks=config['generate_approx_masks']
-        )
-        
-        # Filtrer par classe si nécessaire
-        if config['selected_classes']:
-            detections = [
-                d for d in detections 
-                if d.class_id in config['selected_classes']
-            ]
-    
-    # Afficher les résultats
-    if not detections:
-        st.warning("⚠️ Aucun objet détecté. Essayez de réduire le seuil de confiance.")
-        st.image(image, caption="Image originale", width="stretch")
-    else:
-        # Onglets pour différentes vues
-        view_tab1, view_tab2 = st.tabs(["🎯 Résultat", "↔️ Comparaison"])
+    image_np = image_to_array(image)
+    
+    # Résultat déjà en cache (exemple précalculé, image déjà analysée) :
+    # servi sans attendre le modèle ni passer par la file d'attente
+    cached = None
+    if not needs_tiling(image_np):
+        detector = get_result_reader(model_name)
+        cached = detector.lookup(image_np)
+    
+    # Sinon, attendre le modèle uniquement au moment de la détection
+    if cached is None:
+        try:
+            with st.spinner(f"Chargement et préchauffage du modèle {model_name}..."):
+                detector = pool.get(model_name)
+                if not detector.is_ready():
+                    detector.warmup()
+            source = "dépôt local" if detector.load_source == 'store' else "TensorFlow Hub"
+            model_status.success(
+                f"✅ Modèle prêt ({source} : {detector.load_time:.1f} s, "
+                f"préchauffage : {detector.warmup_time:.1f} s)"
+            )
+        except Exception as e:
+            model_status.empty()
+            st.error(f"❌ Erreur de chargement du modèle: {e}")
+            return
+    
+    status = st.empty()
+    
+    def show_queue_position(position: int, eta: Optional[float]) -> None:
+        wait = f" • attente estimée : ~{eta:.0f} s" if eta is not None else ""
+        status.info(f"⏳ Serveur occupé — position dans la file : {position}{wait}")
+    
+    def show_elapsed(elapsed: float) -> None:
+        status.info(f"🔍 Analyse en cours... {elapsed:.1f} s")
+    
+    def show_tiles(done: int, total: int) -> None:
+        status.info(f"🔍 Analyse par tuiles : {done} / {total}")
+    
+    # Jeton de l'inférence de la session, annulé si Streamlit interrompt l'exécution
+    session_id = st.session_state.setdefault('session_id', uuid.uuid4().hex)
+    jobs = get_session_jobs()
+    token = jobs.start(session_id)
+    try:
+        try:
+            if cached is not None:
+                detections = detector.postprocess(
+                    cached,
+                    image_np.shape[:2],
+                    threshold=config['threshold'],
+                    max_detections=config['max_detections'],
+                    generate_approx_masks=config['generate_approx_masks'],
+                    allowed_classes=config['selected_classes'] or None,
+                    cancel_token=token
+                )
+            else:
+                with get_admission_controller().admit(
+                    on_wait=show_queue_position,
+                    cancel_token=token
+                ):
+                    status.empty()
+                    with st.spinner("🔍 Analyse en cours..."):
+                        detections = run_detection(
+                            detector,
+                            image_np,
+                            config,
+                            cancel_token=token,
+                            on_wait=show_elapsed,
+                            on_progress=show_tiles
+                        )
+                    status.empty()
+        except AdmissionRejected as e:
+            status.empty()
+            if e.reason == 'queue_full':
+                st.warning("🚦 Trop de demandes en cours : réessayez dans quelques secondes.")
+            else:
+                st.warning("🚦 Le délai d'attente est dépassé : réessayez dans quelques instants.")
+            render_footer()
+            return
         
-        with view_tab1:
-            render_detection_results(image, detections, config)
+        # Aperçus à la largeur d'affichage, encodés une seule fois : pleine
+        # largeur de la zone principale, ou largeur d'une colonne (Comparaison)
+        encoder = PreviewEncoder(PREVIEW_FORMAT, PREVIEW_QUALITY)
+        preview = resize_for_preview(image, PREVIEW_MAX_WIDTH)
+        column_preview = resize_for_preview(
+            image, column_width(PREVIEW_MAX_WIDTH, COMPARISON_COLUMNS)
+        )
         
-        with view_tab2:
-            render_comparison_view(image, detections, config)
+        # Afficher les résultats
+        if not detections:
+            st.warning("⚠️ Aucun objet détecté. Essayez de réduire le seuil de confiance.")
+            st.image(encoder.encode(preview), caption="Image originale", width="stretch")
+        else:
+            # Un seul rendu par largeur, partagé par les deux onglets : changer
+            # une option d'affichage ne fait que recombiner les calques en cache
+            renderer = get_render_cache()
+            image_key = hash_image(image_np)
+            display_options = {
+                'show_boxes': config['show_boxes'],
+                'show_labels': config['show_labels'],
+                'show_masks': config['show_masks'],
+                'mask_alpha': config['mask_opacity'],
+            }
+            
+            scaled = {image.width: detections}
+            
+            def render_preview(target: Image.Image, **options) -> bytes:
+                """Rend les détections sur un aperçu et l'encode."""
+                if target.width not in scaled:
+                    scaled[target.width] = scale_detections(
+                        detections, target.width / image.width, target.height / image.height
+                    )
+                target_key = image_key if target is image else f"{image_key}@{target.width}"
+                return encoder.encode(renderer.render(
+                    target, scaled[target.width], **options, image_key=target_key
+                ))
+            
+            result_image = render_preview(preview, **display_options)
+            column_result_image = result_image
+            if column_preview is not preview:
+                column_result_image = render_preview(column_preview, **display_options)
+            mask_image = None
+            if config['show_masks'] and any(d.has_mask for d in detections):
+                mask_image = render_preview(
+                    preview,
+                    show_boxes=False,
+                    show_labels=False,
+                    mask_alpha=SEGMENTATION_VIEW_ALPHA
+                )
+            
+            # Pleine résolution uniquement au téléchargement
+            def download_data() -> bytes:
+                full = renderer.render(image, detections, **display_options, image_key=image_key)
+                return encode_image(full, 'PNG')
+            
+            # Onglets pour différentes vues
+            view_tab1, view_tab2 = st.tabs(["🎯 Résultat", "↔️ Comparaison"])
+            
+            with view_tab1:
+                render_detection_results(
+                    image, detections, config, result_image, download_data
+                )
+            
+            with view_tab2:
+                render_comparison_view(
+                    image, detections, config, column_result_image, mask_image,
+                    original_image=encoder.encode(column_preview)
+                )
+        get_transfer_stats().record(encoder)
+    except BaseException:
+        # Interruption par Streamlit (rerun, arrêt) ou erreur : abandonner le travail restant
+        token.cancel()
+        raise
+    finally:
+        jobs.finish(session_id, token)
+    
+    mask_stats = detector.mask_stats.as_dict()
+    st.sidebar.caption(
+        f"🎭 Masques construits : {mask_stats['built']} • "
+        f"ignorés : {mask_stats['skipped']}"
+    )
+    scheduler = get_schedulers().get(detector.model_name)
+    if scheduler is not None:
+        scheduler_stats = scheduler.stats()
+        if scheduler.max_batch_size > 1:
+            st.sidebar.caption(
+                f"📦 Lots d'inférence : {scheduler_stats['batches']} • "
+                f"taille moyenne : {scheduler_stats['mean_batch_size']:.1f}"
+            )
+        else:
+            # Une image par appel : les requêtes sont parallélisées, pas regroupées
+            st.sidebar.caption(
+                f"📦 Inférences : {scheduler_stats['batches']} • "
+                f"threads : {scheduler_stats['workers']}"
+            )
+    store = get_prediction_cache().store
+    if store is not None:
+        disk_stats = store.stats()
+        st.sidebar.caption(
+            f"💾 Cache disque : {disk_stats['entries']} résultats "
+            f"({disk_stats['bytes'] >> 20} Mo) • "
+            f"succès : {disk_stats['hit_rate']:.0%}"
+        )
+    layer_stats = get_render_cache().stats()
+    st.sidebar.caption(
+        f"🖼️ Rendus réutilisés : {layer_stats['hits']} • "
+        f"calques construits : {layer_stats['layers_built']}"
+    )
+    transfer_stats = get_transfer_stats().stats()
+    st.sidebar.caption(
+        f"📤 Aperçus : {transfer_stats['bytes_per_run'] / 1024:.0f} Ko par exécution • "
+        f"encodage : {transfer_stats['encode_time_per_run'] * 1e3:.0f} ms"
+    )
+    job_stats = jobs.stats()
+    st.sidebar.caption(
+        f"🛑 Inférences annulées : {job_stats['cancelled']} / {job_stats['started']}"
+    )
+    pool_stats = pool.stats()
+    st.sidebar.caption(
+        f"🧠 Modèles chargés : {pool_stats['entries']} "
+        f"({pool_stats['memory_used'] >> 20} / {pool_stats['memory_budget'] >> 20} Mo) • "
+        f"évictions : {pool_stats['evictions']}"
+    )
     
     # Footer
     render_footer()
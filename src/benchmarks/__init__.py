@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Package benchmarks - Micro-benchmarks de performance.
+
+Chaque module s'exécute depuis le dossier src :
+
+    python -m benchmarks.bench_postprocess
+"""
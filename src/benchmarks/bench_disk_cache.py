@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du cache persistant des sorties du modèle.
+
+Enregistre des sorties de la forme de celles de Mask R-CNN (100 candidats,
+masques 33x33) pour chaque image de data/exemple, puis mesure, après
+réouverture de la base comme après un redémarrage, le temps de relecture de
+tous les résultats (empreinte de l'image comprise).
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_disk_cache
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DATA_DIR
+from core.cache import PredictionCache
+from core.disk_cache import DiskPredictionCache
+from utils.image_utils import image_to_array, load_image
+
+
+def make_results(seed: int, num_candidates: int = 100) -> dict:
+    """Construit des sorties aléatoires de la forme de celles de Mask R-CNN."""
+    rng = np.random.default_rng(seed)
+    return {
+        'detection_boxes': rng.random((1, num_candidates, 4), dtype=np.float32),
+        'detection_scores': np.sort(rng.random(num_candidates, dtype=np.float32))[::-1][np.newaxis],
+        'detection_classes': rng.integers(1, 91, (1, num_candidates)).astype(np.float32),
+        'detection_masks': rng.random((1, num_candidates, 33, 33), dtype=np.float32),
+        'num_detections': np.array([num_candidates], dtype=np.float32),
+    }
+
+
+def main() -> None:
+    """Exécute le benchmark et affiche les temps."""
+    paths = sorted(
+        path for path in (DATA_DIR / "exemple").rglob("*")
+        if path.suffix.lower() in ('.jpg', '.jpeg', '.png')
+    )
+    images = [image_to_array(load_image(str(path))) for path in paths]
+    keys = [
+        PredictionCache.make_key(image, "Mask R-CNN Inception ResNet V2", "resize-v1")
+        for image in images
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "predictions.sqlite3"
+        cache = DiskPredictionCache(database)
+        start = time.perf_counter()
+        for index, key in enumerate(keys):
+            cache.put(key, make_results(index))
+        write_time = time.perf_counter() - start
+        cache.close()
+
+        # Réouverture : équivalent d'un redémarrage du serveur
+        start = time.perf_counter()
+        cache = DiskPredictionCache(database)
+        keys = [
+            PredictionCache.make_key(image, "Mask R-CNN Inception ResNet V2", "resize-v1")
+            for image in images
+        ]
+        hash_time = time.perf_counter() - start
+        results = [cache.get(key) for key in keys]
+        read_time = time.perf_counter() - start
+        assert all(result is not None for result in results)
+
+        stats = cache.stats()
+        print(f"images            : {len(images)}")
+        print(f"taille de la base : {stats['bytes'] / 1024:.0f} Ko "
+              f"({stats['bytes'] / len(images) / 1024:.1f} Ko par image)")
+        print(f"écriture          : {write_time * 1e3:.1f} ms")
+        print(f"relecture à froid : {read_time * 1e3:.1f} ms "
+              f"({read_time / len(images) * 1e3:.2f} ms par image, "
+              f"dont {hash_time * 1e3:.1f} ms d'empreintes)")
+
+
+if __name__ == "__main__":
+    main()
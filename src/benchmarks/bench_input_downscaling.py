@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la réduction des images à la résolution native des modèles.
+
+Pour chaque modèle, mesure la latence de predict() sur une image de 12 MP
+en pleine résolution puis avec le prétraitement 'resize' et 'letterbox'.
+Les modèles sont téléchargés depuis TensorFlow Hub au premier lancement.
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_input_downscaling
+    python -m benchmarks.bench_input_downscaling --models "SSD MobileNet V2" "EfficientDet D0"
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import AVAILABLE_MODELS
+from core.detector import ObjectDetector
+
+
+IMAGE_SIZE = (3000, 4000)
+
+
+def _median_latency(detector: ObjectDetector, image: np.ndarray, repeat: int) -> float:
+    """Latence médiane de predict(), après un appel de chauffe."""
+    detector.predict(image)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        detector.predict(image)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    """Exécute le benchmark sur les modèles demandés."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--models', nargs='+', default=list(AVAILABLE_MODELS))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (*IMAGE_SIZE, 3), dtype=np.uint8)
+    print(f"Image {IMAGE_SIZE[1]}x{IMAGE_SIZE[0]} ({IMAGE_SIZE[0] * IMAGE_SIZE[1] / 1e6:.0f} MP)")
+    print(f"{'modèle':<36} {'entrée':>10} {'pleine (ms)':>12} {'resize (ms)':>12} "
+          f"{'letterbox (ms)':>15} {'gain':>10}")
+
+    for name in args.models:
+        full = ObjectDetector(name)
+        full.load()
+        latencies = {None: _median_latency(full, image, args.repeat)}
+        for mode in ('resize', 'letterbox'):
+            reduced = ObjectDetector(name, preprocess=mode)
+            reduced.model = full.model
+            latencies[mode] = _median_latency(reduced, image, args.repeat)
+
+        saved = latencies[None] - latencies['resize']
+        height, width = full.input_size
+        print(f"{name:<36} {f'{width}x{height}':>10} {latencies[None] * 1e3:>12.0f} "
+              f"{latencies['resize'] * 1e3:>12.0f} {latencies['letterbox'] * 1e3:>15.0f} "
+              f"{saved * 1e3:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la composition des masques.
+
+Compare trois rendus de draw_masks_only() :
+
+- plein cadre : le rendu d'origine (_draw_mask), qui pour chaque détection
+  seuille un masque float32 de la taille de l'image, crée une image RGBA
+  de la couleur de la taille de l'image et la colle sur le calque ;
+- collages recadrés : la même boucle limitée à la zone de chaque masque ;
+- une passe : le compositeur actuel (carte d'indices, table de couleurs,
+  un seul mélange alpha).
+
+Les masques pleine image du rendu d'origine sont remplis dans un tampon
+réutilisé, hors du temps mesuré (ils étaient produits par le détecteur).
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_mask_compositing
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+from utils.colors import get_color_rgba
+from utils.visualization import draw_masks_only
+
+
+IMAGE_SIZE = (3000, 4000)
+
+
+def make_detections(count: int, seed: int = 0):
+    """Construit des détections aux masques recadrés (ellipses) aléatoires."""
+    rng = np.random.default_rng(seed)
+    height, width = IMAGE_SIZE
+    detections = []
+    for _ in range(count):
+        box_w = int(rng.integers(width // 20, width // 4))
+        box_h = int(rng.integers(height // 20, height // 4))
+        left = int(rng.integers(0, width - box_w))
+        top = int(rng.integers(0, height - box_h))
+        ys, xs = np.ogrid[:box_h, :box_w]
+        mask = ((ys / box_h - 0.5) ** 2 + (xs / box_w - 0.5) ** 2) <= 0.25
+        detections.append(Detection(
+            int(rng.integers(1, 91)), 'objet', 0.9,
+            (left, top, left + box_w, top + box_h),
+            mask=mask, mask_origin=(left, top)
+        ))
+    return detections
+
+
+def full_frame_draw_masks_only(image, detections, alpha=150):
+    """
+    Rendu d'origine : un masque et une couleur pleine image par détection.
+
+    Returns:
+        Tuple (image rendue, temps de rendu en secondes hors remplissage
+        des masques pleine image)
+    """
+    elapsed = 0.0
+    start = time.perf_counter()
+    result = image.copy().convert('RGBA')
+    mask_layer = Image.new('RGBA', result.size, (0, 0, 0, 0))
+    elapsed += time.perf_counter() - start
+
+    full_mask = np.zeros(IMAGE_SIZE, dtype=np.float32)
+    for detection in detections:
+        # Masque pleine image tel que le produisait le détecteur (non mesuré)
+        full_mask.fill(0.0)
+        left, top = detection.mask_origin
+        mask = detection.mask
+        full_mask[top:top + mask.shape[0], left:left + mask.shape[1]] = mask
+
+        start = time.perf_counter()
+        mask_image = Image.fromarray((full_mask > 0.5).astype(np.uint8) * 255, mode='L')
+        color_image = Image.new('RGBA', mask_layer.size, get_color_rgba(detection.class_id, alpha))
+        mask_layer.paste(color_image, (0, 0), mask_image)
+        elapsed += time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = Image.alpha_composite(result, mask_layer).convert('RGB')
+    elapsed += time.perf_counter() - start
+    return result, elapsed
+
+
+def cropped_draw_masks_only(image, detections, alpha=150):
+    """Collages recadrés : un collage par détection, limité à la zone du masque."""
+    result = image.copy().convert('RGBA')
+    mask_layer = Image.new('RGBA', result.size, (0, 0, 0, 0))
+    for detection in detections:
+        mask_image = Image.fromarray((detection.mask > 0.5).astype(np.uint8) * 255, mode='L')
+        color_image = Image.new('RGBA', mask_image.size, get_color_rgba(detection.class_id, alpha))
+        mask_layer.paste(color_image, detection.mask_origin, mask_image)
+    return Image.alpha_composite(result, mask_layer).convert('RGB')
+
+
+def best_time(function, repeat: int = 3) -> float:
+    """Meilleur temps d'exécution sur repeat essais, en secondes."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Exécute le benchmark et affiche les temps par image."""
+    rng = np.random.default_rng(1)
+    image = Image.fromarray(
+        rng.integers(0, 256, (*IMAGE_SIZE, 3), dtype=np.uint8)
+    )
+    print(f"image {IMAGE_SIZE[1]}x{IMAGE_SIZE[0]}")
+    print(f"{'masques':>8} {'plein cadre (ms)':>17} {'recadrés (ms)':>14} "
+          f"{'une passe (ms)':>15} {'gain':>6}")
+    for count in (10, 50, 100):
+        detections = make_detections(count)
+        expected = np.array(draw_masks_only(image, detections))
+        full_frame, _ = full_frame_draw_masks_only(image, detections)
+        assert np.array_equal(np.array(full_frame), expected)
+        assert np.array_equal(np.array(cropped_draw_masks_only(image, detections)), expected)
+
+        full_time = min(full_frame_draw_masks_only(image, detections)[1] for _ in range(3))
+        cropped_time = best_time(lambda: cropped_draw_masks_only(image, detections))
+        new_time = best_time(lambda: draw_masks_only(image, detections))
+        print(f"{count:>8d} {full_time * 1e3:>17.1f} {cropped_time * 1e3:>14.1f} "
+              f"{new_time * 1e3:>15.1f} {full_time / new_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
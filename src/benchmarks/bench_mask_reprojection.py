@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark de la reprojection des masques Mask R-CNN.
+
+Compare l'ancienne reprojection (un tf.image.resize par détection, puis
+copie dans un masque float32 pleine image) à reproject_masks(), qui calcule
+tous les masques recadrés par produits matriciels groupés.
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_mask_reprojection
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.masks import reproject_masks
+
+
+IMAGE_SIZE = (3000, 4000)
+
+
+def make_instances(count: int, seed: int = 0):
+    """Construit des masques bruts 33x33 et des boîtes aléatoires."""
+    rng = np.random.default_rng(seed)
+    height, width = IMAGE_SIZE
+    masks = rng.random((count, 33, 33)).astype(np.float32)
+    box_w = rng.integers(width // 20, width // 3, count)
+    box_h = rng.integers(height // 20, height // 3, count)
+    left = rng.integers(0, width - box_w)
+    top = rng.integers(0, height - box_h)
+    boxes = np.stack([left, top, left + box_w, top + box_h], axis=1)
+    return masks, boxes
+
+
+def legacy_reprojection(masks, boxes):
+    """Ancienne implémentation : appels TF par détection et masques pleine image."""
+    height, width = IMAGE_SIZE
+    result = []
+    for mask, (x1, y1, x2, y2) in zip(masks, boxes):
+        resized = tf.image.resize(
+            mask[..., tf.newaxis], [max(y2 - y1, 1), max(x2 - x1, 1)],
+            method='bilinear'
+        ).numpy()[:, :, 0]
+        full = np.zeros((height, width), dtype=np.float32)
+        full[y1:y2, x1:x2] = resized[:y2 - y1, :x2 - x1]
+        result.append(full)
+    return result
+
+
+def _best_time(func, repeat: int = 3) -> float:
+    """Retourne le meilleur temps d'exécution sur repeat essais."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Exécute le benchmark à 10, 50 et 100 instances."""
+    print(f"Image {IMAGE_SIZE[1]}x{IMAGE_SIZE[0]}")
+    print(f"{'instances':>10} {'ancien (ms)':>12} {'nouveau (ms)':>13} {'gain':>6} "
+          f"{'mémoire ancienne':>17} {'mémoire nouvelle':>17}")
+    for count in (10, 50, 100):
+        masks, boxes = make_instances(count)
+        new_masks = reproject_masks(masks, boxes, IMAGE_SIZE)
+        old_time = _best_time(lambda: legacy_reprojection(masks, boxes))
+        new_time = _best_time(lambda: reproject_masks(masks, boxes, IMAGE_SIZE))
+        old_bytes = count * IMAGE_SIZE[0] * IMAGE_SIZE[1] * 4
+        new_bytes = sum(mask.nbytes for mask in new_masks)
+        print(f"{count:>10d} {old_time * 1e3:>12.1f} {new_time * 1e3:>13.1f} "
+              f"{old_time / new_time:>5.1f}x {old_bytes / 1e6:>14.0f} Mo "
+              f"{new_bytes / 1e6:>14.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark du post-traitement de ObjectDetector.
+
+Compare l'ancienne boucle Python (un float()/int()/get_label() par candidat)
+au post-traitement vectorisé de ObjectDetector.postprocess(), sans génération
+de masques pour ne mesurer que le seuillage, le top-k et la conversion des boîtes.
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_postprocess
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import COCO_LABELS
+from core.data_types import Detection
+from core.detector import ObjectDetector
+from utils.helpers import get_label
+
+
+def make_results(num_candidates: int = 100, seed: int = 0) -> dict:
+    """Construit des sorties brutes aléatoires triées par score décroissant."""
+    rng = np.random.default_rng(seed)
+    corners = np.sort(rng.random((num_candidates, 2, 2), dtype=np.float32), axis=1)
+    boxes = corners.transpose(0, 2, 1).reshape(num_candidates, 4)[:, [0, 2, 1, 3]]
+    return {
+        'detection_boxes': boxes[np.newaxis],
+        'detection_scores': np.sort(rng.random(num_candidates, dtype=np.float32))[::-1][np.newaxis],
+        'detection_classes': rng.integers(1, 91, num_candidates).astype(np.float32)[np.newaxis],
+    }
+
+
+def legacy_postprocess(results, image_shape, threshold=0.5, max_detections=100):
+    """Ancienne implémentation : boucle Python sur chaque candidat."""
+    boxes = results['detection_boxes'][0]
+    classes = results['detection_classes'][0].astype(int)
+    scores = results['detection_scores'][0]
+    height, width = image_shape
+    detections = []
+    for i in range(min(len(scores), max_detections)):
+        if scores[i] >= threshold:
+            ymin, xmin, ymax, xmax = boxes[i]
+            detections.append(Detection(
+                class_id=int(classes[i]),
+                class_name=get_label(int(classes[i]), COCO_LABELS),
+                confidence=float(scores[i]),
+                box=(int(xmin * width), int(ymin * height),
+                     int(xmax * width), int(ymax * height)),
+            ))
+    return detections
+
+
+def main(repeat: int = 2000) -> None:
+    """Exécute le benchmark et affiche les temps par appel."""
+    detector = ObjectDetector("SSD MobileNet V2")
+    image_shape = (3000, 4000)
+    print(f"{'seuil':>6} {'gardées':>8} {'ancien (µs)':>12} {'nouveau (µs)':>13} {'gain':>6}")
+    for threshold in (0.9, 0.5, 0.0):
+        results = make_results()
+        old = legacy_postprocess(results, image_shape, threshold)
+        new = detector.postprocess(results, image_shape, threshold,
+                                   generate_approx_masks=False)
+        assert [d.to_dict() for d in old] == [d.to_dict() for d in new]
+        
+        old_time = timeit.timeit(
+            lambda: legacy_postprocess(results, image_shape, threshold),
+            number=repeat
+        ) / repeat
+        new_time = timeit.timeit(
+            lambda: detector.postprocess(results, image_shape, threshold,
+                                         generate_approx_masks=False),
+            number=repeat
+        ) / repeat
+        print(f"{threshold:>6.1f} {len(new):>8d} {old_time * 1e6:>12.1f} "
+              f"{new_time * 1e6:>13.1f} {old_time / new_time:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du décodage des images chargées.
+
+Pour des JPEG de 12, 24 et 48 mégapixels, compare l'ancien chargement
+(Image.open, conversion RGB et np.array en pleine résolution) au décodage
+réduit en mode brouillon de decode_image(), puis à une relecture depuis le
+DecodedImageCache (réexécution du script avec la même image).
+
+Usage (depuis src/) :
+    python -m benchmarks.bench_upload_decode
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import UPLOAD_DECODE_SIDE
+from utils.image_utils import DecodedImageCache, decode_image
+
+
+SIZES = {12: (4000, 3000), 24: (6000, 4000), 48: (8000, 6000)}
+
+
+def make_jpeg(size, quality: int = 90, seed: int = 0) -> bytes:
+    """Encode une image synthétique (dégradés et bruit) en JPEG."""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    ys, xs = np.ogrid[:height, :width]
+    base = ((xs * 255 // width + ys * 255 // height) // 2).astype(np.uint8)
+    pixels = np.stack([base, base[::-1], np.broadcast_to(base[:, ::-1], base.shape)], axis=-1)
+    pixels = pixels + rng.integers(0, 16, pixels.shape, dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def legacy_decode(data: bytes) -> np.ndarray:
+    """Ancien chargement : décodage et conversion en pleine résolution."""
+    image = Image.open(io.BytesIO(data))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return np.array(image)
+
+
+def best_time(function, repeat: int = 3) -> float:
+    """Meilleur temps d'exécution sur repeat essais, en secondes."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Exécute le benchmark et affiche les temps par image."""
+    print(f"grand côté visé : {UPLOAD_DECODE_SIDE} px")
+    print(f"{'Mpx':>4} {'fichier':>8} {'plein (ms)':>11} {'réduit (ms)':>12} "
+          f"{'taille réduite':>15} {'cache (ms)':>11}")
+    for megapixels, size in SIZES.items():
+        data = make_jpeg(size)
+        full_time = best_time(lambda: legacy_decode(data))
+        draft_time = best_time(lambda: np.asarray(decode_image(data, UPLOAD_DECODE_SIDE)))
+        reduced = decode_image(data, UPLOAD_DECODE_SIDE).size
+
+        cache = DecodedImageCache()
+        cache.get(data, UPLOAD_DECODE_SIDE)
+        cached_time = best_time(lambda: cache.get(data, UPLOAD_DECODE_SIDE))
+
+        print(f"{megapixels:>4d} {len(data) >> 20:>5d} Mo {full_time * 1e3:>11.0f} "
+              f"{draft_time * 1e3:>12.0f} {f'{reduced[0]}x{reduced[1]}':>15} "
+              f"{cached_time * 1e3:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
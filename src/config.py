@@ -18,6 +18,9 @@ DATA_DIR = ROOT_DIR / "data"
 # Répertoire source
 SRC_DIR = ROOT_DIR / "src"
 
+# Dépôt local des modèles (python -m core.model_store import <modèle>)
+MODEL_STORE_DIR = ROOT_DIR / "models"
+
 
 # =============================================================================
 # CONFIGURATION STREAMLIT
@@ -38,6 +41,10 @@ STREAMLIT_CONFIG = {
 # Seuil de confiance par défaut
 DEFAULT_THRESHOLD = 0.5
 
+# Seuil de confiance minimum proposé par l'interface ; le cache disque ne
+# conserve pas les détections de score inférieur
+MIN_THRESHOLD = 0.05
+
 # Taille minimale de la police pour les labels
 MIN_FONT_SIZE = 12
 
@@ -50,6 +57,86 @@ DEFAULT_FONT_SIZE = 16
 # Épaisseur des lignes des boîtes
 BOX_LINE_WIDTH = 3
 
+# Opacité des masques dans la vue segmentation de l'onglet Comparaison
+SEGMENTATION_VIEW_ALPHA = 180
+
+# Images chargées : les JPEG sont décodés directement à taille réduite (mode
+# brouillon, grand côté d'au moins UPLOAD_DECODE_SIDE pixels, la largeur des
+# aperçus) quand le modèle n'en voit qu'une version réduite (INPUT_PREPROCESSING
+# actif) ; None = toujours en pleine résolution.
+# Les images analysées par tuiles sont toujours décodées en pleine résolution.
+UPLOAD_DECODE_SIDE = 1280
+
+# Taille maximale des images décodées conservées entre les exécutions (Mo)
+UPLOAD_CACHE_MB = 256
+
+# Galerie d'exemples : vignettes précalculées sur disque (régénérées si
+# l'image source change), plus grand côté en pixels, et images par page
+GALLERY_THUMBNAIL_DIR = ROOT_DIR / "cache" / "thumbnails"
+GALLERY_THUMBNAIL_SIZE = 256
+GALLERY_PAGE_SIZE = 8
+
+# Aperçus : rendus à cette largeur (zone principale en mise en page large),
+# encodés une fois ('JPEG' ou 'PNG', qualité JPEG 1-95) ; la pleine
+# résolution n'est rendue que pour le téléchargement. Streamlit ne transmet
+# pas la largeur réelle de la fenêtre au serveur : c'est une largeur fixe.
+# Les vues en colonnes (onglet Comparaison) reçoivent la largeur d'une colonne.
+PREVIEW_MAX_WIDTH = 1280
+COMPARISON_COLUMNS = 2
+PREVIEW_FORMAT = "JPEG"
+PREVIEW_QUALITY = 85
+
+# Nombre de couples (image, détections) dont les calques de rendu sont
+# conservés : changer une option d'affichage ne fait que les recombiner
+RENDER_CACHE_SIZE = 4
+
+# Prétraitement des images avant l'inférence : None (pleine résolution, par
+# défaut), ou sur option "resize" / "letterbox" (réduction à la résolution
+# native du modèle). La réduction modifie les détections : mesurer latence et
+# précision (benchmarks/bench_input_downscaling.py) avant de l'activer
+INPUT_PREPROCESSING = None
+
+# Nombre de sorties brutes du modèle conservées en mémoire (cache LRU)
+PREDICTION_CACHE_SIZE = 32
+
+# Cache persistant des sorties brutes du modèle (base SQLite partagée entre
+# les processus) et sa taille maximale (en Mo) ; None pour le désactiver
+PREDICTION_DISK_CACHE = ROOT_DIR / "cache" / "predictions.sqlite3"
+PREDICTION_DISK_CACHE_MB = 512
+
+# Mémoire maximale des modèles gardés chargés (en Mo) ; au-delà, les modèles
+# les moins récemment utilisés sont libérés
+DETECTOR_MEMORY_BUDGET_MB = 4096
+
+# Modèles chargés en arrière-plan à la création du pool de détecteurs, c'est-à-
+# dire à la première exécution de l'application (Streamlit n'exécute app.py
+# qu'à la connexion d'une session) : la première visite ne bloque pas sur le
+# chargement mais peut attendre le modèle ; les suivantes le trouvent chargé
+PRELOAD_MODELS = ["SSD MobileNet V2"]
+
+# Micro-lots d'inférence partagés entre les sessions : nombre maximum d'images
+# par lot et attente maximale (en millisecondes) pour compléter un lot. Ils ne
+# servent qu'aux modèles dont la signature accepte plusieurs images par appel ;
+# ceux de AVAILABLE_MODELS n'en acceptent qu'une (lots de 1, sans attente) et
+# leurs requêtes sont exécutées en parallèle par MAX_CONCURRENT_INFERENCES threads
+SCHEDULER_MAX_BATCH_SIZE = 8
+SCHEDULER_MAX_WAIT_MS = 10
+
+# Contrôle d'admission : inférences simultanées, requêtes en attente au-delà
+# desquelles les nouvelles sont refusées, et attente maximale (en secondes).
+# Chaque ordonnanceur a MAX_CONCURRENT_INFERENCES threads : les requêtes
+# admises s'exécutent toutes en parallèle, ce que suppose l'attente estimée
+MAX_CONCURRENT_INFERENCES = 4
+MAX_QUEUED_REQUESTS = 16
+ADMISSION_TIMEOUT_S = 30
+
+# Au-delà de ce nombre de pixels, l'image est analysée par tuiles
+TILED_INFERENCE_MIN_PIXELS = 20_000_000
+
+# Taille et chevauchement des tuiles (en pixels)
+TILE_SIZE = 1024
+TILE_OVERLAP = 128
+
 
 # =============================================================================
 # FORMATS D'IMAGE SUPPORTÉS
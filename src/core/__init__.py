@@ -3,11 +3,34 @@
 Module core - Logique métier de la détection d'objets.
 
 Contient:
+- admission.py  : Contrôle d'admission des requêtes (file bornée)
+- cache.py      : Cache des sorties brutes du modèle
+- cancellation.py: Annulation des inférences interrompues
 - constants.py  : Labels COCO et modèles disponibles
 - data_types.py : Types de données (Detection, ModelInfo)
+- disk_cache.py : Cache persistant des sorties du modèle (SQLite)
 - detector.py   : Classe ObjectDetector principale
+- model_store.py: Dépôt local des modèles (chargement hors ligne)
+- pool.py       : Pool des détecteurs chargés (budget mémoire)
+- scheduler.py  : Micro-lots d'inférence partagés entre les sessions
 """
 
+from .admission import (
+    AdmissionController,
+    AdmissionRejected
+)
+
+from .cache import (
+    PredictionCache,
+    hash_image
+)
+
+from .cancellation import (
+    CancellationToken,
+    InferenceCancelled,
+    SessionJobs
+)
+
 from .constants import (
     COCO_LABELS,
     AVAILABLE_MODELS,
@@ -15,21 +38,50 @@ from .constants import (
 
 from .data_types import (
     Detection,
+    MaskStats,
     ModelInfo
 )
 
+from .disk_cache import DiskPredictionCache
+
+from .model_store import (
+    ModelStore,
+    ModelStoreError
+)
+
 from .detector import (
     ObjectDetector,
     get_model_info
 )
 
+from .pool import (
+    DetectorPool,
+    resident_memory
+)
+
+from .scheduler import InferenceScheduler
+
 __all__ = [
     'COCO_LABELS',
     'AVAILABLE_MODELS',
     'get_label',
     'get_available_models',
     'Detection',
+    'MaskStats',
     'ModelInfo',
     'ObjectDetector',
     'get_model_info',
+    'PredictionCache',
+    'hash_image',
+    'DiskPredictionCache',
+    'ModelStore',
+    'ModelStoreError',
+    'DetectorPool',
+    'resident_memory',
+    'InferenceScheduler',
+    'AdmissionController',
+    'AdmissionRejected',
+    'CancellationToken',
+    'InferenceCancelled',
+    'SessionJobs',
 ]
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Contrôle d'admission des requêtes de détection.
+
+Limite le nombre d'inférences simultanées pour ne pas surcharger le CPU :
+les requêtes au-delà attendent dans une file bornée (premier arrivé, premier
+servi) et celles qui ne trouvent pas de place sont refusées immédiatement.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from .cancellation import CancellationToken
+
+
+class AdmissionRejected(Exception):
+    """
+    Requête refusée par le contrôle d'admission.
+
+    Attributes:
+        reason: 'queue_full' (file pleine) ou 'timeout' (attente trop longue)
+        estimated_wait: Attente estimée au moment du refus, en secondes (ou None)
+    """
+
+    def __init__(self, message: str, reason: str, estimated_wait: Optional[float] = None):
+        super().__init__(message)
+        self.reason = reason
+        self.estimated_wait = estimated_wait
+
+
+class AdmissionController:
+    """
+    File d'attente bornée devant les inférences.
+
+    Le temps de service est suivi par une moyenne mobile exponentielle, qui
+    sert à estimer l'attente d'une requête selon sa position dans la file.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_queue: int = 8,
+        timeout: Optional[float] = None,
+        smoothing: float = 0.2,
+        poll_interval: float = 0.25
+    ):
+        """
+        Initialise le contrôleur.
+
+        Args:
+            max_concurrent: Nombre maximum d'inférences simultanées
+            max_queue: Nombre maximum de requêtes en attente
+            timeout: Attente maximale dans la file en secondes (None : sans limite)
+            smoothing: Poids d'une nouvelle mesure dans la moyenne du temps de service
+            poll_interval: Intervalle maximal entre deux appels de on_wait
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent doit être supérieur ou égal à 1")
+        if max_queue < 0:
+            raise ValueError("max_queue doit être positif ou nul")
+
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.smoothing = smoothing
+        self.poll_interval = poll_interval
+
+        self._condition = threading.Condition()
+        self._waiting: deque = deque()
+        self._running = 0
+        self.service_time: Optional[float] = None
+        self.admitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def estimated_wait(self, position: int) -> Optional[float]:
+        """
+        Estime l'attente d'une requête en file.
+
+        Suppose que max_concurrent requêtes admises s'exécutent réellement en
+        parallèle : l'inférence doit disposer d'au moins autant de threads
+        (voir InferenceScheduler, paramètre workers), sinon le temps de
+        service mesuré inclut l'attente derrière les autres requêtes admises.
+
+        Args:
+            position: Position dans la file (1 = prochaine servie)
+
+        Returns:
+            Attente estimée en secondes, None tant qu'aucune requête n'a été servie
+        """
+        if self.service_time is None:
+            return None
+        return self.service_time * math.ceil(position / self.max_concurrent)
+
+    @contextmanager
+    def admit(
+        self,
+        on_wait: Optional[Callable[[int, Optional[float]], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[None]:
+        """
+        Attend une place pour exécuter une inférence.
+
+        S'utilise comme contexte autour de l'inférence : la place est
+        libérée à la sortie du bloc, même en cas d'erreur.
+
+        Args:
+            on_wait: Appelé hors verrou avec (position, attente estimée) à
+                l'entrée dans la file puis à chaque réveil, au moins toutes les
+                poll_interval secondes (l'appelant peut ainsi rafraîchir l'affichage ou
+                interrompre l'attente en levant une exception)
+            cancel_token: Jeton d'annulation ; une requête annulée quitte la file
+
+        Raises:
+            AdmissionRejected: Si la file est pleine ou si l'attente dépasse timeout
+            InferenceCancelled: Si la requête est annulée pendant l'attente
+        """
+        ticket = object()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+            cancel_token.add_callback(self._wake_up)
+        with self._condition:
+            if self._running < self.max_concurrent and not self._waiting:
+                self._running += 1
+            else:
+                if len(self._waiting) >= self.max_queue:
+                    self.rejected += 1
+                    raise AdmissionRejected(
+                        "File d'attente pleine",
+                        'queue_full',
+                        self.estimated_wait(len(self._waiting) + 1)
+                    )
+                self._waiting.append(ticket)
+                self._wait_turn(ticket, on_wait, cancel_token)
+            self.admitted += 1
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._condition:
+                self._running -= 1
+                if self.service_time is None:
+                    self.service_time = elapsed
+                else:
+                    self.service_time += self.smoothing * (elapsed - self.service_time)
+                self._condition.notify_all()
+
+    def _wake_up(self) -> None:
+        """Réveille les requêtes en attente (ex. après une annulation)."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def _is_next(self, ticket: object) -> bool:
+        """Indique (verrou tenu) si le ticket est en tête avec une place libre."""
+        return self._waiting[0] is ticket and self._running < self.max_concurrent
+
+    def _wait_turn(
+        self,
+        ticket: object,
+        on_wait: Optional[Callable[[int, Optional[float]], None]],
+        cancel_token: Optional[CancellationToken]
+    ) -> None:
+        """
+        Attend (verrou tenu) que le ticket soit en tête et qu'une place se libère.
+
+        on_wait est appelé verrou relâché, avec la position et l'estimation
+        relevées sous le verrou : un affichage lent ne bloque ni les autres
+        requêtes en file ni les libérations de place.
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            while not self._is_next(ticket):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                position = self._waiting.index(ticket) + 1
+                if on_wait is not None:
+                    estimate = self.estimated_wait(position)
+                    self._condition.release()
+                    try:
+                        on_wait(position, estimate)
+                    finally:
+                        self._condition.acquire()
+                    # Une place a pu se libérer pendant l'appel
+                    if self._is_next(ticket):
+                        break
+
+                wait = self.poll_interval if on_wait is not None else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise AdmissionRejected(
+                            "Délai d'attente dépassé",
+                            'timeout',
+                            self.estimated_wait(position)
+                        )
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+        except BaseException:
+            # Refus, délai dépassé, annulation ou interruption : quitter la file
+            self._waiting.remove(ticket)
+            self._condition.notify_all()
+            raise
+
+        self._waiting.popleft()
+        self._running += 1
+        # La requête suivante peut aussi avoir une place libre
+        self._condition.notify_all()
+
+    def stats(self) -> Dict:
+        """Retourne l'état et les statistiques du contrôleur."""
+        with self._condition:
+            return {
+                'running': self._running,
+                'waiting': len(self._waiting),
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'service_time': self.service_time,
+            }
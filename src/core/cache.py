@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Cache des sorties brutes du modèle.
+
+Les sorties de ``ObjectDetector.predict()`` ne dépendent que de l'image et du
+modèle : on les conserve pour que seuls le seuillage, le top-k et le filtrage
+soient rejoués lorsqu'un paramètre de la barre latérale change. Un cache
+persistant (voir disk_cache.py) peut servir de second niveau.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def hash_image(image: np.ndarray) -> str:
+    """
+    Calcule une empreinte du contenu d'une image.
+
+    Args:
+        image: Image sous forme de tableau numpy
+
+    Returns:
+        Empreinte hexadécimale (forme, type et pixels)
+    """
+    image = np.ascontiguousarray(image)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.shape}|{image.dtype.str}".encode())
+    digest.update(memoryview(image).cast('B'))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Cache LRU borné des sorties brutes de ``predict()``.
+
+    Les tableaux stockés sont marqués en lecture seule : ils sont partagés
+    entre les sessions et ne doivent pas être modifiés par le post-traitement.
+    Avec un second niveau (store), les défauts sont cherchés dans celui-ci
+    et chaque nouvelle entrée y est aussi écrite.
+    """
+
+    def __init__(self, max_entries: int = 32, store: Optional[Any] = None):
+        """
+        Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximum de résultats conservés
+            store: Second niveau avec les méthodes get(key, count_miss) et
+                put(key, results), par exemple un DiskPredictionCache
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries doit être supérieur ou égal à 1")
+
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[Hashable, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(image: np.ndarray, model_name: str, variant: str = '') -> Tuple[str, str, str]:
+        """
+        Construit la clé d'une image pour un modèle donné.
+
+        Args:
+            image: Image (H, W, 3)
+            model_name: Identifiant du modèle (nom ou URL)
+            variant: Paramètres qui modifient les sorties (ex. prétraitement)
+        """
+        return (model_name, variant, hash_image(image))
+
+    def get(self, key: Hashable, count_miss: bool = True) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Retourne les sorties associées à une clé.
+
+        Args:
+            key: Clé construite par make_key()
+            count_miss: Compte un défaut dans les statistiques (ici et dans
+                le second niveau) ; False pour une simple vérification suivie
+                d'un appel qui cherchera à nouveau la clé
+
+        Returns:
+            Dictionnaire des sorties ou None si absent
+        """
+        with self._lock:
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            if count_miss:
+                self.misses += 1
+
+        if self.store is None:
+            return None
+        results = self.store.get(key, count_miss=count_miss)
+        if results is not None:
+            self._insert(key, results)
+        return results
+
+    def put(self, key: Hashable, results: Dict[str, np.ndarray]) -> None:
+        """
+        Enregistre les sorties associées à une clé.
+
+        Args:
+            key: Clé construite par make_key()
+            results: Sorties brutes du modèle
+        """
+        self._insert(key, results)
+        if self.store is not None:
+            self.store.put(key, results)
+
+    def _insert(self, key: Hashable, results: Dict[str, np.ndarray]) -> None:
+        """Ajoute une entrée en mémoire en évinçant la plus ancienne si nécessaire."""
+        for value in results.values():
+            value.flags.writeable = False
+
+        with self._lock:
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les statistiques d'utilisation du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Annulation des inférences devenues inutiles.
+
+Lorsqu'une session relance une détection (nouvelle image, curseur déplacé)
+ou que l'utilisateur l'arrête, Streamlit interrompt l'exécution en cours en
+levant une exception dans son thread à l'appel Streamlit suivant (par
+exemple l'affichage de la progression). L'application annule alors le jeton
+de l'inférence : chaque étape restante (file d'attente, appel au modèle,
+post-traitement, construction des masques) vérifie son jeton avant de
+commencer, et les requêtes encore en file de l'ordonnanceur sont retirées.
+"""
+
+import threading
+from typing import Callable, Dict, List
+
+
+class InferenceCancelled(Exception):
+    """Inférence annulée (exécution Streamlit interrompue)."""
+
+
+class CancellationToken:
+    """Jeton d'annulation partagé entre les étapes d'une inférence."""
+
+    def __init__(self):
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Indique si l'inférence a été annulée."""
+        return self._cancelled
+
+    def cancel(self) -> bool:
+        """
+        Annule l'inférence et appelle les fonctions enregistrées.
+
+        Returns:
+            True si le jeton vient d'être annulé, False s'il l'était déjà
+        """
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Enregistre une fonction appelée à l'annulation (immédiatement si déjà annulé).
+
+        Args:
+            callback: Fonction sans argument (ex. Future.cancel)
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Lève InferenceCancelled si l'inférence a été annulée.
+
+        Raises:
+            InferenceCancelled: Si cancel() a été appelé
+        """
+        if self._cancelled:
+            raise InferenceCancelled("Inférence annulée")
+
+
+class SessionJobs:
+    """
+    Inférences en cours des sessions et leur issue.
+
+    Streamlit arrête l'exécution précédente d'une session avant d'en
+    démarrer une nouvelle : l'annulation vient de cette interruption (voir
+    le module), pas d'un remplacement par start().
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, CancellationToken] = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def start(self, session_id: str) -> CancellationToken:
+        """
+        Démarre une inférence pour une session.
+
+        Args:
+            session_id: Identifiant de la session
+
+        Returns:
+            Jeton d'annulation de la nouvelle inférence
+        """
+        token = CancellationToken()
+        with self._lock:
+            self._jobs[session_id] = token
+            self.started += 1
+        return token
+
+    def finish(self, session_id: str, token: CancellationToken) -> None:
+        """
+        Termine une inférence, annulée ou non.
+
+        Args:
+            session_id: Identifiant de la session
+            token: Jeton retourné par start()
+        """
+        with self._lock:
+            if self._jobs.get(session_id) is token:
+                del self._jobs[session_id]
+            if token.cancelled:
+                self.cancelled += 1
+            else:
+                self.completed += 1
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne le nombre d'inférences en cours, démarrées, terminées et annulées."""
+        with self._lock:
+            return {
+                'in_flight': len(self._jobs),
+                'started': self.started,
+                'completed': self.completed,
+                'cancelled': self.cancelled,
+            }
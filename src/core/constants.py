@@ -36,10 +36,14 @@ COCO_LABELS: Dict[int, str] = {
 # MODÈLES DISPONIBLES SUR TENSORFLOW HUB
 # =============================================================================
 
+# "input_size" : résolution native (hauteur, largeur) du modèle, utilisée pour
+# réduire les images avant l'inférence (voir ObjectDetector, preprocess).
+
 AVAILABLE_MODELS: Dict[str, Dict] = {
     # Modèles de détection rapides
     "SSD MobileNet V2": {
         "url": "https://tfhub.dev/tensorflow/ssd_mobilenet_v2/2",
+        "input_size": (300, 300),
         "type": "detection",
         "speed": "⚡ Très rapide",
         "accuracy": "★★☆☆☆",
@@ -47,6 +51,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "SSD MobileNet V2 FPNLite 320": {
         "url": "https://tfhub.dev/tensorflow/ssd_mobilenet_v2/fpnlite_320x320/1",
+        "input_size": (320, 320),
         "type": "detection",
         "speed": "⚡ Très rapide",
         "accuracy": "★★★☆☆",
@@ -54,6 +59,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "SSD MobileNet V2 FPNLite 640": {
         "url": "https://tfhub.dev/tensorflow/ssd_mobilenet_v2/fpnlite_640x640/1",
+        "input_size": (640, 640),
         "type": "detection",
         "speed": "🚀 Rapide",
         "accuracy": "★★★★☆",
@@ -62,6 +68,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     # Modèles EfficientDet
     "EfficientDet D0": {
         "url": "https://tfhub.dev/tensorflow/efficientdet/d0/1",
+        "input_size": (512, 512),
         "type": "detection",
         "speed": "🚀 Rapide",
         "accuracy": "★★★☆☆",
@@ -69,6 +76,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "EfficientDet D1": {
         "url": "https://tfhub.dev/tensorflow/efficientdet/d1/1",
+        "input_size": (640, 640),
         "type": "detection",
         "speed": "🔄 Modéré",
         "accuracy": "★★★★☆",
@@ -76,6 +84,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "EfficientDet D2": {
         "url": "https://tfhub.dev/tensorflow/efficientdet/d2/1",
+        "input_size": (768, 768),
         "type": "detection",
         "speed": "🔄 Modéré",
         "accuracy": "★★★★☆",
@@ -83,6 +92,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "EfficientDet D3": {
         "url": "https://tfhub.dev/tensorflow/efficientdet/d3/1",
+        "input_size": (896, 896),
         "type": "detection",
         "speed": "🐢 Lent",
         "accuracy": "★★★★★",
@@ -91,6 +101,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     # Modèles CenterNet
     "CenterNet HourGlass104": {
         "url": "https://tfhub.dev/tensorflow/centernet/hourglass_512x512/1",
+        "input_size": (512, 512),
         "type": "detection",
         "speed": "🐢 Lent",
         "accuracy": "★★★★★",
@@ -98,6 +109,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "CenterNet Resnet50 V1 FPN": {
         "url": "https://tfhub.dev/tensorflow/centernet/resnet50v1_fpn_512x512/1",
+        "input_size": (512, 512),
         "type": "detection",
         "speed": "🔄 Modéré",
         "accuracy": "★★★★☆",
@@ -106,6 +118,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     # Faster R-CNN
     "Faster R-CNN ResNet50 V1": {
         "url": "https://tfhub.dev/tensorflow/faster_rcnn/resnet50_v1_640x640/1",
+        "input_size": (640, 640),
         "type": "detection",
         "speed": "🐢 Lent",
         "accuracy": "★★★★★",
@@ -113,6 +126,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "Faster R-CNN ResNet101 V1": {
         "url": "https://tfhub.dev/tensorflow/faster_rcnn/resnet101_v1_640x640/1",
+        "input_size": (640, 640),
         "type": "detection",
         "speed": "🐢 Très lent",
         "accuracy": "★★★★★",
@@ -120,6 +134,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     },
     "Faster R-CNN Inception ResNet V2": {
         "url": "https://tfhub.dev/tensorflow/faster_rcnn/inception_resnet_v2_640x640/1",
+        "input_size": (640, 640),
         "type": "detection",
         "speed": "🐢 Très lent",
         "accuracy": "★★★★★",
@@ -128,6 +143,7 @@ AVAILABLE_MODELS: Dict[str, Dict] = {
     # Modèles avec segmentation (Mask R-CNN)
     "Mask R-CNN Inception ResNet V2": {
         "url": "https://tfhub.dev/tensorflow/mask_rcnn/inception_resnet_v2_1024x1024/1",
+        "input_size": (1024, 1024),
         "type": "segmentation",
         "speed": "🐢 Très lent",
         "accuracy": "★★★★★",
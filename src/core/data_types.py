@@ -3,29 +3,202 @@
 Types de données pour la détection d'objets.
 """
 
+import threading
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, Tuple, Optional
 
 
 @dataclass
 class Detection:
-    """Représente une détection d'objet."""
+    """
+    Représente une détection d'objet.
+    
+    Le masque est stocké de façon compacte, recadré sur la boîte : ``mask``
+    couvre la zone dont le coin supérieur gauche est ``mask_origin`` dans
+    l'image. Un masque pleine image reste valide avec l'origine (0, 0).
+    
+    Le masque peut être paresseux : si ``mask_loader`` est fourni, il n'est
+    appelé qu'à la première lecture de ``mask`` et son résultat est conservé.
+    Le chargement est protégé par un verrou propre à la détection : plusieurs
+    threads de rendu peuvent lire le même masque.
+    """
     class_id: int
     class_name: str
     confidence: float
     box: Tuple[int, int, int, int]  # (left, top, right, bottom)
-    mask: Optional[np.ndarray] = field(default=None, repr=False)
+    mask_origin: Tuple[int, int] = (0, 0)  # (left, top)
+    image_size: Optional[Tuple[int, int]] = None  # (height, width)
+    _mask: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    _mask_loader: Optional[Callable[[], Optional[np.ndarray]]] = field(
+        default=None, repr=False, compare=False
+    )
+    
+    def __init__(
+        self,
+        class_id: int,
+        class_name: str,
+        confidence: float,
+        box: Tuple[int, int, int, int],
+        mask: Optional[np.ndarray] = None,
+        mask_origin: Tuple[int, int] = (0, 0),
+        image_size: Optional[Tuple[int, int]] = None,
+        mask_loader: Optional[Callable[[], Optional[np.ndarray]]] = None
+    ):
+        """
+        Initialise la détection.
+        
+        Args:
+            class_id: ID de la classe COCO
+            class_name: Nom de la classe
+            confidence: Score de confiance
+            box: Boîte (left, top, right, bottom) en pixels
+            mask: Masque recadré sur la boîte, ou pleine image avec l'origine (0, 0)
+            mask_origin: Coin (left, top) du masque dans l'image
+            image_size: Dimensions (hauteur, largeur) de l'image
+            mask_loader: Construit le masque à la première lecture de ``mask``
+        """
+        self.class_id = class_id
+        self.class_name = class_name
+        self.confidence = confidence
+        self.box = box
+        self.mask_origin = mask_origin
+        self.image_size = image_size
+        self._mask = mask
+        self._mask_loader = mask_loader
+        # Hors des champs : asdict() et les copies ne copient pas le verrou
+        self._mask_lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict:
+        """État pour copy et pickle, sans le verrou."""
+        state = self.__dict__.copy()
+        del state['_mask_lock']
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        """Restaure l'état avec un nouveau verrou."""
+        self.__dict__.update(state)
+        self._mask_lock = threading.Lock()
+    
+    @property
+    def mask(self) -> Optional[np.ndarray]:
+        """Masque recadré, construit à la première lecture."""
+        if self._mask_loader is not None:
+            with self._mask_lock:
+                if self._mask_loader is not None:
+                    # Masque affecté avant le retrait du chargeur : has_mask
+                    # reste vrai pendant la construction
+                    self._mask = self._mask_loader()
+                    self._mask_loader = None
+        return self._mask
+    
+    @mask.setter
+    def mask(self, mask: Optional[np.ndarray]) -> None:
+        """Remplace le masque (et abandonne un chargeur en attente)."""
+        with self._mask_lock:
+            self._mask = mask
+            self._mask_loader = None
+    
+    @property
+    def has_mask(self) -> bool:
+        """Indique si la détection a un masque, sans le construire."""
+        return self._mask is not None or self._mask_loader is not None
+    
+    def full_mask(self, image_size: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
+        """
+        Construit le masque binaire à la taille de l'image.
+        
+        Args:
+            image_size: Dimensions (hauteur, largeur) ; par défaut celles de la détection
+            
+        Returns:
+            Masque booléen (H, W) ou None si la détection n'a pas de masque
+        """
+        if self.mask is None:
+            return None
+        
+        height, width = image_size or self.image_size or self.mask.shape
+        full = np.zeros((height, width), dtype=bool)
+        
+        left, top = self.mask_origin
+        crop = self.mask > 0.5
+        mask_h = min(crop.shape[0], height - top)
+        mask_w = min(crop.shape[1], width - left)
+        if mask_h > 0 and mask_w > 0:
+            full[top:top + mask_h, left:left + mask_w] = crop[:mask_h, :mask_w]
+        
+        return full
     
-    def to_dict(self) -> Dict:
-        """Convertit la détection en dictionnaire."""
-        return {
+    def mask_rle(self) -> Optional[Dict]:
+        """
+        Encode le masque en RLE COCO compressé, à la taille de l'image.
+        
+        Returns:
+            RLE ``{'size': [H, W], 'counts': str}`` ou None sans masque
+        """
+        # Import local : utils importe data_types (visualisation)
+        from utils.rle import compress_rle, encode_mask
+        
+        if self.mask is None:
+            return None
+        return compress_rle(encode_mask(self.mask, self.mask_origin, self.image_size))
+    
+    def to_dict(self, include_mask: bool = False) -> Dict:
+        """
+        Convertit la détection en dictionnaire.
+        
+        Args:
+            include_mask: Ajoute le masque encodé en RLE COCO (clé 'mask')
+        """
+        result = {
             'class_id': self.class_id,
             'class': self.class_name,
             'confidence': self.confidence,
             'box': list(self.box),
-            'has_mask': self.mask is not None
+            'has_mask': self.has_mask
         }
+        if include_mask:
+            result['mask'] = self.mask_rle()
+        return result
+
+
+class MaskStats:
+    """
+    Compteurs de construction des masques paresseux.
+    
+    ``deferred`` compte les masques rendus disponibles par le post-traitement,
+    ``built`` ceux qui ont réellement été calculés ; la différence correspond
+    aux masques jamais lus (détections filtrées, masques non affichés).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.deferred = 0
+        self.built = 0
+    
+    def record_deferred(self, count: int = 1) -> None:
+        """Enregistre des masques différés."""
+        with self._lock:
+            self.deferred += count
+    
+    def record_built(self, count: int = 1) -> None:
+        """Enregistre des masques effectivement construits."""
+        with self._lock:
+            self.built += count
+    
+    @property
+    def skipped(self) -> int:
+        """Nombre de masques différés qui n'ont jamais été construits."""
+        return max(self.deferred - self.built, 0)
+    
+    def as_dict(self) -> Dict[str, int]:
+        """Retourne les compteurs sous forme de dictionnaire."""
+        with self._lock:
+            return {
+                'deferred': self.deferred,
+                'built': self.built,
+                'skipped': max(self.deferred - self.built, 0),
+            }
 
 
 @dataclass
@@ -37,3 +210,4 @@ class ModelInfo:
     speed: str
     accuracy: str
     description: str
+    input_size: Optional[Tuple[int, int]] = None  # (height, width)
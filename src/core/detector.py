@@ -3,19 +3,40 @@
 Classe principale de détection d'objets.
 """
 
+import functools
+import threading
+import time
+
 import numpy as np
 import tensorflow as tf
 import tensorflow_hub as hub
-from PIL import Image, ImageDraw
-from typing import List, Dict
+from PIL import Image
+from typing import Callable, List, Dict, Optional, Tuple
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from .cache import PredictionCache
+from .cancellation import CancellationToken
 from .constants import AVAILABLE_MODELS, COCO_LABELS
-from .data_types import Detection, ModelInfo
+from .data_types import Detection, MaskStats, ModelInfo
+from .model_store import ModelStore
+from utils.boxes import cluster_boxes
 from utils.helpers import get_label
+from utils.masks import ellipse_masks, reproject_masks
+
+
+# Modes de prétraitement des images (voir ObjectDetector)
+PREPROCESS_MODES = (None, 'resize', 'letterbox')
+
+# Version du prétraitement, incluse dans les clés de cache : à incrémenter à
+# chaque modification de _prepare_input() ou de la remise à l'échelle des
+# boîtes, pour invalider les sorties conservées sur disque
+PREPROCESS_VERSION = 2
+
+# Dimensions (hauteur, largeur) des photos typiques utilisées pour le préchauffage
+WARMUP_IMAGE_SHAPES = ((3000, 4000), (4000, 3000), (480, 640))
 
 
 class ObjectDetector:
@@ -24,30 +45,113 @@ class ObjectDetector:
     Supporte la détection et la segmentation d'instance.
     """
     
-    def __init__(self, model_name: str):
+    def __init__(
+        self,
+        model_name: str,
+        cache: Optional[PredictionCache] = None,
+        preprocess: Optional[str] = None,
+        model_store: Optional[ModelStore] = None
+    ):
         """
         Initialise le détecteur avec un modèle.
         
         Args:
             model_name: Nom du modèle (clé de AVAILABLE_MODELS)
+            cache: Cache optionnel des sorties brutes de predict()
+            preprocess: Réduction des images avant l'inférence :
+                None (pleine résolution), 'resize' (réduction à la résolution
+                native du modèle, proportions conservées) ou 'letterbox'
+                (réduction puis complétion jusqu'à la taille native exacte)
+            model_store: Dépôt local des modèles, utilisé en priorité par load()
         """
         if model_name not in AVAILABLE_MODELS:
             raise ValueError(f"Modèle inconnu: {model_name}")
+        if preprocess not in PREPROCESS_MODES:
+            raise ValueError(f"Prétraitement inconnu: {preprocess}")
         
         model_info = AVAILABLE_MODELS[model_name]
         self.model_name = model_name
         self.model_url = model_info["url"]
         self.model_type = model_info["type"]
+        self.input_size = model_info.get("input_size")
+        self.preprocess = preprocess
         self.model = None
+        self.cache = cache
+        self.mask_stats = MaskStats()
+        self.model_store = model_store
+        self.load_source: Optional[str] = None
+        self.load_time: Optional[float] = None
+        self.warmup_time: Optional[float] = None
+        self._ready = False
     
-    def load(self) -> None:
-        """Charge le modèle depuis TensorFlow Hub."""
-        self.model = hub.load(self.model_url)
+    def load(self, warmup: bool = True) -> None:
+        """
+        Charge le modèle, depuis le dépôt local s'il y a été importé,
+        sinon depuis TensorFlow Hub.
+        
+        Args:
+            warmup: Préchauffe le modèle (voir warmup()) avant de rendre la main
+        """
+        start = time.perf_counter()
+        if self.model_store is not None and self.model_store.has(self.model_name):
+            self.model = self.model_store.load(self.model_name)
+            self.load_source = 'store'
+        else:
+            self.model = hub.load(self.model_url)
+            self.load_source = 'hub'
+        self.load_time = time.perf_counter() - start
+        self._ready = False
+        if warmup:
+            self.warmup()
     
     def is_loaded(self) -> bool:
         """Vérifie si le modèle est chargé."""
         return self.model is not None
     
+    def is_ready(self) -> bool:
+        """Vérifie si le modèle est chargé et préchauffé."""
+        return self.is_loaded() and self._ready
+    
+    def warmup(self, shapes: Optional[List[Tuple[int, int]]] = None) -> float:
+        """
+        Exécute le modèle sur des entrées représentatives.
+        
+        Le premier appel au modèle pour une taille d'entrée paie le traçage
+        du graphe, le choix des noyaux et l'allocation mémoire : on le fait
+        ici plutôt que lors de la première détection. Les entrées sont des
+        images noires, envoyées directement au modèle sans passer par le cache.
+        
+        Args:
+            shapes: Dimensions (hauteur, largeur) des entrées du modèle ; par
+                défaut celles produites par le prétraitement pour des photos
+                typiques (voir WARMUP_IMAGE_SHAPES)
+                
+        Returns:
+            Durée du préchauffage en secondes (aussi conservée dans warmup_time)
+        """
+        if not self.is_loaded():
+            raise RuntimeError("Le modèle n'est pas chargé. Appelez load() d'abord.")
+        
+        if shapes is None:
+            shapes = self._warmup_shapes()
+        
+        start = time.perf_counter()
+        for height, width in shapes:
+            self._run_model(np.zeros((1, height, width, 3), dtype=np.uint8))
+        self.warmup_time = time.perf_counter() - start
+        self._ready = True
+        return self.warmup_time
+    
+    def _warmup_shapes(self) -> List[Tuple[int, int]]:
+        """Tailles d'entrée du modèle pour les photos typiques, sans doublon."""
+        if self.preprocess == 'letterbox' and self.input_size is not None:
+            return [tuple(self.input_size)]
+        
+        shapes = [self._content_shape(shape) for shape in WARMUP_IMAGE_SHAPES]
+        if self.preprocess is None and self.input_size is not None:
+            shapes.append(tuple(self.input_size))
+        return list(dict.fromkeys(shapes))
+    
     def predict(self, image: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Exécute la prédiction sur une image.
@@ -61,23 +165,235 @@ class ObjectDetector:
         if not self.is_loaded():
             raise RuntimeError("Le modèle n'est pas chargé. Appelez load() d'abord.")
         
-        # Convertir en uint8 si nécessaire
-        if image.dtype != np.uint8:
-            image = (image * 255).astype(np.uint8)
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(image)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        results = self._predict_single(image)
+        
+        if key is not None:
+            self.cache.put(key, results)
+        
+        return results
+    
+    def _predict_single(self, image: np.ndarray) -> Dict[str, np.ndarray]:
+        """Appelle le modèle sur une image seule, sans complétion jusqu'à un palier."""
+        model_input, content_shape = self._prepare_input(image)
+        results = self._run_model(model_input[np.newaxis, ...])
+        if content_shape != model_input.shape[:2]:
+            results['detection_boxes'] = _rescale_boxes(
+                results['detection_boxes'], model_input.shape[:2], content_shape
+            )
+        return results
+    
+    @property
+    def max_batch_size(self) -> Optional[int]:
+        """
+        Nombre maximum d'images par appel au modèle (None : pas de limite).
+        
+        Lu dans la signature de service du modèle : les modèles du zoo de
+        détection TF2 déclarent une entrée [1, None, None, 3] et n'acceptent
+        qu'une image par appel.
+        """
+        return _signature_batch_size(self.model)
+    
+    def predict_batch(
+        self,
+        images: List[np.ndarray],
+        batch_size: int = 8,
+        bucket_size: int = 64
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Exécute la prédiction sur plusieurs images en regroupant les appels au modèle.
+        
+        Si le modèle n'accepte qu'une image par appel (voir max_batch_size),
+        chaque image est traitée comme par predict(). Sinon, les images (après
+        le prétraitement éventuel) sont réparties par paliers de taille
+        (dimensions arrondies au multiple supérieur de bucket_size),
+        complétées par des zéros en bas et à droite jusqu'à la taille du
+        palier, puis envoyées au modèle par lots de batch_size ; une image
+        seule dans son lot n'est pas complétée. Les boîtes sont ensuite
+        renormalisées par rapport à chaque image d'origine, sans être
+        limitées à l'image : les masques Mask R-CNN restent relatifs à la
+        boîte prédite.
+        
+        Args:
+            images: Liste d'images (H, W, 3), de tailles éventuellement différentes
+            batch_size: Nombre maximum d'images par appel au modèle, réduit
+                à max_batch_size si le modèle impose une limite
+            bucket_size: Granularité des paliers de taille en pixels
+        
+        Returns:
+            Sorties brutes de chaque image, dans l'ordre d'entrée, au même
+            format que predict() (axe de batch de taille 1)
+        """
+        if not self.is_loaded():
+            raise RuntimeError("Le modèle n'est pas chargé. Appelez load() d'abord.")
+        if batch_size < 1 or bucket_size < 1:
+            raise ValueError("batch_size et bucket_size doivent être positifs")
+        
+        if self.max_batch_size is not None:
+            batch_size = min(batch_size, self.max_batch_size)
+        
+        outputs: List[Optional[Dict[str, np.ndarray]]] = [None] * len(images)
+        keys: Dict[int, Tuple[str, ...]] = {}
+        inputs: Dict[int, np.ndarray] = {}
+        contents: Dict[int, Tuple[int, int]] = {}
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        
+        for index, image in enumerate(images):
+            if self.cache is not None:
+                keys[index] = self.cache_key(image)
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    outputs[index] = cached
+                    continue
+            if batch_size == 1:
+                outputs[index] = self._predict_single(image)
+                if index in keys:
+                    self.cache.put(keys[index], outputs[index])
+                continue
+            inputs[index], contents[index] = self._prepare_input(image)
+            height, width = inputs[index].shape[:2]
+            if self.preprocess == 'letterbox':
+                # Les entrées ont déjà toutes la taille native du modèle
+                bucket = (height, width)
+            else:
+                bucket = (-(-height // bucket_size) * bucket_size,
+                          -(-width // bucket_size) * bucket_size)
+            buckets.setdefault(bucket, []).append(index)
+        
+        for (bucket_height, bucket_width), indices in buckets.items():
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                if len(chunk) == 1:
+                    # Image seule : pas de complétion, comme predict()
+                    index = chunk[0]
+                    outputs[index] = self._predict_single(images[index])
+                    if index in keys:
+                        self.cache.put(keys[index], outputs[index])
+                    continue
+                batch = np.zeros(
+                    (len(chunk), bucket_height, bucket_width, 3), dtype=np.uint8
+                )
+                for row, index in enumerate(chunk):
+                    height, width = inputs[index].shape[:2]
+                    batch[row, :height, :width] = inputs[index]
+                
+                results = self._run_model(batch)
+                
+                for row, index in enumerate(chunk):
+                    single = {
+                        name: value[row:row + 1].copy()
+                        for name, value in results.items()
+                    }
+                    # Le contenu de l'image occupe le coin supérieur gauche du cadre
+                    single['detection_boxes'] = _rescale_boxes(
+                        single['detection_boxes'],
+                        (bucket_height, bucket_width),
+                        contents[index]
+                    )
+                    if index in keys:
+                        self.cache.put(keys[index], single)
+                    outputs[index] = single
+        
+        return outputs
+    
+    @property
+    def cache_variant(self) -> str:
+        """Mode et version du prétraitement, inclus dans les clés de cache."""
+        return f"{self.preprocess or 'full'}-v{PREPROCESS_VERSION}"
+    
+    def cache_key(self, image: np.ndarray) -> Tuple[str, ...]:
+        """
+        Clé de cache d'une image pour ce détecteur.
+        
+        Le modèle est identifié par son URL : une entrée conservée sur disque
+        n'est plus utilisée si le modèle associé à un nom change, ni si le
+        prétraitement change (PREPROCESS_VERSION).
+        """
+        return PredictionCache.make_key(image, self.model_url, self.cache_variant)
+    
+    def lookup(self, image: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Retourne les sorties de predict() déjà en cache, sans appeler le modèle.
+        
+        Le modèle n'a pas besoin d'être chargé : les résultats précalculés
+        peuvent être servis avant la fin de son chargement. Un défaut n'est
+        pas compté dans les statistiques du cache : il est suivi de predict()
+        (directement ou par l'ordonnanceur), qui le compte.
+        
+        Args:
+            image: Image sous forme de tableau numpy (H, W, 3)
+            
+        Returns:
+            Sorties brutes du modèle, ou None si absentes du cache
+        """
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(image), count_miss=False)
+    
+    def _content_shape(self, image_shape: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Dimensions de l'image une fois réduite par le prétraitement.
+        
+        L'image n'est jamais agrandie : sans prétraitement, ou si elle tient
+        déjà dans la résolution native du modèle, ses dimensions sont conservées.
+        """
+        height, width = image_shape
+        if self.preprocess is None or self.input_size is None:
+            return height, width
+        target_height, target_width = self.input_size
+        scale = min(target_height / height, target_width / width, 1.0)
+        if scale >= 1.0:
+            return height, width
+        return max(1, round(height * scale)), max(1, round(width * scale))
+    
+    def _prepare_input(self, image: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Applique le prétraitement à une image.
         
-        input_tensor = tf.convert_to_tensor(image)
-        input_tensor = input_tensor[tf.newaxis, ...]
+        Args:
+            image: Image (H, W, 3)
+            
+        Returns:
+            Tuple (entrée uint8 du modèle, dimensions du contenu dans cette
+            entrée). Avec 'letterbox', l'entrée a la taille native du modèle
+            et le contenu réduit occupe son coin supérieur gauche.
+        """
+        image = _to_uint8(image)
+        content_shape = self._content_shape(image.shape[:2])
+        if content_shape != image.shape[:2]:
+            resized = Image.fromarray(image).resize(
+                (content_shape[1], content_shape[0]), Image.BILINEAR, reducing_gap=3.0
+            )
+            image = np.asarray(resized)
         
-        results = self.model(input_tensor)
+        if self.preprocess == 'letterbox' and self.input_size is not None:
+            target_height, target_width = self.input_size
+            if content_shape[0] <= target_height and content_shape[1] <= target_width:
+                canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+                canvas[:content_shape[0], :content_shape[1]] = image
+                image = canvas
         
-        return {key: value.numpy() for key, value in results.items()}
+        return image, content_shape
+    
+    def _run_model(self, batch: np.ndarray) -> Dict[str, np.ndarray]:
+        """Appelle le modèle sur un lot (N, H, W, 3) uint8 et convertit les sorties."""
+        outputs = self.model(tf.convert_to_tensor(batch))
+        return {name: value.numpy() for name, value in outputs.items()}
     
     def detect(
         self, 
         image: np.ndarray, 
         threshold: float = 0.5,
         max_detections: int = 100,
-        generate_approx_masks: bool = True
+        generate_approx_masks: bool = True,
+        allowed_classes: Optional[List[int]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> List[Detection]:
         """
         Détecte les objets dans une image.
@@ -87,152 +403,487 @@ class ObjectDetector:
             threshold: Seuil de confiance minimum (0.0 à 1.0)
             max_detections: Nombre maximum de détections
             generate_approx_masks: Génère des masques approximatifs si le modèle n'en fournit pas
+            allowed_classes: IDs des classes à conserver (None = toutes)
+            cancel_token: Jeton d'annulation, vérifié avant chaque étape
             
         Returns:
             Liste des détections
+            
+        Raises:
+            InferenceCancelled: Si l'inférence a été annulée
         """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         results = self.predict(image)
+        return self.postprocess(
+            results,
+            image.shape[:2],
+            threshold=threshold,
+            max_detections=max_detections,
+            generate_approx_masks=generate_approx_masks,
+            allowed_classes=allowed_classes,
+            cancel_token=cancel_token
+        )
+    
+    def detect_batch(
+        self,
+        images: List[np.ndarray],
+        threshold: float = 0.5,
+        max_detections: int = 100,
+        generate_approx_masks: bool = True,
+        allowed_classes: Optional[List[int]] = None,
+        batch_size: int = 8,
+        bucket_size: int = 64
+    ) -> List[List[Detection]]:
+        """
+        Détecte les objets dans plusieurs images avec des appels groupés au modèle.
+        
+        Args:
+            images: Liste d'images (H, W, 3)
+            threshold: Seuil de confiance minimum (0.0 à 1.0)
+            max_detections: Nombre maximum de détections par image
+            generate_approx_masks: Génère des masques approximatifs si le modèle n'en fournit pas
+            allowed_classes: IDs des classes à conserver (None = toutes)
+            batch_size: Nombre maximum d'images par appel au modèle
+            bucket_size: Granularité des paliers de taille en pixels
+            
+        Returns:
+            Une liste de détections par image, dans l'ordre d'entrée
+        """
+        all_results = self.predict_batch(
+            images, batch_size=batch_size, bucket_size=bucket_size
+        )
+        return [
+            self.postprocess(
+                results,
+                image.shape[:2],
+                threshold=threshold,
+                max_detections=max_detections,
+                generate_approx_masks=generate_approx_masks,
+                allowed_classes=allowed_classes
+            )
+            for image, results in zip(images, all_results)
+        ]
+    
+    def postprocess(
+        self,
+        results: Dict[str, np.ndarray],
+        image_shape: Tuple[int, int],
+        threshold: float = 0.5,
+        max_detections: int = 100,
+        generate_approx_masks: bool = True,
+        allowed_classes: Optional[List[int]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[Detection]:
+        """
+        Convertit les sorties brutes de predict() en détections.
         
+        Les tableaux d'entrée ne sont jamais modifiés : ils peuvent provenir
+        du cache et être partagés entre plusieurs appels. Les classes hors de
+        allowed_classes sont écartées avant toute construction de détection ou
+        de masque, et max_detections s'applique après ce filtrage.
+        
+        Args:
+            results: Sorties brutes du modèle (avec l'axe de batch)
+            image_shape: Dimensions (hauteur, largeur) de l'image d'origine
+            threshold: Seuil de confiance minimum (0.0 à 1.0)
+            max_detections: Nombre maximum de détections (après filtrage des classes)
+            generate_approx_masks: Génère des masques approximatifs si le modèle n'en fournit pas
+            allowed_classes: IDs des classes à conserver (None = toutes)
+            cancel_token: Jeton d'annulation ; une inférence annulée ne construit
+                pas ses masques (la lecture d'un masque lève InferenceCancelled)
+            
+        Returns:
+            Liste des détections
+            
+        Raises:
+            InferenceCancelled: Si l'inférence a été annulée
+        """
         if 'detection_boxes' not in results:
             raise ValueError("Format de sortie du modèle non reconnu")
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         
-        boxes = results['detection_boxes'][0]
-        classes = results['detection_classes'][0].astype(int)
-        scores = results['detection_scores'][0]
+        # Seules les num_detections premières détections sont valides
+        count = None
+        if results.get('num_detections') is not None:
+            count = int(np.asarray(results['num_detections']).reshape(-1)[0])
+        boxes = results['detection_boxes'][0][:count]
+        classes = results['detection_classes'][0][:count]
+        scores = results['detection_scores'][0][:count]
         
         # Vérifier si des masques sont disponibles (modèles Mask R-CNN)
-        masks = None
-        has_native_masks = 'detection_masks' in results
-        if has_native_masks:
-            masks = results['detection_masks'][0]
+        masks = results.get('detection_masks')
+        if masks is not None:
+            masks = masks[0][:count]
         
-        height, width = image.shape[:2]
-        detections = []
+        height, width = image_shape
         
-        for i in range(min(len(scores), max_detections)):
-            if scores[i] >= threshold:
-                ymin, xmin, ymax, xmax = boxes[i]
-                
-                # Coordonnées en pixels
-                left = int(xmin * width)
-                top = int(ymin * height)
-                right = int(xmax * width)
-                bottom = int(ymax * height)
-                
-                # Créer le masque
-                mask = None
-                if has_native_masks and masks is not None:
-                    # Masque natif du modèle (Mask R-CNN)
-                    mask = self._process_mask(
-                        masks[i], 
-                        boxes[i], 
-                        height, 
-                        width
-                    )
-                elif generate_approx_masks:
-                    # Générer un masque approximatif (ellipse dans la boîte)
-                    mask = self._generate_ellipse_mask(
-                        left, top, right, bottom,
-                        height, width
-                    )
-                
-                detection = Detection(
-                    class_id=int(classes[i]),
-                    class_name=get_label(int(classes[i]), COCO_LABELS),
-                    confidence=float(scores[i]),
-                    box=(left, top, right, bottom),
-                    mask=mask
-                )
-                detections.append(detection)
+        # Seuillage et filtrage des classes puis top-k (scores triés par ordre décroissant)
+        selected = scores >= threshold
+        if allowed_classes is not None:
+            selected &= np.isin(classes, allowed_classes)
+        keep = np.flatnonzero(selected)[:max_detections]
+        if keep.size == 0:
+            return []
+        
+        # Coordonnées en pixels (left, top, right, bottom), tronquées comme int() ;
+        # les masques natifs sont relatifs à la boîte prédite, non limitée à l'image
+        scale = np.array([width, height, width, height], dtype=np.float32)
+        predicted_boxes = (boxes[keep][:, [1, 0, 3, 2]] * scale).astype(np.int64)
+        pixel_boxes = np.clip(predicted_boxes, 0, [width, height, width, height]).tolist()
+        kept_classes = classes[keep].astype(np.int64).tolist()
+        kept_scores = scores[keep].tolist()
         
-        return detections
+        # Masques recadrés, construits en un seul lot à la première lecture
+        lazy_masks = None
+        if masks is not None:
+            # Masques natifs du modèle (Mask R-CNN)
+            kept_masks = masks[keep]
+            lazy_masks = _LazyMaskBatch(
+                lambda: reproject_masks(kept_masks, predicted_boxes, (height, width)),
+                len(keep),
+                self.mask_stats,
+                cancel_token
+            )
+        elif generate_approx_masks:
+            # Masques approximatifs (ellipse dans la boîte)
+            lazy_masks = _LazyMaskBatch(
+                lambda: ellipse_masks(pixel_boxes, (height, width)),
+                len(keep),
+                self.mask_stats,
+                cancel_token
+            )
+        
+        return _build_detections(
+            kept_classes, kept_scores, pixel_boxes, (height, width), lazy_masks
+        )
     
-    def _generate_ellipse_mask(
+    def detect_tiled(
         self,
-        left: int, top: int, right: int, bottom: int,
-        image_height: int, image_width: int
-    ) -> np.ndarray:
+        image: np.ndarray,
+        tile_size: int = 1024,
+        overlap: int = 128,
+        threshold: float = 0.5,
+        max_detections: int = 100,
+        generate_approx_masks: bool = True,
+        batch_size: int = 4,
+        iou_threshold: float = 0.5,
+        allowed_classes: Optional[List[int]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Detection]:
         """
-        Génère un masque elliptique approximatif basé sur la boîte englobante.
+        Détecte les objets d'une très grande image par tuiles.
         
-        Args:
-            left, top, right, bottom: Coordonnées de la boîte en pixels
-            image_height: Hauteur de l'image
-            image_width: Largeur de l'image
-            
-        Returns:
-            Masque binaire (float32, 0.0 ou 1.0)
-        """
-        # Créer une image pour dessiner l'ellipse
-        mask_img = Image.new('L', (image_width, image_height), 0)
-        draw = ImageDraw.Draw(mask_img)
-        
-        # Dessiner une ellipse remplie dans la boîte
-        # Réduire légèrement pour un effet plus naturel
-        padding_x = int((right - left) * 0.05)
-        padding_y = int((bottom - top) * 0.05)
-        draw.ellipse(
-            [left + padding_x, top + padding_y, 
-             right - padding_x, bottom - padding_y],
-            fill=255
-        )
+        L'image est découpée en tuiles de même taille qui se chevauchent de
+        overlap pixels ; les tuiles (après le prétraitement éventuel) sont
+        envoyées au modèle par lots de batch_size, une par une si le modèle
+        n'accepte qu'une image par appel (voir max_batch_size), et seules les
+        détections au-dessus du seuil sont conservées.
         
-        return np.array(mask_img, dtype=np.float32) / 255.0
-    
-    def _process_mask(
-        self, 
-        mask: np.ndarray, 
-        box: np.ndarray, 
-        image_height: int, 
-        image_width: int
-    ) -> np.ndarray:
-        """
-        Traite et redimensionne un masque à la taille de l'image.
+        Les détections d'un même objet vues par plusieurs tuiles sont
+        regroupées (voir cluster_boxes) : la détection retenue a le meilleur
+        score du groupe, sa boîte couvre l'union des fragments et son masque
+        est la réunion de leurs masques.
+        
+        La mémoire de l'inférence dépend de la taille des tuiles et non de
+        celle de l'image ; le cache n'est pas utilisé.
         
         Args:
-            mask: Masque brut du modèle
-            box: Boîte englobante normalisée [ymin, xmin, ymax, xmax]
-            image_height: Hauteur de l'image
-            image_width: Largeur de l'image
+            image: Image (H, W, 3)
+            tile_size: Côté des tuiles en pixels
+            overlap: Chevauchement des tuiles voisines en pixels
+            threshold: Seuil de confiance minimum (0.0 à 1.0)
+            max_detections: Nombre maximum de détections pour l'image
+            generate_approx_masks: Génère des masques approximatifs si le modèle n'en fournit pas
+            batch_size: Nombre maximum de tuiles par appel au modèle, réduit
+                à max_batch_size si le modèle impose une limite
+            iou_threshold: Recouvrement au-delà duquel deux détections sont fusionnées
+            allowed_classes: IDs des classes à conserver (None = toutes), filtrées
+                dans chaque tuile avant la fusion
+            cancel_token: Jeton d'annulation, vérifié avant chaque lot de tuiles
+            on_progress: Appelé avec (tuiles traitées, nombre de tuiles) après chaque lot
             
         Returns:
-            Masque binaire de la taille de l'image
+            Liste des détections, par confiance décroissante
+            
+        Raises:
+            InferenceCancelled: Si l'inférence a été annulée
         """
-        ymin, xmin, ymax, xmax = box
+        if not self.is_loaded():
+            raise RuntimeError("Le modèle n'est pas chargé. Appelez load() d'abord.")
+        if tile_size < 1 or batch_size < 1:
+            raise ValueError("tile_size et batch_size doivent être positifs")
+        if not 0 <= overlap < tile_size:
+            raise ValueError("overlap doit être compris entre 0 et tile_size - 1")
+        if self.max_batch_size is not None:
+            batch_size = min(batch_size, self.max_batch_size)
         
-        # Convertir en coordonnées pixels
-        y1 = int(ymin * image_height)
-        x1 = int(xmin * image_width)
-        y2 = int(ymax * image_height)
-        x2 = int(xmax * image_width)
+        height, width = image.shape[:2]
+        tile_height, tile_width = min(tile_size, height), min(tile_size, width)
+        origins = [
+            (top, left)
+            for top in _tile_starts(height, tile_size, overlap)
+            for left in _tile_starts(width, tile_size, overlap)
+        ]
+        # Mise à l'échelle en float32, comme dans postprocess()
+        tile_scale = np.array(
+            [tile_width, tile_height, tile_width, tile_height], dtype=np.float32
+        )
         
-        # Dimensions de la boîte
-        box_height = max(y2 - y1, 1)
-        box_width = max(x2 - x1, 1)
+        all_boxes, all_predicted, all_scores, all_classes, all_regions, all_masks = (
+            [], [], [], [], [], []
+        )
+        for start in range(0, len(origins), batch_size):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            chunk = origins[start:start + batch_size]
+            prepared = [
+                self._prepare_input(image[top:top + tile_height, left:left + tile_width])
+                for top, left in chunk
+            ]
+            batch = np.stack([model_input for model_input, _ in prepared])
+            content_shape = prepared[0][1]
+            results = self._run_model(batch)
+            
+            boxes = results['detection_boxes']
+            if content_shape != batch.shape[1:3]:
+                boxes = _rescale_boxes(boxes, batch.shape[1:3], content_shape)
+            
+            for row, (top, left) in enumerate(chunk):
+                selected = results['detection_scores'][row] >= threshold
+                if allowed_classes is not None:
+                    selected &= np.isin(results['detection_classes'][row], allowed_classes)
+                keep = np.flatnonzero(selected)
+                offset = np.array([left, top, left, top], dtype=np.float64)
+                region = np.array([left, top, left + tile_width, top + tile_height])
+                predicted = boxes[row, keep][:, [1, 0, 3, 2]] * tile_scale + offset
+                # Boîtes limitées à la tuile ; les masques suivent la boîte prédite
+                all_predicted.append(predicted)
+                all_boxes.append(np.clip(predicted, region[[0, 1, 0, 1]], region[[2, 3, 2, 3]]))
+                all_scores.append(results['detection_scores'][row, keep])
+                all_classes.append(results['detection_classes'][row, keep])
+                all_regions.append(np.tile(region, (len(keep), 1)))
+                if 'detection_masks' in results:
+                    all_masks.append(results['detection_masks'][row, keep])
+            del batch, results
+            if on_progress is not None:
+                on_progress(min(start + batch_size, len(origins)), len(origins))
+        
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         
-        # Redimensionner le masque à la taille de la boîte
-        mask_resized = tf.image.resize(
-            mask[..., tf.newaxis], 
-            [box_height, box_width],
-            method='bilinear'
-        ).numpy()[:, :, 0]
+        boxes = np.concatenate(all_boxes)
+        scores = np.concatenate(all_scores)
+        classes = np.concatenate(all_classes).astype(np.int64)
+        keep, parents = cluster_boxes(
+            boxes, scores, classes, iou_threshold, regions=np.concatenate(all_regions)
+        )
+        keep = keep[:max_detections]
+        if keep.size == 0:
+            return []
         
-        # Créer un masque de la taille de l'image
-        full_mask = np.zeros((image_height, image_width), dtype=np.float32)
+        # Boîte fusionnée : union des fragments absorbés par chaque détection
+        position = np.full(len(boxes), -1)
+        position[keep] = np.arange(len(keep))
+        members = np.flatnonzero(position[parents] >= 0)
+        merged = boxes[keep].copy()
+        np.minimum.at(merged[:, 0], position[parents[members]], boxes[members, 0])
+        np.minimum.at(merged[:, 1], position[parents[members]], boxes[members, 1])
+        np.maximum.at(merged[:, 2], position[parents[members]], boxes[members, 2])
+        np.maximum.at(merged[:, 3], position[parents[members]], boxes[members, 3])
+        pixel_boxes = merged.astype(np.int64).tolist()
         
-        # Placer le masque redimensionné dans l'image
-        y1 = max(0, y1)
-        x1 = max(0, x1)
-        y2 = min(image_height, y2)
-        x2 = min(image_width, x2)
+        lazy_masks = None
+        if all_masks:
+            # Les fragments de masque sont réunis dans la boîte fusionnée
+            fragment_masks = np.concatenate(all_masks)[members]
+            fragment_boxes = np.concatenate(all_predicted)[members].astype(np.int64)
+            fragment_owners = position[parents[members]]
+            lazy_masks = _LazyMaskBatch(
+                lambda: _stitch_masks(
+                    reproject_masks(fragment_masks, fragment_boxes, (height, width)),
+                    fragment_boxes,
+                    fragment_owners,
+                    pixel_boxes
+                ),
+                len(keep),
+                self.mask_stats,
+                cancel_token
+            )
+        elif generate_approx_masks:
+            lazy_masks = _LazyMaskBatch(
+                lambda: ellipse_masks(pixel_boxes, (height, width)),
+                len(keep),
+                self.mask_stats,
+                cancel_token
+            )
         
-        mask_h = y2 - y1
-        mask_w = x2 - x1
+        return _build_detections(
+            classes[keep].tolist(),
+            scores[keep].tolist(),
+            pixel_boxes,
+            (height, width),
+            lazy_masks
+        )
+
+
+class _LazyMaskBatch:
+    """
+    Masques d'un ensemble de détections, construits ensemble à la première lecture.
+    
+    La première détection dont on lit le masque déclenche le calcul de tous
+    les masques du lot ; les suivantes réutilisent le résultat. Les masques
+    d'une inférence annulée ne sont jamais construits.
+    """
+    
+    def __init__(
+        self,
+        build: Callable[[], List[np.ndarray]],
+        count: int,
+        stats: MaskStats,
+        cancel_token: Optional[CancellationToken] = None
+    ):
+        self._build = build
+        self._masks: Optional[List[np.ndarray]] = None
+        self._lock = threading.Lock()
+        self._stats = stats
+        self._cancel_token = cancel_token
+        stats.record_deferred(count)
+    
+    def loader(self, index: int) -> Callable[[], np.ndarray]:
+        """Retourne le chargeur du masque d'indice index."""
+        return functools.partial(self._get, index)
+    
+    def _get(self, index: int) -> np.ndarray:
+        with self._lock:
+            if self._masks is None:
+                if self._cancel_token is not None:
+                    self._cancel_token.raise_if_cancelled()
+                self._masks = self._build()
+                self._build = None
+                self._stats.record_built(len(self._masks))
+        return self._masks[index]
+
+
+def _build_detections(
+    classes: List[int],
+    scores: List[float],
+    pixel_boxes: List[List[int]],
+    image_size: Tuple[int, int],
+    lazy_masks: Optional[_LazyMaskBatch]
+) -> List[Detection]:
+    """Crée les objets Detection à partir des tableaux filtrés."""
+    detections = []
+    for position, (class_id, score, box) in enumerate(zip(classes, scores, pixel_boxes)):
+        detections.append(Detection(
+            class_id=class_id,
+            class_name=get_label(class_id, COCO_LABELS),
+            confidence=score,
+            box=tuple(box),
+            mask_origin=(max(0, box[0]), max(0, box[1])),
+            image_size=image_size,
+            mask_loader=lazy_masks.loader(position) if lazy_masks else None
+        ))
+    return detections
+
+
+def _tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+    """
+    Positions de départ des tuiles le long d'un axe.
+    
+    Les tuiles avancent de tile_size - overlap ; la dernière est alignée sur
+    le bord de l'image pour que toutes les tuiles aient la même taille.
+    """
+    if length <= tile_size:
+        return [0]
+    starts = list(range(0, length - tile_size, tile_size - overlap))
+    return starts + [length - tile_size]
+
+
+def _stitch_masks(
+    fragments: List[np.ndarray],
+    fragment_boxes: np.ndarray,
+    owners: np.ndarray,
+    boxes: List[List[int]]
+) -> List[np.ndarray]:
+    """
+    Réunit des fragments de masque dans la boîte de leur détection.
+    
+    Args:
+        fragments: Masques recadrés des fragments (origine max(0, left), max(0, top))
+        fragment_boxes: Boîtes des fragments (N, 4)
+        owners: Indice de la détection de chaque fragment (N,)
+        boxes: Boîtes des détections, qui contiennent l'origine de leurs
+            fragments ; un fragment qui déborde de sa détection est tronqué
         
-        if mask_h > 0 and mask_w > 0:
-            full_mask[y1:y2, x1:x2] = mask_resized[:mask_h, :mask_w]
+    Returns:
+        Un masque recadré par détection
+    """
+    masks = [
+        np.zeros((max(bottom - max(top, 0), 0), max(right - max(left, 0), 0)), dtype=bool)
+        for left, top, right, bottom in boxes
+    ]
+    for fragment, box, owner in zip(fragments, fragment_boxes, owners):
+        mask = masks[owner]
+        y = max(int(box[1]), 0) - max(boxes[owner][1], 0)
+        x = max(int(box[0]), 0) - max(boxes[owner][0], 0)
+        target = mask[y:y + fragment.shape[0], x:x + fragment.shape[1]]
+        target |= fragment[:target.shape[0], :target.shape[1]]
+    return masks
+
+
+def _to_uint8(image: np.ndarray) -> np.ndarray:
+    """Convertit une image en uint8 si nécessaire (valeurs flottantes dans [0, 1])."""
+    if image.dtype != np.uint8:
+        image = (image * 255).astype(np.uint8)
+    return image
+
+
+def _rescale_boxes(
+    boxes: np.ndarray,
+    frame_shape: Tuple[int, int],
+    image_shape: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Renormalise des boîtes exprimées dans un cadre plus grand que l'image.
+    
+    L'image occupe le coin supérieur gauche du cadre (remplissage en bas et
+    à droite) ; les coordonnées sont exprimées par rapport à l'image. Elles ne
+    sont pas limitées à [0, 1] : une boîte qui déborde dans le remplissage
+    garde sa taille, à laquelle se rapporte son masque Mask R-CNN.
+    
+    Args:
+        boxes: Boîtes normalisées [..., 4] au format [ymin, xmin, ymax, xmax]
+        frame_shape: Dimensions (hauteur, largeur) du cadre complété
+        image_shape: Dimensions (hauteur, largeur) de l'image d'origine
         
-        return full_mask
+    Returns:
+        Boîtes normalisées par rapport à l'image
+    """
+    scale_y = frame_shape[0] / image_shape[0]
+    scale_x = frame_shape[1] / image_shape[1]
+    scale = np.array([scale_y, scale_x, scale_y, scale_x], dtype=np.float32)
+    return (boxes * scale).astype(np.float32)
+
+
+def _signature_batch_size(model) -> Optional[int]:
+    """
+    Taille de batch imposée par la signature de service d'un modèle.
+
+    Returns:
+        Première dimension de l'entrée si elle est fixe, None si elle est
+        libre ou si le modèle n'expose pas de signature
+    """
+    signatures = getattr(model, 'signatures', None)
+    if not signatures or 'serving_default' not in signatures:
+        return None
+    _, inputs = signatures['serving_default'].structured_input_signature
+    for spec in inputs.values():
+        if spec.shape.rank and spec.shape[0] is not None:
+            return int(spec.shape[0])
+    return None
 
 
 def get_model_info(model_name: str) -> ModelInfo:
@@ -244,5 +895,6 @@ def get_model_info(model_name: str) -> ModelInfo:
         model_type=info["type"],
         speed=info["speed"],
         accuracy=info["accuracy"],
-        description=info["description"]
+        description=info["description"],
+        input_size=info.get("input_size")
     )
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+Cache persistant des sorties brutes du modèle.
+
+Complète PredictionCache : les sorties sont conservées dans une base SQLite
+sur disque et survivent aux redémarrages du serveur. La base peut être
+partagée par plusieurs processus (journal WAL, verrous SQLite) ; sa taille
+est bornée et les entrées les moins récemment lues sont supprimées en premier.
+Les entrées épinglées (ex. résultats précalculés des images d'exemple, voir
+precompute_examples.py) ne sont jamais supprimées par la limite de taille
+ni par clear(), sauf demande explicite.
+
+Les lectures n'écrivent pas dans la base : leurs dates sont conservées en
+mémoire et écrites par lots (voir ACCESS_FLUSH_INTERVAL), pour que les
+lecteurs des différents processus ne se disputent pas le verrou d'écriture.
+"""
+
+import io
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Sorties lues par ObjectDetector.postprocess() ; les autres (ex.
+# raw_detection_scores des modèles SSD, plusieurs centaines de Ko) ne sont
+# pas conservées
+STORED_OUTPUTS = (
+    'detection_boxes',
+    'detection_classes',
+    'detection_scores',
+    'detection_masks',
+    'num_detections',
+)
+
+# Intervalle minimal, en secondes, entre deux écritures des dates de lecture ;
+# les dates en attente sont aussi écrites avant chaque éviction
+ACCESS_FLUSH_INTERVAL = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS predictions_last_access ON predictions (last_access);
+"""
+
+
+def key_to_text(key: Hashable) -> str:
+    """
+    Représentation textuelle d'une clé de PredictionCache, utilisée dans la base.
+
+    Args:
+        key: Clé construite par PredictionCache.make_key() (ou chaîne)
+    """
+    if isinstance(key, tuple):
+        return "|".join(str(part) for part in key)
+    return str(key)
+
+
+# Sorties par détection (axe 1), tronquées aux détections utiles
+PER_DETECTION_OUTPUTS = (
+    'detection_boxes',
+    'detection_classes',
+    'detection_scores',
+    'detection_masks',
+)
+
+
+def stored_detections(results: Dict[str, np.ndarray], min_score: float = 0.0) -> int:
+    """
+    Nombre de détections qu'ObjectDetector.postprocess() peut lire.
+
+    Les détections sont triées par score décroissant : ce sont les
+    num_detections premières dont le score atteint min_score.
+
+    Args:
+        results: Sorties brutes du modèle
+        min_score: Seuil de confiance minimum utilisé avec ces sorties
+
+    Returns:
+        Nombre de détections à conserver
+    """
+    scores = np.asarray(results['detection_scores'])[0]
+    count = len(scores)
+    if results.get('num_detections') is not None:
+        count = min(count, int(np.asarray(results['num_detections']).reshape(-1)[0]))
+    return int(np.count_nonzero(scores[:count] >= min_score))
+
+
+def encode_results(results: Dict[str, np.ndarray], min_score: float = 0.0) -> bytes:
+    """
+    Sérialise des sorties du modèle au format npz compressé.
+
+    Seules les détections lisibles par postprocess() (voir stored_detections)
+    sont conservées : pour un modèle Mask R-CNN, les masques des centaines
+    de propositions de score faible forment l'essentiel des sorties. Les
+    masques gardés le sont sans perte : reproject_masks() ne les seuille
+    qu'après interpolation, et une quantification ferait basculer des pixels
+    de bord entre un calcul et une lecture du cache.
+
+    Args:
+        results: Sorties brutes du modèle
+        min_score: Seuil de confiance minimum utilisé avec ces sorties ; les
+            détections de score inférieur ne sont pas conservées
+
+    Returns:
+        Contenu du fichier npz
+    """
+    count = None
+    if results.get('detection_scores') is not None:
+        count = stored_detections(results, min_score)
+    arrays = {}
+    for name in STORED_OUTPUTS:
+        value = results.get(name)
+        if value is None:
+            continue
+        value = np.asarray(value)
+        if count is not None and name in PER_DETECTION_OUTPUTS:
+            value = value[:, :count]
+        arrays[name] = value
+    if count is not None:
+        arrays['num_detections'] = np.array([count], dtype=np.float32)
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def decode_results(data: bytes) -> Dict[str, np.ndarray]:
+    """
+    Désérialise des sorties produites par encode_results().
+
+    Args:
+        data: Contenu du fichier npz
+
+    Returns:
+        Sorties du modèle
+    """
+    with np.load(io.BytesIO(data)) as archive:
+        return {name: archive[name] for name in archive.files}
+
+
+class DiskPredictionCache:
+    """
+    Cache SQLite des sorties brutes de ``predict()``, borné en taille.
+
+    Même interface que PredictionCache (get, put, stats) : les clés sont
+    celles de PredictionCache.make_key(). Chaque thread utilise sa propre
+    connexion à la base. La limite de taille ne porte que sur les entrées
+    non épinglées.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 512 << 20,
+        timeout: float = 30.0,
+        min_score: float = 0.0
+    ):
+        """
+        Initialise le cache (la base est créée si nécessaire).
+
+        Args:
+            path: Fichier de la base SQLite
+            max_bytes: Taille maximale des entrées non épinglées, en octets
+            timeout: Attente maximale d'un verrou détenu par un autre processus, en secondes
+            min_score: Seuil de confiance minimum des lectures ; les détections
+                de score inférieur ne sont pas conservées (voir encode_results)
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes doit être positif")
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.min_score = min_score
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion à la base propre au thread courant."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: Hashable, count_miss: bool = True) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Retourne les sorties associées à une clé.
+
+        Args:
+            key: Clé construite par PredictionCache.make_key()
+            count_miss: Compte un défaut dans les statistiques
+
+        Returns:
+            Dictionnaire des sorties ou None si absent
+        """
+        connection = self._connection()
+        key = key_to_text(key)
+        row = connection.execute(
+            "SELECT data FROM predictions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            if count_miss:
+                with self._lock:
+                    self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._accessed[key] = time.time()
+            flush = time.monotonic() - self._last_flush >= ACCESS_FLUSH_INTERVAL
+        if flush:
+            self.flush_access_times()
+        return decode_results(row[0])
+
+    def _take_access_times(self) -> List[Tuple[float, str]]:
+        """Retire les dates de lecture en attente, au format des requêtes UPDATE."""
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+            self._last_flush = time.monotonic()
+        return [(when, key) for key, when in accessed.items()]
+
+    def _write_access_times(
+        self,
+        connection: sqlite3.Connection,
+        accessed: List[Tuple[float, str]]
+    ) -> None:
+        """Écrit (transaction ouverte) des dates de lecture, sans jamais les reculer."""
+        connection.executemany(
+            "UPDATE predictions SET last_access = MAX(last_access, ?) WHERE key = ?",
+            accessed
+        )
+
+    def flush_access_times(self) -> None:
+        """Écrit en une transaction les dates de lecture en attente."""
+        accessed = self._take_access_times()
+        if not accessed:
+            return
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_access_times(connection, accessed)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def put(self, key: Hashable, results: Dict[str, np.ndarray], pinned: bool = False) -> None:
+        """
+        Enregistre les sorties associées à une clé, puis applique la limite de taille.
+
+        Args:
+            key: Clé construite par PredictionCache.make_key()
+            results: Sorties brutes du modèle
+            pinned: Épingle l'entrée (jamais supprimée par la limite de taille) ;
+                une entrée déjà épinglée le reste
+        """
+        data = encode_results(results, self.min_score)
+        now = time.time()
+        accessed = self._take_access_times()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Dates de lecture à jour avant le choix des entrées à supprimer
+            self._write_access_times(connection, accessed)
+            connection.execute(
+                "INSERT INTO predictions (key, data, size, created, last_access, pinned) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET data = excluded.data, size = excluded.size, "
+                "created = excluded.created, last_access = excluded.last_access, "
+                "pinned = MAX(pinned, excluded.pinned)",
+                (key_to_text(key), data, len(data), now, now, int(pinned))
+            )
+            evicted = self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.writes += 1
+            self.evictions += evicted
+
+    def _evict(self, connection: sqlite3.Connection) -> int:
+        """Supprime (transaction ouverte) les entrées les plus anciennes au-delà de max_bytes."""
+        excess = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM predictions WHERE pinned = 0"
+        ).fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        victims = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM predictions WHERE pinned = 0 ORDER BY last_access"
+        ):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM predictions WHERE key = ?", victims)
+        return len(victims)
+
+    def pin(self, keys: Iterable[Hashable], pinned: bool = True) -> int:
+        """
+        Épingle (ou désépingle) des entrées existantes.
+
+        Args:
+            keys: Clés construites par PredictionCache.make_key() ou key_to_text()
+            pinned: False pour désépingler
+
+        Returns:
+            Nombre d'entrées modifiées
+        """
+        connection = self._connection()
+        before = connection.total_changes
+        connection.executemany(
+            "UPDATE predictions SET pinned = ? WHERE key = ?",
+            [(int(pinned), key_to_text(key)) for key in keys]
+        )
+        return connection.total_changes - before
+
+    def pinned_keys(self, prefix: str = '') -> List[str]:
+        """
+        Retourne les clés (texte) des entrées épinglées.
+
+        Args:
+            prefix: Ne retourne que les clés commençant par ce préfixe
+        """
+        rows = self._connection().execute(
+            "SELECT key FROM predictions WHERE pinned = 1 AND substr(key, 1, ?) = ?",
+            (len(prefix), prefix)
+        )
+        return [row[0] for row in rows]
+
+    def clear(self, include_pinned: bool = False) -> None:
+        """
+        Vide le cache.
+
+        Args:
+            include_pinned: Supprime aussi les entrées épinglées (par défaut,
+                elles sont conservées comme pour la limite de taille)
+        """
+        with self._lock:
+            self._accessed.clear()
+        if include_pinned:
+            self._connection().execute("DELETE FROM predictions")
+        else:
+            self._connection().execute("DELETE FROM predictions WHERE pinned = 0")
+
+    def close(self) -> None:
+        """Écrit les dates de lecture en attente et ferme la connexion du thread courant."""
+        self.flush_access_times()
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM predictions WHERE key = ?", (key_to_text(key),)
+        ).fetchone() is not None
+
+    def size(self) -> int:
+        """Taille des données conservées, en octets."""
+        return self._connection().execute(
+            "SELECT COALESCE(SUM(size), 0) FROM predictions"
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Retourne les statistiques du cache.
+
+        Returns:
+            Nombre d'entrées (dont épinglées) et taille de la base (tous
+            processus confondus), succès, défauts, écritures et évictions de
+            ce processus, et taux de succès (0.0 sans lecture)
+        """
+        connection = self._connection()
+        entries, pinned, size = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(pinned), 0), COALESCE(SUM(size), 0) FROM predictions"
+        ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'pinned': pinned,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
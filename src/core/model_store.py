@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Dépôt local des modèles TensorFlow Hub.
+
+Chaque modèle de AVAILABLE_MODELS peut être importé une fois dans un dossier
+local (SavedModel décompressé) accompagné d'un manifeste des fichiers avec
+leur taille et leur empreinte SHA-256. ObjectDetector.load() utilise alors
+cette copie, sans accès réseau.
+
+Usage (depuis src/) :
+    python -m core.model_store import "SSD MobileNet V2"
+    python -m core.model_store list
+    python -m core.model_store verify
+    python -m core.model_store bench "SSD MobileNet V2"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .constants import AVAILABLE_MODELS
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ModelStoreError(Exception):
+    """Erreur d'accès au dépôt local des modèles."""
+
+
+class ModelStore:
+    """
+    Dépôt local de SavedModels avec manifeste d'intégrité.
+
+    Organisation du dossier racine :
+        <racine>/<nom_du_modèle>/manifest.json
+        <racine>/<nom_du_modèle>/saved_model.pb
+        <racine>/<nom_du_modèle>/variables/...
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialise le dépôt.
+
+        Args:
+            root: Dossier racine du dépôt (créé au premier import)
+        """
+        self.root = Path(root)
+
+    def path(self, model_name: str) -> Path:
+        """Retourne le dossier d'un modèle dans le dépôt."""
+        _check_model_name(model_name)
+        return self.root / _slug(model_name)
+
+    def has(self, model_name: str) -> bool:
+        """Vérifie si un modèle a été importé dans le dépôt."""
+        return (self.path(model_name) / MANIFEST_NAME).is_file()
+
+    def manifest(self, model_name: str) -> Dict:
+        """
+        Lit le manifeste d'un modèle.
+
+        Raises:
+            ModelStoreError: Si le modèle n'est pas dans le dépôt
+        """
+        if not self.has(model_name):
+            raise ModelStoreError(f"Modèle absent du dépôt local: {model_name}")
+        with open(self.path(model_name) / MANIFEST_NAME, encoding="utf-8") as file:
+            return json.load(file)
+
+    def import_model(self, model_name: str, source: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Copie un SavedModel dans le dépôt et écrit son manifeste.
+
+        Args:
+            model_name: Nom du modèle (clé de AVAILABLE_MODELS)
+            source: Dossier SavedModel à importer ; par défaut le modèle est
+                téléchargé depuis TensorFlow Hub (hub.resolve)
+
+        Returns:
+            Dossier du modèle dans le dépôt
+        """
+        target = self.path(model_name)
+        url = AVAILABLE_MODELS[model_name]["url"]
+        if source is None:
+            import tensorflow_hub as hub
+            source = hub.resolve(url)
+        source = Path(source)
+        if not (source / "saved_model.pb").is_file():
+            raise ModelStoreError(f"Pas de SavedModel dans {source}")
+
+        # Copie dans un dossier temporaire puis renommage : un import
+        # interrompu ne laisse jamais de modèle incomplet dans le dépôt
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".{target.name}.tmp"
+        if staging.exists():
+            shutil.rmtree(staging)
+        shutil.copytree(source, staging)
+
+        manifest = {
+            "model_name": model_name,
+            "url": url,
+            "imported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "files": {
+                relative: {"size": file.stat().st_size, "sha256": _sha256(file)}
+                for relative, file in _list_files(staging).items()
+            },
+        }
+        with open(staging / MANIFEST_NAME, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2, ensure_ascii=False)
+
+        if target.exists():
+            shutil.rmtree(target)
+        staging.rename(target)
+        return target
+
+    def list_models(self) -> List[Dict]:
+        """
+        Liste les modèles disponibles et leur présence dans le dépôt.
+
+        Returns:
+            Une entrée par modèle de AVAILABLE_MODELS : nom, présence,
+            taille totale en octets et date d'import
+        """
+        entries = []
+        for model_name in AVAILABLE_MODELS:
+            entry = {"model_name": model_name, "stored": self.has(model_name),
+                     "size": 0, "imported_at": None}
+            if entry["stored"]:
+                manifest = self.manifest(model_name)
+                entry["size"] = sum(info["size"] for info in manifest["files"].values())
+                entry["imported_at"] = manifest["imported_at"]
+            entries.append(entry)
+        return entries
+
+    def verify(self, model_name: str, checksums: bool = True) -> List[str]:
+        """
+        Vérifie l'intégrité d'un modèle du dépôt.
+
+        Args:
+            model_name: Nom du modèle
+            checksums: Recalcule les empreintes SHA-256 ; sinon seules la
+                présence et la taille des fichiers sont contrôlées
+
+        Returns:
+            Liste des problèmes trouvés (vide si le modèle est intact)
+        """
+        manifest = self.manifest(model_name)
+        folder = self.path(model_name)
+        problems = []
+        for relative, info in manifest["files"].items():
+            file = folder / relative
+            if not file.is_file():
+                problems.append(f"fichier manquant : {relative}")
+            elif file.stat().st_size != info["size"]:
+                problems.append(f"taille incorrecte : {relative}")
+            elif checksums and _sha256(file) != info["sha256"]:
+                problems.append(f"empreinte incorrecte : {relative}")
+        return problems
+
+    def load(self, model_name: str):
+        """
+        Charge un modèle depuis le dépôt.
+
+        Seules la présence et la taille des fichiers sont contrôlées avant le
+        chargement ; la vérification complète se fait avec verify().
+
+        Raises:
+            ModelStoreError: Si le modèle est absent ou incomplet
+        """
+        problems = self.verify(model_name, checksums=False)
+        if problems:
+            raise ModelStoreError(
+                f"Copie locale de {model_name} corrompue : " + ", ".join(problems)
+            )
+        import tensorflow_hub as hub
+        return hub.load(str(self.path(model_name)))
+
+    def drop_page_cache(self, model_name: str) -> bool:
+        """
+        Retire les fichiers d'un modèle du cache de pages du système.
+
+        Permet de mesurer un chargement à froid sans redémarrer la machine.
+
+        Returns:
+            False si la plateforme ne le permet pas (posix_fadvise absent)
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return False
+        for file in _list_files(self.path(model_name)).values():
+            fd = os.open(file, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+        return True
+
+    def benchmark_load(self, model_name: str) -> Dict[str, Optional[float]]:
+        """
+        Mesure le temps de chargement à froid puis à chaud d'un modèle.
+
+        Returns:
+            Durées en secondes : 'cold' (après retrait du cache de pages,
+            None si impossible) et 'warm' (fichiers déjà en mémoire)
+        """
+        timings: Dict[str, Optional[float]] = {"cold": None}
+        if self.drop_page_cache(model_name):
+            start = time.perf_counter()
+            self.load(model_name)
+            timings["cold"] = time.perf_counter() - start
+        else:
+            self.load(model_name)
+
+        start = time.perf_counter()
+        self.load(model_name)
+        timings["warm"] = time.perf_counter() - start
+        return timings
+
+
+def _check_model_name(model_name: str) -> None:
+    """Vérifie qu'un nom de modèle existe dans AVAILABLE_MODELS."""
+    if model_name not in AVAILABLE_MODELS:
+        raise ValueError(f"Modèle inconnu: {model_name}")
+
+
+def _slug(model_name: str) -> str:
+    """Nom de dossier d'un modèle (ex. 'ssd_mobilenet_v2')."""
+    return re.sub(r"[^a-z0-9]+", "_", model_name.lower()).strip("_")
+
+
+def _list_files(folder: Path) -> Dict[str, Path]:
+    """Fichiers du SavedModel (hors manifeste), par chemin relatif POSIX."""
+    return {
+        file.relative_to(folder).as_posix(): file
+        for file in sorted(folder.rglob("*"))
+        if file.is_file() and file.name != MANIFEST_NAME
+    }
+
+
+def _sha256(file: Path) -> str:
+    """Empreinte SHA-256 d'un fichier, lu par blocs."""
+    digest = hashlib.sha256()
+    with open(file, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# =============================================================================
+# LIGNE DE COMMANDE
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config import MODEL_STORE_DIR
+
+    parser = argparse.ArgumentParser(description="Dépôt local des modèles TensorFlow Hub")
+    parser.add_argument("--root", default=str(MODEL_STORE_DIR), help="Dossier du dépôt")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Importe des modèles")
+    import_parser.add_argument("models", nargs="+")
+    import_parser.add_argument("--source", help="Dossier SavedModel déjà téléchargé")
+
+    commands.add_parser("list", help="Liste les modèles et leur présence")
+
+    verify_parser = commands.add_parser("verify", help="Vérifie les empreintes")
+    verify_parser.add_argument("models", nargs="*")
+
+    bench_parser = commands.add_parser("bench", help="Temps de chargement à froid et à chaud")
+    bench_parser.add_argument("models", nargs="+")
+
+    args = parser.parse_args(argv)
+    store = ModelStore(args.root)
+
+    if args.command == "import":
+        if args.source and len(args.models) > 1:
+            parser.error("--source n'accepte qu'un seul modèle")
+        for model_name in args.models:
+            path = store.import_model(model_name, source=args.source)
+            print(f"✅ {model_name} → {path}")
+        return 0
+
+    if args.command == "list":
+        for entry in store.list_models():
+            status = (f"{entry['size'] / 1e6:8.1f} Mo  {entry['imported_at']}"
+                      if entry["stored"] else "absent")
+            print(f"{entry['model_name']:<36} {status}")
+        return 0
+
+    if args.command == "verify":
+        names = args.models or [e["model_name"] for e in store.list_models() if e["stored"]]
+        failed = 0
+        for model_name in names:
+            problems = store.verify(model_name)
+            print(f"{'✅' if not problems else '❌'} {model_name}")
+            for problem in problems:
+                print(f"    {problem}")
+            failed += bool(problems)
+        return 1 if failed else 0
+
+    for model_name in args.models:
+        timings = store.benchmark_load(model_name)
+        cold = f"{timings['cold']:.2f} s" if timings["cold"] is not None else "n/d"
+        print(f"{model_name:<36} à froid : {cold:>8}  à chaud : {timings['warm']:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
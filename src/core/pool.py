@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de détecteurs chargés, borné par un budget mémoire.
+
+Chaque modèle chargé occupe de quelques centaines de Mo à plusieurs Go : le
+pool mesure la mémoire résidente prise par chaque chargement et libère les
+détecteurs les moins récemment utilisés lorsque le budget est dépassé.
+"""
+
+import gc
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .detector import ObjectDetector
+
+
+def resident_memory() -> int:
+    """
+    Retourne la mémoire résidente du processus en octets.
+
+    Lue dans /proc/self/statm (Linux) ; 0 si indisponible.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return 0
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class DetectorPool:
+    """
+    Pool LRU de détecteurs chargés, borné par un budget mémoire.
+
+    Les chargements sont faits en arrière-plan par un unique thread : la
+    taille d'un détecteur est la croissance de la mémoire résidente pendant
+    son chargement, sans chargement concurrent pour fausser la mesure. Le
+    détecteur qui vient d'être chargé n'est jamais évincé, même s'il dépasse
+    à lui seul le budget.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], ObjectDetector],
+        memory_budget: int,
+        measure: Callable[[], int] = resident_memory,
+        on_evict: Optional[Callable[[str, ObjectDetector], None]] = None
+    ):
+        """
+        Initialise le pool.
+
+        Args:
+            factory: Crée et charge le détecteur d'un modèle
+            memory_budget: Mémoire maximale des détecteurs conservés, en octets
+            measure: Mesure de la mémoire résidente du processus, en octets
+            on_evict: Appelé avec (nom, détecteur) pour chaque détecteur libéré,
+                afin de libérer les ressources associées
+        """
+        if memory_budget < 1:
+            raise ValueError("memory_budget doit être positif")
+
+        self.factory = factory
+        self.memory_budget = memory_budget
+        self._measure = measure
+        self._on_evict = on_evict
+        self._detectors: "OrderedDict[str, ObjectDetector]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detector-loader")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_name: str, timeout: Optional[float] = None) -> ObjectDetector:
+        """
+        Retourne le détecteur d'un modèle, en attendant son chargement si nécessaire.
+
+        Args:
+            model_name: Nom du modèle
+            timeout: Attente maximale en secondes (None : sans limite)
+
+        Returns:
+            Détecteur chargé
+
+        Raises:
+            concurrent.futures.TimeoutError: Si le chargement dépasse timeout
+            Exception: L'erreur levée par le chargement du modèle
+        """
+        with self._lock:
+            detector = self._detectors.get(model_name)
+            if detector is not None:
+                self._detectors.move_to_end(model_name)
+                self.hits += 1
+                return detector
+        return self.preload(model_name).result(timeout)
+
+    def preload(self, model_name: str) -> Future:
+        """
+        Lance le chargement d'un modèle en arrière-plan et rend la main aussitôt.
+
+        Un modèle déjà chargé ou en cours de chargement n'est pas rechargé.
+
+        Args:
+            model_name: Nom du modèle
+
+        Returns:
+            Future dont le résultat est le détecteur chargé
+        """
+        with self._lock:
+            detector = self._detectors.get(model_name)
+            if detector is not None:
+                future: Future = Future()
+                future.set_result(detector)
+                return future
+
+            future = self._pending.get(model_name)
+            if future is None:
+                self.misses += 1
+                future = self._loader.submit(self._load, model_name)
+                self._pending[model_name] = future
+            return future
+
+    def status(self, model_name: str) -> str:
+        """Retourne 'ready' (chargé), 'loading' (en cours) ou 'absent'."""
+        with self._lock:
+            if model_name in self._detectors:
+                return 'ready'
+            if model_name in self._pending:
+                return 'loading'
+            return 'absent'
+
+    def _load(self, model_name: str) -> ObjectDetector:
+        """Charge un modèle (thread de chargement) et l'ajoute au pool."""
+        try:
+            before = self._measure()
+            detector = self.factory(model_name)
+            size = max(self._measure() - before, 0)
+            with self._lock:
+                self._sizes[model_name] = size
+                self._detectors[model_name] = detector
+                self._evict(keep=model_name)
+            return detector
+        finally:
+            with self._lock:
+                self._pending.pop(model_name, None)
+
+    def _evict(self, keep: str) -> None:
+        """Évince les détecteurs les plus anciens tant que le budget est dépassé."""
+        evicted = False
+        while self.memory_used() > self.memory_budget and len(self._detectors) > 1:
+            model_name = next(iter(self._detectors))
+            if model_name == keep:
+                break
+            detector = self._detectors.pop(model_name)
+            del self._sizes[model_name]
+            self.evictions += 1
+            evicted = True
+            if self._on_evict is not None:
+                self._on_evict(model_name, detector)
+            del detector
+        if evicted:
+            # Les graphes TensorFlow contiennent des cycles de références
+            gc.collect()
+
+    def memory_used(self) -> int:
+        """Mémoire estimée des détecteurs conservés, en octets."""
+        return sum(self._sizes.values())
+
+    def size_of(self, model_name: str) -> Optional[int]:
+        """Mémoire mesurée au chargement d'un modèle du pool (None si absent)."""
+        return self._sizes.get(model_name)
+
+    def models(self) -> List[str]:
+        """Modèles chargés, du moins au plus récemment utilisé."""
+        with self._lock:
+            return list(self._detectors)
+
+    def clear(self) -> None:
+        """Libère tous les détecteurs (les chargements en cours se poursuivent)."""
+        with self._lock:
+            detectors = list(self._detectors.items())
+            self._detectors.clear()
+            self._sizes.clear()
+        if self._on_evict is not None:
+            for model_name, detector in detectors:
+                self._on_evict(model_name, detector)
+        del detectors
+        gc.collect()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête le thread de chargement ; les chargements en attente sont annulés."""
+        self._loader.shutdown(wait=wait, cancel_futures=True)
+
+    def __len__(self) -> int:
+        return len(self._detectors)
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self._detectors
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les statistiques d'utilisation du pool."""
+        with self._lock:
+            return {
+                'entries': len(self._detectors),
+                'loading': len(self._pending),
+                'memory_used': self.memory_used(),
+                'memory_budget': self.memory_budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
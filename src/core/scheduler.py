@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Ordonnanceur d'inférence partagé entre les sessions.
+
+Les requêtes predict() de toutes les sessions sont mises en file ; des
+threads d'inférence dédiés les regroupent en micro-lots (au plus
+max_batch_size images, en attendant au plus max_wait secondes après la
+première) et les exécutent avec ObjectDetector.predict_batch(). Les résultats
+sont rendus par des futures.
+
+Les modèles du zoo TF2 n'acceptent qu'une image par appel : chaque lot est
+alors une seule requête, et ce sont les threads d'inférence (workers) qui
+exécutent en parallèle les requêtes des sessions.
+"""
+
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import CancelledError, Future, TimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cancellation import CancellationToken, InferenceCancelled
+from .data_types import Detection
+from .detector import ObjectDetector
+
+
+class InferenceScheduler:
+    """
+    File d'attente et micro-lots d'inférence pour un détecteur.
+
+    Le post-traitement (seuil, top-k, masques) reste dans le thread de
+    l'appelant : seul l'appel au modèle passe par le thread d'inférence.
+    """
+
+    def __init__(
+        self,
+        detector: ObjectDetector,
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+        bucket_size: int = 64,
+        workers: int = 1
+    ):
+        """
+        Initialise l'ordonnanceur et démarre ses threads d'inférence.
+
+        Args:
+            detector: Détecteur chargé
+            max_batch_size: Nombre maximum d'images par micro-lot, réduit à
+                detector.max_batch_size si la signature du modèle impose une
+                limite (une requête par appel pour les modèles du zoo TF2)
+            max_wait: Attente maximale en secondes pour compléter un lot
+            bucket_size: Granularité des paliers de taille (voir predict_batch)
+            workers: Nombre de threads d'inférence, donc de lots exécutés
+                simultanément
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size doit être supérieur ou égal à 1")
+        if workers < 1:
+            raise ValueError("workers doit être supérieur ou égal à 1")
+        if max_wait < 0:
+            raise ValueError("max_wait doit être positif ou nul")
+        if detector.max_batch_size is not None:
+            max_batch_size = min(max_batch_size, detector.max_batch_size)
+
+        self.detector = detector
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.bucket_size = bucket_size
+        self.workers = workers
+
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.requests = 0
+        self.batches = 0
+        self.cancelled = 0
+        self.batch_sizes: Counter = Counter()
+        self.queue_depths: Counter = Counter()
+
+        self._threads = [
+            threading.Thread(
+                target=self._run,
+                name=f"inference-{detector.model_name}-{index}",
+                daemon=True
+            )
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        image: np.ndarray,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Future:
+        """
+        Met une image en file d'attente.
+
+        Args:
+            image: Image (H, W, 3)
+            cancel_token: Jeton d'annulation ; une requête annulée avant le
+                départ de son lot est retirée du lot
+
+        Returns:
+            Future dont le résultat est la sortie brute de predict()
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("L'ordonnanceur est arrêté")
+            self.requests += 1
+            self._queue.put((image, future))
+        if cancel_token is not None:
+            cancel_token.add_callback(future.cancel)
+        return future
+
+    def predict(
+        self,
+        image: np.ndarray,
+        timeout: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        on_wait: Optional[Callable[[float], None]] = None,
+        poll_interval: float = 0.1
+    ) -> Dict[str, np.ndarray]:
+        """
+        Équivalent de ObjectDetector.predict() passant par la file d'attente.
+
+        Args:
+            image: Image (H, W, 3)
+            timeout: Attente maximale en secondes (None : sans limite)
+            cancel_token: Jeton d'annulation de la requête
+            on_wait: Appelé avec le temps écoulé toutes les poll_interval
+                secondes tant que le résultat n'est pas prêt
+            poll_interval: Intervalle entre deux appels de on_wait
+
+        Raises:
+            InferenceCancelled: Si la requête a été annulée
+            concurrent.futures.TimeoutError: Si le résultat dépasse timeout
+        """
+        future = self.submit(image, cancel_token)
+        start = time.monotonic()
+        try:
+            if on_wait is None:
+                return future.result(timeout)
+            while True:
+                try:
+                    return future.result(poll_interval)
+                except TimeoutError:
+                    elapsed = time.monotonic() - start
+                    if timeout is not None and elapsed >= timeout:
+                        raise
+                    on_wait(elapsed)
+        except CancelledError:
+            raise InferenceCancelled("Inférence annulée") from None
+
+    def detect(
+        self,
+        image: np.ndarray,
+        threshold: float = 0.5,
+        max_detections: int = 100,
+        generate_approx_masks: bool = True,
+        allowed_classes: Optional[List[int]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        on_wait: Optional[Callable[[float], None]] = None
+    ) -> List[Detection]:
+        """
+        Équivalent de ObjectDetector.detect() passant par la file d'attente.
+
+        Args:
+            image: Image (H, W, 3)
+            threshold: Seuil de confiance minimum (0.0 à 1.0)
+            max_detections: Nombre maximum de détections
+            generate_approx_masks: Génère des masques approximatifs si le modèle n'en fournit pas
+            allowed_classes: IDs des classes à conserver (None = toutes)
+            cancel_token: Jeton d'annulation, vérifié avant chaque étape
+            on_wait: Appelé régulièrement avec le temps écoulé pendant l'inférence
+
+        Returns:
+            Liste des détections
+
+        Raises:
+            InferenceCancelled: Si l'inférence a été annulée
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        results = self.predict(image, cancel_token=cancel_token, on_wait=on_wait)
+        return self.detector.postprocess(
+            results,
+            image.shape[:2],
+            threshold=threshold,
+            max_detections=max_detections,
+            generate_approx_masks=generate_approx_masks,
+            allowed_classes=allowed_classes,
+            cancel_token=cancel_token
+        )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Arrête les threads d'inférence après les requêtes déjà en file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Un marqueur d'arrêt par thread
+            for _ in self._threads:
+                self._queue.put(None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _next_batch(self) -> Optional[List[Tuple[np.ndarray, Future]]]:
+        """Attend une requête puis complète le lot jusqu'à max_wait ou max_batch_size."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        depth = self._queue.qsize() + 1
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Arrêt demandé : rendre le marqueur, traiter le lot en cours
+                # puis s'arrêter
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        with self._lock:
+            self.queue_depths[depth] += 1
+        return batch
+
+    def _run(self) -> None:
+        """Boucle d'un thread d'inférence."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            # Les requêtes annulées entre-temps ne sont pas exécutées
+            pending = len(batch)
+            batch = [(image, future) for image, future in batch
+                     if future.set_running_or_notify_cancel()]
+            with self._lock:
+                self.cancelled += pending - len(batch)
+            if not batch:
+                continue
+
+            with self._lock:
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+
+            try:
+                outputs = self.detector.predict_batch(
+                    [image for image, _ in batch],
+                    batch_size=self.max_batch_size,
+                    bucket_size=self.bucket_size
+                )
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+
+            for (_, future), results in zip(batch, outputs):
+                future.set_result(results)
+
+    def stats(self) -> Dict:
+        """
+        Retourne les statistiques de l'ordonnanceur.
+
+        Returns:
+            Dictionnaire avec le nombre de threads, de requêtes, de lots et de requêtes
+            annulées avant exécution, la taille moyenne des lots, et les
+            histogrammes {valeur: occurrences} de la taille des lots et de
+            la profondeur de file à leur formation
+        """
+        with self._lock:
+            executed = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                'workers': self.workers,
+                'requests': self.requests,
+                'batches': self.batches,
+                'cancelled': self.cancelled,
+                'pending': self._queue.qsize(),
+                'mean_batch_size': executed / self.batches if self.batches else 0.0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'queue_depths': dict(sorted(self.queue_depths.items())),
+            }
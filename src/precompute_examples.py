@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Précalcul des détections des images d'exemple.
+
+Exécute chaque modèle sur toutes les images de data/exemple, par lots, et
+enregistre les sorties brutes dans le cache disque de l'application
+(entrées épinglées, jamais supprimées par la limite de taille). Lorsqu'un
+exemple est choisi dans l'interface, ses résultats sont alors servis sans
+attendre le modèle.
+
+Seules les images nouvelles ou modifiées sont recalculées : la clé de cache
+contient l'empreinte de l'image, l'URL du modèle et la version du
+prétraitement. Les entrées des images supprimées ou modifiées sont
+désépinglées.
+
+Usage (depuis src/) :
+    python precompute_examples.py
+    python precompute_examples.py --models "SSD MobileNet V2" --batch-size 4
+
+Par défaut, chaque modèle reçoit autant d'images par appel que sa signature
+le permet : une seule pour les modèles du zoo de détection TF2.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Ajouter le répertoire src au path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import (
+    DATA_DIR,
+    INPUT_PREPROCESSING,
+    MIN_THRESHOLD,
+    MODEL_STORE_DIR,
+    PREDICTION_DISK_CACHE,
+    PREDICTION_DISK_CACHE_MB,
+    SUPPORTED_IMAGE_FORMATS,
+    TILED_INFERENCE_MIN_PIXELS
+)
+from core.constants import AVAILABLE_MODELS
+from core.detector import ObjectDetector
+from core.disk_cache import DiskPredictionCache, key_to_text
+from core.model_store import ModelStore
+from utils.image_utils import image_to_array, load_image
+
+
+# Images par appel pour les modèles dont la signature accepte des lots
+DEFAULT_BATCH_SIZE = 8
+
+def list_example_images(root: Path = DATA_DIR / "exemple") -> List[Path]:
+    """
+    Liste les images d'exemple, toutes catégories confondues.
+
+    Args:
+        root: Dossier des exemples (un sous-dossier par catégorie)
+
+    Returns:
+        Chemins des images, triés
+    """
+    suffixes = {f".{extension}" for extension in SUPPORTED_IMAGE_FORMATS}
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and path.suffix.lower() in suffixes
+    )
+
+
+def precompute_model(
+    model_name: str,
+    paths: List[Path],
+    store: DiskPredictionCache,
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Précalcule les sorties d'un modèle pour une liste d'images.
+
+    Le modèle n'est chargé que si au moins une image doit être calculée.
+
+    Args:
+        model_name: Nom du modèle
+        paths: Images à traiter
+        store: Cache disque où épingler les résultats
+        batch_size: Nombre d'images par appel au modèle, toujours limité par
+            la signature du modèle (None : cette limite, ou
+            DEFAULT_BATCH_SIZE si la signature n'en impose pas)
+
+    Returns:
+        Nombre d'images calculées, déjà présentes, ignorées (analysées par
+        tuiles dans l'application) et d'entrées obsolètes désépinglées
+    """
+    detector = ObjectDetector(
+        model_name,
+        preprocess=INPUT_PREPROCESSING,
+        model_store=ModelStore(MODEL_STORE_DIR)
+    )
+    counts = {'computed': 0, 'cached': 0, 'skipped': 0, 'unpinned': 0}
+    current = set()
+    # Images lues par groupe : la mémoire reste bornée quel que soit le modèle
+    chunk_size = batch_size or DEFAULT_BATCH_SIZE
+
+    for start in range(0, len(paths), chunk_size):
+        images, keys = [], []
+        for path in paths[start:start + chunk_size]:
+            image = image_to_array(load_image(str(path)))
+            if image.shape[0] * image.shape[1] > TILED_INFERENCE_MIN_PIXELS:
+                # Analysée par tuiles dans l'application, sans cache
+                counts['skipped'] += 1
+                continue
+            key = detector.cache_key(image)
+            current.add(key_to_text(key))
+            if key in store:
+                store.pin([key])
+                counts['cached'] += 1
+            else:
+                images.append(image)
+                keys.append(key)
+
+        if not images:
+            continue
+        if not detector.is_loaded():
+            detector.load(warmup=False)
+        model_batch_size = batch_size or detector.max_batch_size or DEFAULT_BATCH_SIZE
+        outputs = detector.predict_batch(images, batch_size=model_batch_size)
+        for key, results in zip(keys, outputs):
+            store.put(key, results, pinned=True)
+        counts['computed'] += len(images)
+
+    # Entrées épinglées de ce modèle pour des images disparues ou modifiées
+    prefix = key_to_text((detector.model_url, detector.cache_variant, ''))
+    stale = [key for key in store.pinned_keys(prefix) if key not in current]
+    counts['unpinned'] = store.pin(stale, pinned=False)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    parser = argparse.ArgumentParser(
+        description="Précalcule les détections des images d'exemple"
+    )
+    parser.add_argument(
+        "--models", nargs="+", default=list(AVAILABLE_MODELS),
+        help="Modèles à exécuter (défaut : tous les modèles disponibles)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=None,
+        help="Images par appel au modèle (défaut : limite de sa signature, "
+             f"{DEFAULT_BATCH_SIZE} sans limite)"
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=PREDICTION_DISK_CACHE,
+        help="Base du cache disque (défaut : celle de l'application)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.cache is None:
+        print("Le cache disque est désactivé (PREDICTION_DISK_CACHE = None)", file=sys.stderr)
+        return 1
+    unknown = [name for name in args.models if name not in AVAILABLE_MODELS]
+    if unknown:
+        print(f"Modèle(s) inconnu(s) : {', '.join(unknown)}", file=sys.stderr)
+        return 1
+
+    paths = list_example_images()
+    store = DiskPredictionCache(
+        args.cache, max_bytes=PREDICTION_DISK_CACHE_MB << 20, min_score=MIN_THRESHOLD
+    )
+    print(f"{len(paths)} image(s) d'exemple, cache : {args.cache}")
+
+    failures = 0
+    for model_name in args.models:
+        start = time.perf_counter()
+        try:
+            counts = precompute_model(model_name, paths, store, args.batch_size)
+        except Exception as error:
+            failures += 1
+            print(f"✗ {model_name} : {error}", file=sys.stderr)
+            continue
+        print(
+            f"✓ {model_name} : {counts['computed']} calculée(s), "
+            f"{counts['cached']} déjà présente(s), {counts['skipped']} ignorée(s), "
+            f"{counts['unpinned']} obsolète(s) en {time.perf_counter() - start:.1f} s"
+        )
+
+    stats = store.stats()
+    print(f"Cache : {stats['pinned']} résultat(s) épinglé(s), {stats['bytes'] >> 20} Mo")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
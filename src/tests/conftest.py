@@ -63,3 +63,59 @@ def available_models():
     """Retourne les modèles disponibles."""
     from core.constants import AVAILABLE_MODELS
     return AVAILABLE_MODELS
+
+
+@pytest.fixture
+def fake_model():
+    """
+    Crée un faux modèle TF Hub renvoyant des sorties fixes.
+    
+    Les boîtes sont normalisées [ymin, xmin, ymax, xmax] et triées par score
+    décroissant, comme pour les modèles de détection COCO. Avec max_batch, le
+    modèle déclare une signature de service à batch fixe, comme ceux du zoo
+    de détection TF2 ([1, None, None, 3]), et refuse les lots plus grands.
+    """
+    import tensorflow as tf
+    from types import SimpleNamespace
+    
+    class FakeModel:
+        def __init__(self, with_masks=False, max_batch=None):
+            self.calls = 0
+            self.input_shapes = []
+            self.with_masks = with_masks
+            self.max_batch = max_batch
+            if max_batch is not None:
+                spec = tf.TensorSpec([max_batch, None, None, 3], tf.uint8)
+                self.signatures = {'serving_default': SimpleNamespace(
+                    structured_input_signature=((), {'input_tensor': spec})
+                )}
+            self.boxes = np.array([
+                [0.10, 0.10, 0.50, 0.40],
+                [0.20, 0.50, 0.90, 0.95],
+                [0.55, 0.05, 0.95, 0.35],
+                [0.00, 0.00, 0.30, 0.30],
+            ], dtype=np.float32)
+            self.scores = np.array([0.95, 0.80, 0.45, 0.20], dtype=np.float32)
+            self.classes = np.array([1, 18, 17, 3], dtype=np.float32)
+        
+        def __call__(self, input_tensor):
+            self.calls += 1
+            self.input_shapes.append(tuple(input_tensor.shape))
+            batch = int(input_tensor.shape[0])
+            if self.max_batch is not None and batch > self.max_batch:
+                raise ValueError(
+                    f"input_tensor: lot de {batch} images, signature [{self.max_batch}, None, None, 3]"
+                )
+            outputs = {
+                'detection_boxes': np.repeat(self.boxes[np.newaxis], batch, axis=0),
+                'detection_scores': np.repeat(self.scores[np.newaxis], batch, axis=0),
+                'detection_classes': np.repeat(self.classes[np.newaxis], batch, axis=0),
+                'num_detections': np.full((batch,), len(self.scores), dtype=np.float32),
+            }
+            if self.with_masks:
+                masks = np.zeros((len(self.scores), 15, 15), dtype=np.float32)
+                masks[:, 3:12, 3:12] = 1.0
+                outputs['detection_masks'] = np.repeat(masks[np.newaxis], batch, axis=0)
+            return {key: tf.constant(value) for key, value in outputs.items()}
+    
+    return FakeModel
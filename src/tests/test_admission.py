@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module admission.
+"""
+
+import pytest
+import numpy as np
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.admission import AdmissionController, AdmissionRejected
+from core.detector import ObjectDetector
+from core.scheduler import InferenceScheduler
+
+
+def _hold(controller, started, release, positions=None):
+    """Occupe une place jusqu'à release.set()."""
+    def on_wait(position, eta):
+        if positions is not None:
+            positions.append(position)
+    with controller.admit(on_wait=on_wait):
+        started.set()
+        release.wait(timeout=5)
+
+
+def _start(controller, positions=None):
+    """Lance une requête dans un thread ; retourne (thread, démarrée, libération)."""
+    started, release = threading.Event(), threading.Event()
+    thread = threading.Thread(target=_hold, args=(controller, started, release, positions))
+    thread.start()
+    return thread, started, release
+
+
+def _wait_for(predicate, timeout=5.0):
+    """Attend qu'une condition soit vraie."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+class TestAdmissionController:
+    """Tests pour AdmissionController."""
+    
+    def test_admits_up_to_max_concurrent(self):
+        """Vérifie que max_concurrent requêtes s'exécutent sans attendre."""
+        controller = AdmissionController(max_concurrent=2, max_queue=2)
+        requests = [_start(controller) for _ in range(2)]
+        for _, started, _ in requests:
+            assert started.wait(timeout=5)
+        assert controller.stats()['running'] == 2
+        for thread, _, release in requests:
+            release.set()
+            thread.join()
+        assert controller.stats()['running'] == 0
+    
+    def test_rejects_when_queue_full(self):
+        """Vérifie le refus immédiat quand la file est pleine."""
+        controller = AdmissionController(max_concurrent=1, max_queue=1)
+        first = _start(controller)
+        assert first[1].wait(timeout=5)
+        second = _start(controller)
+        _wait_for(lambda: controller.stats()['waiting'] == 1)
+        
+        with pytest.raises(AdmissionRejected) as excinfo:
+            with controller.admit():
+                pass
+        assert excinfo.value.reason == 'queue_full'
+        assert controller.stats()['rejected'] == 1
+        
+        for thread, _, release in (first, second):
+            release.set()
+        for thread, _, _ in (first, second):
+            thread.join()
+    
+    def test_fifo_order_and_positions(self):
+        """Vérifie l'ordre d'arrivée et les positions annoncées."""
+        controller = AdmissionController(max_concurrent=1, max_queue=4)
+        first = _start(controller)
+        assert first[1].wait(timeout=5)
+        
+        positions = []
+        second = _start(controller)
+        _wait_for(lambda: controller.stats()['waiting'] == 1)
+        third = _start(controller, positions)
+        _wait_for(lambda: controller.stats()['waiting'] == 2)
+        
+        first[2].set()
+        assert second[1].wait(timeout=5)
+        assert not third[1].is_set()
+        # Réveil périodique (poll_interval) : la troisième passe en tête
+        _wait_for(lambda: 1 in positions)
+        second[2].set()
+        assert third[1].wait(timeout=5)
+        third[2].set()
+        for thread, _, _ in (first, second, third):
+            thread.join()
+        # Position annoncée à chaque réveil : 2 tant que la première requête tourne
+        assert list(dict.fromkeys(positions)) == [2, 1]
+    
+    def test_timeout_leaves_queue(self):
+        """Vérifie qu'une attente trop longue est refusée et libère la file."""
+        controller = AdmissionController(max_concurrent=1, max_queue=2, timeout=0.05)
+        first = _start(controller)
+        assert first[1].wait(timeout=5)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            with controller.admit():
+                pass
+        assert excinfo.value.reason == 'timeout'
+        assert controller.stats()['waiting'] == 0
+        assert controller.stats()['timeouts'] == 1
+        first[2].set()
+        first[0].join()
+    
+    def test_callback_error_leaves_queue(self):
+        """Vérifie qu'une interruption pendant l'attente retire la requête de la file."""
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        first = _start(controller)
+        assert first[1].wait(timeout=5)
+        
+        def interrupt(position, eta):
+            raise KeyboardInterrupt
+        
+        with pytest.raises(KeyboardInterrupt):
+            with controller.admit(on_wait=interrupt):
+                pass
+        assert controller.stats()['waiting'] == 0
+        first[2].set()
+        first[0].join()
+    
+    def test_on_wait_runs_without_lock(self):
+        """Vérifie qu'un on_wait lent ne bloque pas les autres threads."""
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        first = _start(controller)
+        assert first[1].wait(timeout=5)
+        released = []
+        
+        def on_wait(position, eta):
+            # Libérer la place depuis un autre thread pendant l'appel
+            if not released:
+                first[2].set()
+                first[0].join(timeout=5)
+                released.append(not first[0].is_alive())
+        
+        with controller.admit(on_wait=on_wait):
+            assert controller.stats()['running'] == 1
+        assert released == [True]
+        assert controller.stats()['waiting'] == 0
+    
+    def test_estimated_wait(self):
+        """Vérifie l'estimation de l'attente à partir du temps de service."""
+        controller = AdmissionController(max_concurrent=2)
+        assert controller.estimated_wait(1) is None
+        with controller.admit():
+            time.sleep(0.02)
+        assert controller.service_time >= 0.02
+        assert controller.estimated_wait(3) == pytest.approx(2 * controller.service_time)
+    
+    def test_estimate_with_matching_workers(self, fake_model):
+        """Vérifie que le temps de service ne compte pas l'attente entre requêtes admises."""
+        model = fake_model(max_batch=1)
+        
+        def slow(input_tensor):
+            time.sleep(0.2)
+            return model(input_tensor)
+        
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = slow
+        detector.model.signatures = model.signatures
+        # smoothing=1 : le temps de service est la dernière mesure
+        controller = AdmissionController(max_concurrent=2, max_queue=2, smoothing=1.0)
+        scheduler = InferenceScheduler(detector, max_wait=0.0, workers=2)
+        
+        def request(value):
+            with controller.admit():
+                scheduler.predict(np.full((32, 32, 3), value, dtype=np.uint8), timeout=5)
+        
+        threads = [threading.Thread(target=request, args=(value,)) for value in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        scheduler.close()
+        
+        # Requêtes exécutées côte à côte : une seule durée d'appel chacune
+        assert controller.service_time < 0.35
+        assert controller.estimated_wait(2) == controller.service_time
+    
+    def test_slot_released_on_error(self):
+        """Vérifie que la place est libérée si l'inférence échoue."""
+        controller = AdmissionController(max_concurrent=1)
+        with pytest.raises(ValueError):
+            with controller.admit():
+                raise ValueError("échec")
+        assert controller.stats()['running'] == 0
+    
+    def test_invalid_parameters(self):
+        """Vérifie les paramètres invalides."""
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrent=0)
+        with pytest.raises(ValueError):
+            AdmissionController(max_queue=-1)
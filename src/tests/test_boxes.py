@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module boxes.
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.boxes import box_iou, cluster_boxes
+
+
+class TestBoxIou:
+    """Tests pour box_iou."""
+    
+    def test_known_values(self):
+        """Vérifie l'IoU sur des cas simples."""
+        box = np.array([0, 0, 10, 10])
+        boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]])
+        np.testing.assert_allclose(box_iou(box, boxes), [1.0, 50 / 150, 0.0])
+    
+    def test_empty_boxes(self):
+        """Vérifie qu'une boîte vide a une IoU nulle."""
+        assert box_iou(np.array([5, 5, 5, 5]), np.array([[5, 5, 5, 5]]))[0] == 0.0
+
+
+class TestClusterBoxes:
+    """Tests pour cluster_boxes."""
+    
+    def test_suppresses_duplicates(self):
+        """Vérifie que le doublon de plus faible score est absorbé."""
+        boxes = np.array([[0, 0, 10, 10], [1, 0, 11, 10], [50, 50, 60, 60]])
+        keep, parents = cluster_boxes(boxes, np.array([0.6, 0.9, 0.7]))
+        assert keep.tolist() == [1, 2]
+        assert parents.tolist() == [1, 1, 2]
+    
+    def test_classes_are_separate(self):
+        """Vérifie que deux classes différentes ne sont pas fusionnées."""
+        boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10]])
+        keep, _ = cluster_boxes(boxes, np.array([0.9, 0.8]), classes=np.array([1, 2]))
+        assert sorted(keep.tolist()) == [0, 1]
+    
+    def test_seam_fragments_are_grouped(self):
+        """Vérifie que les fragments d'un objet coupé par des jonctions sont regroupés."""
+        # Objet (100, 200, 400, 300) vu par trois tuiles de 256 décalées de 224
+        regions = np.array([[0, 0, 256, 256], [224, 0, 480, 256], [224, 224, 480, 480]])
+        boxes = np.array([[100, 200, 256, 256], [224, 200, 400, 256], [224, 224, 400, 300]])
+        keep, parents = cluster_boxes(
+            boxes, np.array([0.8, 0.9, 0.7]), regions=regions
+        )
+        assert keep.tolist() == [1]
+        assert parents.tolist() == [1, 1, 1]
+    
+    def test_neighbours_across_seam_are_kept(self):
+        """Vérifie que deux objets voisins de part et d'autre d'une jonction restent distincts."""
+        regions = np.array([[0, 0, 256, 256], [224, 0, 480, 256]])
+        boxes = np.array([[150, 10, 230, 60], [240, 10, 300, 60]])
+        keep, _ = cluster_boxes(boxes, np.array([0.9, 0.8]), regions=regions)
+        assert sorted(keep.tolist()) == [0, 1]
+    
+    def test_crowd_chain_not_merged(self):
+        """Vérifie qu'une chaîne de boîtes voisines n'est pas réduite à une seule."""
+        # A-B et B-C se recouvrent (IoU 0.6), A et C peu (IoU 0.33)
+        boxes = np.array([[0, 0, 100, 10], [25, 0, 125, 10], [50, 0, 150, 10]])
+        keep, parents = cluster_boxes(boxes, np.array([0.9, 0.8, 0.7]))
+        assert keep.tolist() == [0, 2]
+        assert parents.tolist() == [0, 0, 2]
+    
+    def test_empty(self):
+        """Vérifie le cas sans boîte."""
+        keep, parents = cluster_boxes(np.empty((0, 4)), np.empty(0))
+        assert keep.size == 0 and parents.size == 0
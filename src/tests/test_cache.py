@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module cache.
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cache import PredictionCache, hash_image
+
+
+def _results(value: float):
+    """Construit de fausses sorties de modèle."""
+    return {'detection_scores': np.full((1, 4), value, dtype=np.float32)}
+
+
+class TestHashImage:
+    """Tests pour la fonction hash_image."""
+    
+    def test_same_content_same_hash(self, sample_numpy_image):
+        """Vérifie que deux copies d'une image ont la même empreinte."""
+        assert hash_image(sample_numpy_image) == hash_image(sample_numpy_image.copy())
+    
+    def test_different_content_different_hash(self, sample_numpy_image):
+        """Vérifie qu'un pixel modifié change l'empreinte."""
+        other = sample_numpy_image.copy()
+        other[0, 0, 1] = 7
+        assert hash_image(sample_numpy_image) != hash_image(other)
+    
+    def test_shape_is_part_of_hash(self):
+        """Vérifie que la forme de l'image fait partie de l'empreinte."""
+        a = np.zeros((10, 20, 3), dtype=np.uint8)
+        b = np.zeros((20, 10, 3), dtype=np.uint8)
+        assert hash_image(a) != hash_image(b)
+    
+    def test_non_contiguous_image(self, sample_numpy_image):
+        """Vérifie le support des vues non contiguës."""
+        view = sample_numpy_image[:, ::2]
+        assert hash_image(view) == hash_image(np.ascontiguousarray(view))
+
+
+class TestPredictionCache:
+    """Tests pour la classe PredictionCache."""
+    
+    def test_invalid_size_raises(self):
+        """Vérifie qu'une taille nulle est refusée."""
+        with pytest.raises(ValueError):
+            PredictionCache(max_entries=0)
+    
+    def test_miss_then_hit(self):
+        """Vérifie un défaut de cache suivi d'un succès."""
+        cache = PredictionCache()
+        assert cache.get('a') is None
+        cache.put('a', _results(0.5))
+        assert cache.get('a') is not None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+    
+    def test_key_includes_model_name(self, sample_numpy_image):
+        """Vérifie que la clé dépend du modèle."""
+        key1 = PredictionCache.make_key(sample_numpy_image, "SSD MobileNet V2")
+        key2 = PredictionCache.make_key(sample_numpy_image, "EfficientDet D0")
+        assert key1 != key2
+    
+    def test_lru_eviction(self):
+        """Vérifie que l'entrée la moins récemment utilisée est évincée."""
+        cache = PredictionCache(max_entries=2)
+        cache.put('a', _results(0.1))
+        cache.put('b', _results(0.2))
+        cache.get('a')
+        cache.put('c', _results(0.3))
+        
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.stats()['evictions'] == 1
+    
+    def test_cached_arrays_are_read_only(self):
+        """Vérifie que les tableaux mis en cache ne sont pas modifiables."""
+        cache = PredictionCache()
+        cache.put('a', _results(0.5))
+        with pytest.raises(ValueError):
+            cache.get('a')['detection_scores'][0, 0] = 1.0
+    
+    def test_clear(self):
+        """Vérifie que clear vide le cache."""
+        cache = PredictionCache()
+        cache.put('a', _results(0.5))
+        cache.clear()
+        assert len(cache) == 0
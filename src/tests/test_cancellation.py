@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module cancellation.
+"""
+
+import pytest
+import numpy as np
+import threading
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.admission import AdmissionController
+from core.cancellation import CancellationToken, InferenceCancelled, SessionJobs
+from core.detector import ObjectDetector
+from core.scheduler import InferenceScheduler
+
+
+@pytest.fixture
+def detector(fake_model):
+    """Détecteur branché sur le faux modèle."""
+    detector = ObjectDetector("SSD MobileNet V2")
+    detector.model = fake_model()
+    return detector
+
+
+class TestCancellationToken:
+    """Tests pour CancellationToken."""
+    
+    def test_cancel_runs_callbacks_once(self):
+        """Vérifie que les fonctions enregistrées sont appelées une seule fois."""
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append(1))
+        
+        assert not token.cancelled
+        assert token.cancel()
+        assert not token.cancel()
+        assert token.cancelled
+        assert calls == [1]
+    
+    def test_callback_after_cancel_runs_immediately(self):
+        """Vérifie qu'une fonction enregistrée après l'annulation est appelée aussitôt."""
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+        token.add_callback(lambda: calls.append(1))
+        assert calls == [1]
+    
+    def test_raise_if_cancelled(self):
+        """Vérifie que raise_if_cancelled ne lève qu'après l'annulation."""
+        token = CancellationToken()
+        token.raise_if_cancelled()
+        token.cancel()
+        with pytest.raises(InferenceCancelled):
+            token.raise_if_cancelled()
+
+
+class TestSessionJobs:
+    """Tests pour SessionJobs."""
+    
+    def test_start_does_not_cancel(self):
+        """Vérifie que démarrer une inférence ne touche pas aux autres."""
+        jobs = SessionJobs()
+        first = jobs.start("a")
+        other = jobs.start("b")
+        
+        assert not first.cancelled
+        assert not other.cancelled
+        assert len(jobs) == 2
+    
+    def test_finish_counts_outcome(self):
+        """Vérifie le décompte des inférences terminées et annulées."""
+        jobs = SessionJobs()
+        first = jobs.start("a")
+        jobs.finish("a", first)
+        assert len(jobs) == 0
+        
+        # Exécution interrompue par Streamlit : le jeton est annulé avant finish()
+        second = jobs.start("a")
+        second.cancel()
+        jobs.finish("a", second)
+        
+        assert len(jobs) == 0
+        assert jobs.stats() == {
+            'in_flight': 0,
+            'started': 2,
+            'completed': 1,
+            'cancelled': 1,
+        }
+
+
+class TestCancelledInference:
+    """Tests de l'abandon des étapes d'une inférence annulée."""
+    
+    def test_detect_skips_model(self, detector, sample_numpy_image):
+        """Vérifie qu'une inférence annulée n'appelle pas le modèle."""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(InferenceCancelled):
+            detector.detect(sample_numpy_image, cancel_token=token)
+        assert detector.model.calls == 0
+    
+    def test_postprocess_skipped(self, detector, sample_numpy_image):
+        """Vérifie que le post-traitement d'une inférence annulée est abandonné."""
+        results = detector.predict(sample_numpy_image)
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(InferenceCancelled):
+            detector.postprocess(results, (100, 100), cancel_token=token)
+    
+    def test_lazy_masks_not_built(self, detector, sample_numpy_image):
+        """Vérifie qu'aucun masque n'est construit après l'annulation."""
+        token = CancellationToken()
+        detections = detector.detect(sample_numpy_image, cancel_token=token)
+        token.cancel()
+        with pytest.raises(InferenceCancelled):
+            detections[0].mask
+        assert detector.mask_stats.built == 0
+    
+    def test_tiled_stops_between_batches(self, detector):
+        """Vérifie que la détection par tuiles s'arrête au lot suivant."""
+        token = CancellationToken()
+        progress = []
+        
+        def on_progress(done, total):
+            progress.append((done, total))
+            token.cancel()
+        
+        image = np.zeros((600, 700, 3), dtype=np.uint8)
+        with pytest.raises(InferenceCancelled):
+            detector.detect_tiled(
+                image, tile_size=256, overlap=32, batch_size=4,
+                cancel_token=token, on_progress=on_progress
+            )
+        assert progress == [(4, 9)]
+        assert detector.model.calls == 1
+    
+    def test_scheduler_drops_cancelled_request(self, detector):
+        """Vérifie qu'une requête annulée en file n'est pas exécutée."""
+        image = np.zeros((64, 128, 3), dtype=np.uint8)
+        scheduler = InferenceScheduler(detector, max_wait=0.3)
+        first = scheduler.submit(image)
+        token = CancellationToken()
+        scheduler.submit(image, cancel_token=token)
+        token.cancel()
+        first.result(timeout=5)
+        scheduler.close()
+        
+        stats = scheduler.stats()
+        assert stats['batch_sizes'] == {1: 1}
+        assert stats['cancelled'] == 1
+    
+    def test_scheduler_predict_raises(self, detector):
+        """Vérifie que l'attente du résultat est interrompue par l'annulation."""
+        image = np.zeros((64, 128, 3), dtype=np.uint8)
+        scheduler = InferenceScheduler(detector, max_wait=0.5)
+        token = CancellationToken()
+        waits = []
+        
+        def on_wait(elapsed):
+            waits.append(elapsed)
+            token.cancel()
+        
+        with pytest.raises(InferenceCancelled):
+            scheduler.predict(image, cancel_token=token, on_wait=on_wait, poll_interval=0.01)
+        scheduler.close()
+        assert len(waits) == 1
+        assert detector.model.calls == 0
+    
+    def test_admission_drops_cancelled_waiter(self):
+        """Vérifie qu'une requête annulée quitte la file d'admission."""
+        controller = AdmissionController(max_concurrent=1, max_queue=2)
+        token = CancellationToken()
+        errors = []
+        
+        def waiter():
+            try:
+                with controller.admit(cancel_token=token):
+                    pass
+            except InferenceCancelled as error:
+                errors.append(error)
+        
+        with controller.admit():
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            while controller.stats()['waiting'] == 0:
+                thread.join(timeout=0.005)
+            token.cancel()
+            thread.join(timeout=5)
+            assert controller.stats()['waiting'] == 0
+        
+        assert len(errors) == 1
+        assert controller.stats()['admitted'] == 1
@@ -11,7 +11,7 @@ from pathlib import Path
 # Ajouter le dossier src au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.data_types import Detection, ModelInfo
+from core.data_types import Detection, MaskStats, ModelInfo
 
 
 class TestDetection:
@@ -77,6 +77,107 @@ class TestDetection:
         result = sample_detection.to_dict()
         assert isinstance(result['box'], list)
     
+    def test_full_mask_places_crop(self):
+        """Vérifie que full_mask replace le masque recadré dans l'image."""
+        crop = np.ones((3, 4), dtype=bool)
+        detection = Detection(
+            1, 'person', 0.9, (5, 2, 9, 5),
+            mask=crop, mask_origin=(5, 2), image_size=(10, 12)
+        )
+        full = detection.full_mask()
+        assert full.shape == (10, 12)
+        assert full.sum() == 12
+        assert full[2:5, 5:9].all()
+    
+    def test_full_mask_clips_to_image(self):
+        """Vérifie que full_mask tronque un recadrage qui dépasse de l'image."""
+        detection = Detection(
+            1, 'person', 0.9, (8, 8, 12, 12),
+            mask=np.ones((4, 4), dtype=bool), mask_origin=(8, 8)
+        )
+        full = detection.full_mask((10, 10))
+        assert full.sum() == 4
+    
+    def test_full_mask_without_mask(self, sample_detection):
+        """Vérifie que full_mask retourne None sans masque."""
+        assert sample_detection.full_mask((10, 10)) is None
+    
+    def test_full_mask_legacy_full_frame(self, detection_with_mask):
+        """Vérifie qu'un masque pleine image (origine 0, 0) reste valide."""
+        full = detection_with_mask.full_mask()
+        assert full.shape == (100, 100)
+        assert full.sum() == 60 * 60
+    
+    def test_lazy_mask_loader_called_once(self):
+        """Vérifie que le chargeur de masque n'est appelé qu'une fois."""
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return np.ones((2, 2), dtype=bool)
+        
+        detection = Detection(1, 'person', 0.9, (0, 0, 2, 2), mask_loader=loader)
+        assert detection.has_mask
+        assert calls == []
+        
+        assert detection.mask.shape == (2, 2)
+        assert detection.mask.shape == (2, 2)
+        assert calls == [1]
+    
+    def test_concurrent_readers_share_lazy_mask(self):
+        """Vérifie que des lectures simultanées attendent le masque en construction."""
+        import threading
+        import time
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return np.ones((2, 2), dtype=bool)
+        
+        detection = Detection(1, 'person', 0.9, (0, 0, 2, 2), mask_loader=loader)
+        masks = []
+        readers = [
+            threading.Thread(target=lambda: masks.append(detection.mask))
+            for _ in range(4)
+        ]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join()
+        
+        assert calls == [1]
+        assert len(masks) == 4
+        assert all(mask is masks[0] for mask in masks)
+    
+    def test_asdict_and_copy_keep_mask_lazy(self):
+        """Vérifie qu'asdict() et deepcopy() ne construisent pas un masque paresseux."""
+        import copy
+        from dataclasses import asdict
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return np.ones((2, 2), dtype=bool)
+        
+        detection = Detection(1, 'person', 0.9, (0, 0, 2, 2), mask_loader=loader)
+        assert asdict(detection)['confidence'] == 0.9
+        duplicate = copy.deepcopy(detection)
+        assert calls == []
+        
+        assert duplicate.has_mask
+        assert duplicate.mask.all()
+        assert calls == [1]
+        assert detection.has_mask
+    
+    def test_to_dict_does_not_build_mask(self):
+        """Vérifie que to_dict ne construit pas un masque paresseux."""
+        def loader():
+            raise AssertionError("le masque ne doit pas être construit")
+        
+        detection = Detection(1, 'person', 0.9, (0, 0, 2, 2), mask_loader=loader)
+        assert detection.to_dict()['has_mask'] is True
+    
     def test_confidence_range(self):
         """Vérifie que la confiance peut être dans la plage [0, 1]."""
         det_low = Detection(1, 'test', 0.0, (0, 0, 10, 10))
@@ -121,3 +222,18 @@ class TestModelInfo:
         
         assert detection_model.model_type == "detection"
         assert segmentation_model.model_type == "segmentation"
+
+
+class TestMaskStats:
+    """Tests pour les compteurs de masques."""
+    
+    def test_initial_values(self):
+        """Vérifie que les compteurs démarrent à zéro."""
+        assert MaskStats().as_dict() == {'deferred': 0, 'built': 0, 'skipped': 0}
+    
+    def test_skipped(self):
+        """Vérifie le calcul des masques ignorés."""
+        stats = MaskStats()
+        stats.record_deferred(5)
+        stats.record_built(2)
+        assert stats.skipped == 3
@@ -93,43 +93,622 @@ class TestGetModelInfo:
         assert info1.url != info2.url
 
 
-class TestGenerateEllipseMask:
-    """Tests pour la génération de masques elliptiques."""
+class TestPredictionCaching:
+    """Tests pour la mise en cache des sorties brutes."""
+    
+    @pytest.fixture
+    def detector(self, fake_model):
+        """Crée un détecteur avec un faux modèle et un cache."""
+        from core.cache import PredictionCache
+        detector = ObjectDetector("SSD MobileNet V2", cache=PredictionCache())
+        detector.model = fake_model()
+        return detector
+    
+    def test_parameter_change_does_not_rerun_model(self, detector, sample_numpy_image):
+        """Vérifie qu'un changement de seuil ne relance pas l'inférence."""
+        first = detector.detect(sample_numpy_image, threshold=0.5)
+        second = detector.detect(sample_numpy_image, threshold=0.1)
+        third = detector.detect(sample_numpy_image, threshold=0.5, max_detections=1)
+        
+        assert detector.model.calls == 1
+        assert len(first) == 2
+        assert len(second) == 4
+        assert len(third) == 1
+    
+    def test_new_image_runs_model(self, detector, sample_numpy_image):
+        """Vérifie qu'une nouvelle image relance l'inférence."""
+        detector.detect(sample_numpy_image)
+        detector.detect(sample_numpy_image[::-1].copy())
+        assert detector.model.calls == 2
+    
+    def test_without_cache_runs_model_each_time(self, fake_model, sample_numpy_image):
+        """Vérifie le comportement sans cache."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model()
+        detector.detect(sample_numpy_image)
+        detector.detect(sample_numpy_image)
+        assert detector.model.calls == 2
+    
+    def test_postprocess_matches_detect(self, detector, sample_numpy_image):
+        """Vérifie que postprocess reproduit detect à partir des sorties brutes."""
+        results = detector.predict(sample_numpy_image)
+        detections = detector.postprocess(results, sample_numpy_image.shape[:2])
+        expected = detector.detect(sample_numpy_image)
+        assert [d.to_dict() for d in detections] == [d.to_dict() for d in expected]
+    
+    def test_postprocess_ignores_padding_rows(self, detector, sample_numpy_image):
+        """Vérifie que les détections au-delà de num_detections sont ignorées."""
+        results = dict(detector.predict(sample_numpy_image))
+        results['num_detections'] = np.array([1], dtype=np.float32)
+        detections = detector.postprocess(results, sample_numpy_image.shape[:2], threshold=0.0)
+        assert len(detections) == 1
+
+
+class TestDetectBatch:
+    """Tests pour l'inférence groupée."""
+    
+    @pytest.fixture
+    def detector(self, fake_model):
+        """Crée un détecteur avec un faux modèle."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model()
+        return detector
+    
+    def test_one_call_per_bucket(self, detector):
+        """Vérifie qu'un seul appel au modèle est fait par palier de taille."""
+        images = [
+            np.zeros((100, 100, 3), dtype=np.uint8),
+            np.zeros((110, 120, 3), dtype=np.uint8),
+            np.zeros((200, 150, 3), dtype=np.uint8),
+        ]
+        results = detector.detect_batch(images, bucket_size=64)
+        
+        assert len(results) == 3
+        assert detector.model.calls == 2
+        # L'image seule dans son palier n'est pas complétée
+        assert sorted(detector.model.input_shapes) == [(1, 200, 150, 3), (2, 128, 128, 3)]
+    
+    def test_batch_size_splits_calls(self, detector):
+        """Vérifie que batch_size limite la taille des lots."""
+        images = [np.zeros((64, 64, 3), dtype=np.uint8)] * 5
+        detector.detect_batch(images, batch_size=2, bucket_size=64)
+        assert [shape[0] for shape in detector.model.input_shapes] == [2, 2, 1]
+    
+    def test_boxes_mapped_back_to_image(self, detector):
+        """Vérifie que les boîtes sont ramenées à la taille de chaque image."""
+        image = np.zeros((100, 80, 3), dtype=np.uint8)
+        results = detector.predict_batch([image, image], bucket_size=64)
+        
+        # Le modèle voit un cadre 128x128 ; la première boîte y vaut [0.1, 0.1, 0.5, 0.4]
+        np.testing.assert_allclose(
+            results[0]['detection_boxes'][0, 0],
+            [0.1 * 128 / 100, 0.1 * 128 / 80, 0.5 * 128 / 100, 0.4 * 128 / 80],
+            rtol=1e-5
+        )
+    
+    def test_detection_boxes_are_clipped(self, detector):
+        """Vérifie que les boîtes des détections restent dans l'image."""
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        results = detector.predict_batch([image, image], bucket_size=64)
+        # Les sorties brutes débordent dans le remplissage...
+        assert results[0]['detection_boxes'].max() > 1.0
+        # ...mais pas les détections construites à partir d'elles
+        detections = detector.postprocess(results[0], (10, 10), threshold=0.0)
+        assert all(0 <= d.box[0] <= d.box[2] <= 10 for d in detections)
+        assert all(0 <= d.box[1] <= d.box[3] <= 10 for d in detections)
+    
+    def test_masks_follow_predicted_box(self, fake_model):
+        """Vérifie que les masques sont reprojetés sur la boîte prédite, non tronquée."""
+        from utils.masks import reproject_masks
+        detector = ObjectDetector("Mask R-CNN Inception ResNet V2")
+        detector.model = fake_model(with_masks=True)
+        image = np.zeros((100, 80, 3), dtype=np.uint8)
+        results = detector.predict_batch([image, image], bucket_size=64)[0]
+        
+        # La deuxième boîte [0.2, 0.5, 0.9, 0.95] du cadre 128x128 déborde de l'image
+        detection = detector.postprocess(results, (100, 80))[1]
+        assert detection.box == (64, 25, 80, 100)
+        predicted = (results['detection_boxes'][0, 1, [1, 0, 3, 2]]
+                     * np.array([80, 100, 80, 100], dtype=np.float32)).astype(np.int64)
+        expected, = reproject_masks(
+            results['detection_masks'][0, 1:2], predicted[np.newaxis], (100, 80)
+        )
+        np.testing.assert_array_equal(detection.mask, expected)
+        assert detection.mask.shape == (75, 16)
+    
+    def test_matches_detect_without_padding(self, detector):
+        """Vérifie l'équivalence avec detect lorsque l'image tombe sur un palier."""
+        image = np.zeros((128, 64, 3), dtype=np.uint8)
+        batched = detector.detect_batch([image, image], bucket_size=64)
+        single = detector.detect(image)
+        for detections in batched:
+            assert [d.to_dict() for d in detections] == [d.to_dict() for d in single]
+    
+    def test_preserves_input_order(self, detector):
+        """Vérifie que les résultats suivent l'ordre des images."""
+        images = [
+            np.zeros((300, 300, 3), dtype=np.uint8),
+            np.zeros((50, 50, 3), dtype=np.uint8),
+        ]
+        results = detector.detect_batch(images, threshold=0.0, bucket_size=64)
+        assert results[0][0].box[2] <= 300 and results[0][0].box[2] > 50
+        assert all(d.box[2] <= 50 and d.box[3] <= 50 for d in results[1])
+    
+    def test_uses_cache(self, fake_model):
+        """Vérifie que les images déjà en cache ne sont pas renvoyées au modèle."""
+        from core.cache import PredictionCache
+        detector = ObjectDetector("SSD MobileNet V2", cache=PredictionCache())
+        detector.model = fake_model()
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        
+        detector.detect(image)
+        detector.detect_batch([image, np.ones((64, 64, 3), dtype=np.uint8)])
+        
+        assert detector.model.input_shapes == [(1, 64, 64, 3), (1, 64, 64, 3)]
+    
+    def test_without_loading_raises(self):
+        """Vérifie qu'une erreur est levée si le modèle n'est pas chargé."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        with pytest.raises(RuntimeError):
+            detector.detect_batch([np.zeros((10, 10, 3), dtype=np.uint8)])
+
+
+class TestFixedBatchModels:
+    """Tests pour les modèles dont la signature n'accepte qu'une image par appel."""
+    
+    @pytest.fixture
+    def detector(self, fake_model):
+        """Détecteur branché sur un modèle à signature [1, None, None, 3]."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model(max_batch=1)
+        return detector
+    
+    def test_max_batch_size_from_signature(self, detector, fake_model):
+        """Vérifie la lecture de la taille de batch dans la signature de service."""
+        assert detector.max_batch_size == 1
+        detector.model = fake_model()
+        assert detector.max_batch_size is None
+    
+    def test_stub_rejects_batches(self, detector):
+        """Vérifie que le faux modèle refuse, comme les vrais, un lot de deux images."""
+        with pytest.raises(ValueError):
+            detector._run_model(np.zeros((2, 64, 64, 3), dtype=np.uint8))
+    
+    def test_predict_batch_one_image_per_call(self, detector):
+        """Vérifie que chaque image est envoyée seule, sans complétion."""
+        images = [
+            np.zeros((100, 100, 3), dtype=np.uint8),
+            np.zeros((110, 120, 3), dtype=np.uint8),
+            np.zeros((100, 100, 3), dtype=np.uint8),
+        ]
+        results = detector.predict_batch(images, batch_size=8, bucket_size=64)
+        
+        assert detector.model.input_shapes == [
+            (1, 100, 100, 3), (1, 110, 120, 3), (1, 100, 100, 3)
+        ]
+        for image, batched in zip(images, results):
+            for name, value in detector.predict(image).items():
+                np.testing.assert_array_equal(batched[name], value)
+    
+    def test_detect_batch_uses_cache(self, fake_model):
+        """Vérifie que le cache est alimenté image par image."""
+        from core.cache import PredictionCache
+        detector = ObjectDetector("SSD MobileNet V2", cache=PredictionCache())
+        detector.model = fake_model(max_batch=1)
+        images = [np.zeros((64, 64, 3), dtype=np.uint8), np.ones((64, 64, 3), dtype=np.uint8)]
+        
+        detector.detect_batch(images)
+        detector.detect_batch(images)
+        assert detector.model.calls == 2
+
+
+class TestPostprocess:
+    """Tests pour le post-traitement vectorisé."""
+    
+    @pytest.fixture
+    def results(self):
+        """Sorties brutes aléatoires triées par score décroissant."""
+        rng = np.random.default_rng(42)
+        mins = rng.random((100, 2), dtype=np.float32) * 0.5
+        maxs = mins + rng.random((100, 2), dtype=np.float32) * 0.5
+        return {
+            'detection_boxes': np.concatenate([mins, maxs], axis=1)[np.newaxis],
+            'detection_scores': np.sort(rng.random(100, dtype=np.float32))[::-1][np.newaxis],
+            'detection_classes': rng.integers(1, 91, 100).astype(np.float32)[np.newaxis],
+        }
+    
+    @staticmethod
+    def _reference(results, height, width, threshold, max_detections):
+        """Ancienne boucle Python, utilisée comme référence."""
+        boxes = results['detection_boxes'][0]
+        classes = results['detection_classes'][0].astype(int)
+        scores = results['detection_scores'][0]
+        expected = []
+        for i in range(min(len(scores), max_detections)):
+            if scores[i] >= threshold:
+                ymin, xmin, ymax, xmax = boxes[i]
+                expected.append((
+                    int(classes[i]), float(scores[i]),
+                    (int(xmin * width), int(ymin * height),
+                     int(xmax * width), int(ymax * height))
+                ))
+        return expected
+    
+    @pytest.mark.parametrize("threshold,max_detections", [
+        (0.5, 100), (0.0, 100), (0.9, 10), (0.3, 1), (1.1, 100)
+    ])
+    def test_matches_python_loop(self, results, threshold, max_detections):
+        """Vérifie l'équivalence avec l'ancienne boucle Python."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detections = detector.postprocess(
+            results, (3000, 4000), threshold, max_detections,
+            generate_approx_masks=False
+        )
+        got = [(d.class_id, d.confidence, d.box) for d in detections]
+        assert got == self._reference(results, 3000, 4000, threshold, max_detections)
+    
+    @pytest.mark.parametrize("max_detections", [100, 5, 1])
+    def test_allowed_classes_before_top_k(self, results, max_detections):
+        """Vérifie que max_detections s'applique après le filtrage des classes."""
+        allowed = [int(c) for c in results['detection_classes'][0][50:60]]
+        detector = ObjectDetector("SSD MobileNet V2")
+        detections = detector.postprocess(
+            results, (3000, 4000), 0.0, max_detections,
+            generate_approx_masks=False, allowed_classes=allowed
+        )
+        got = [(d.class_id, d.confidence, d.box) for d in detections]
+        expected = [
+            detection for detection in self._reference(results, 3000, 4000, 0.0, 100)
+            if detection[0] in allowed
+        ][:max_detections]
+        assert got == expected
+        assert len(got) == min(max_detections, len(expected)) > 0
+    
+    def test_python_types(self, results):
+        """Vérifie que les champs des détections sont des types Python natifs."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detection = detector.postprocess(
+            results, (100, 100), 0.0, generate_approx_masks=False
+        )[0]
+        assert type(detection.class_id) is int
+        assert type(detection.confidence) is float
+        assert all(type(v) is int for v in detection.box)
+    
+    def test_unknown_format_raises(self):
+        """Vérifie qu'un format de sortie inconnu est refusé."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        with pytest.raises(ValueError):
+            detector.postprocess({'foo': np.zeros(1)}, (10, 10))
+
+
+class TestLazyMasks:
+    """Tests pour la construction paresseuse des masques."""
+    
+    @pytest.fixture
+    def detector(self, fake_model):
+        """Crée un détecteur avec un faux modèle."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model()
+        return detector
+    
+    def test_masks_not_built_by_detect(self, detector, sample_numpy_image):
+        """Vérifie que detect ne construit aucun masque."""
+        detections = detector.detect(sample_numpy_image)
+        
+        assert all(d.has_mask for d in detections)
+        assert detector.mask_stats.as_dict() == {
+            'deferred': 2, 'built': 0, 'skipped': 2
+        }
+    
+    def test_mask_built_on_first_read(self, detector, sample_numpy_image):
+        """Vérifie que les masques sont construits une seule fois, à la lecture."""
+        detections = detector.detect(sample_numpy_image)
+        first = detections[0].mask
+        second = detections[0].mask
+        
+        assert first is second
+        assert detections[1].mask is not None
+        assert detector.mask_stats.built == 2
+        assert detector.mask_stats.skipped == 0
+    
+    def test_lazy_mask_matches_eager(self, detector, sample_numpy_image):
+        """Vérifie que le masque paresseux est celui du générateur."""
+        from utils.masks import ellipse_masks
+        detection = detector.detect(sample_numpy_image)[0]
+        expected = ellipse_masks([detection.box], (100, 100))[0]
+        np.testing.assert_array_equal(detection.mask, expected)
+        assert detection.mask_origin == detection.box[:2]
+    
+    def test_filtered_classes_get_no_mask(self, detector, sample_numpy_image):
+        """Vérifie que les classes écartées ne donnent ni détection ni masque."""
+        detections = detector.detect(sample_numpy_image, threshold=0.3, allowed_classes=[17])
+        assert [d.class_id for d in detections] == [17]
+        assert detector.mask_stats.deferred == 1
+        assert detections[0].mask is not None
+        assert detector.mask_stats.built == 1
+    
+    def test_no_approx_masks(self, detector, sample_numpy_image):
+        """Vérifie qu'aucun masque n'est prévu sans masques approximatifs."""
+        detections = detector.detect(sample_numpy_image, generate_approx_masks=False)
+        assert not any(d.has_mask for d in detections)
+        assert detector.mask_stats.deferred == 0
+    
+    def test_native_masks_are_lazy(self, fake_model, sample_numpy_image):
+        """Vérifie que les masques Mask R-CNN sont différés puis construits en un lot."""
+        detector = ObjectDetector("Mask R-CNN Inception ResNet V2")
+        detector.model = fake_model(with_masks=True)
+        detections = detector.detect(sample_numpy_image, generate_approx_masks=False)
+        
+        assert detector.mask_stats.built == 0
+        assert detections[0].mask.dtype == bool
+        assert detector.mask_stats.built == 2
+        assert detections[1].mask is not None
+        assert detector.mask_stats.built == 2
+    
+    def test_native_masks_cropped_to_box(self, fake_model, sample_numpy_image):
+        """Vérifie la taille et l'origine des masques Mask R-CNN."""
+        detector = ObjectDetector("Mask R-CNN Inception ResNet V2")
+        detector.model = fake_model(with_masks=True)
+        detection = detector.detect(sample_numpy_image)[0]
+        
+        left, top, right, bottom = detection.box
+        assert detection.mask_origin == (left, top)
+        assert detection.mask.shape == (bottom - top, right - left)
+
+
+class TestInputPreprocessing:
+    """Tests pour la réduction des images à la résolution native du modèle."""
+    
+    @pytest.fixture
+    def image(self):
+        """Image 1200x1600, plus grande que la résolution native (300x300)."""
+        return np.zeros((1200, 1600, 3), dtype=np.uint8)
+    
+    def _detector(self, fake_model, preprocess):
+        detector = ObjectDetector("SSD MobileNet V2", preprocess=preprocess)
+        detector.model = fake_model()
+        return detector
+    
+    def test_input_size_metadata(self):
+        """Vérifie que chaque modèle déclare sa résolution native."""
+        from core.constants import AVAILABLE_MODELS
+        for name in AVAILABLE_MODELS:
+            assert ObjectDetector(name).input_size is not None
+        assert get_model_info("Mask R-CNN Inception ResNet V2").input_size == (1024, 1024)
+    
+    def test_invalid_mode_raises(self):
+        """Vérifie qu'un mode de prétraitement inconnu est refusé."""
+        with pytest.raises(ValueError):
+            ObjectDetector("SSD MobileNet V2", preprocess="crop")
+    
+    def test_no_preprocessing_by_default(self, fake_model, image):
+        """Vérifie que l'image est envoyée en pleine résolution par défaut."""
+        detector = self._detector(fake_model, None)
+        detector.predict(image)
+        assert detector.model.input_shapes == [(1, 1200, 1600, 3)]
+    
+    def test_resize_keeps_aspect_ratio(self, fake_model, image):
+        """Vérifie la réduction proportionnelle à la résolution native."""
+        detector = self._detector(fake_model, 'resize')
+        detector.predict(image)
+        assert detector.model.input_shapes == [(1, 225, 300, 3)]
+    
+    def test_letterbox_pads_to_input_size(self, fake_model, image):
+        """Vérifie que le letterbox produit exactement la taille native."""
+        detector = self._detector(fake_model, 'letterbox')
+        detector.predict(image)
+        assert detector.model.input_shapes == [(1, 300, 300, 3)]
+    
+    def test_small_image_not_upscaled(self, fake_model):
+        """Vérifie qu'une petite image n'est pas agrandie."""
+        detector = self._detector(fake_model, 'resize')
+        detector.predict(np.zeros((100, 120, 3), dtype=np.uint8))
+        assert detector.model.input_shapes == [(1, 100, 120, 3)]
+    
+    @pytest.mark.parametrize("preprocess", ['resize', 'letterbox'])
+    def test_boxes_map_back_to_original(self, fake_model, image, preprocess):
+        """Vérifie que les boîtes sont exprimées dans l'image d'origine."""
+        reference = self._detector(fake_model, None).detect(image, threshold=0.0)
+        reduced = self._detector(fake_model, preprocess)
+        
+        if preprocess == 'letterbox':
+            # Le faux modèle renvoie des boîtes relatives au cadre 300x300 :
+            # on les exprime dans le contenu 225x300 pour retrouver la référence
+            reduced.model.boxes = reduced.model.boxes * np.array(
+                [225 / 300, 1, 225 / 300, 1], dtype=np.float32
+            )
+        detections = reduced.detect(image, threshold=0.0)
+        
+        for expected, got in zip(reference, detections):
+            assert np.abs(np.array(expected.box) - np.array(got.box)).max() <= 1
+    
+    def test_batch_letterbox_single_bucket(self, fake_model):
+        """Vérifie qu'en letterbox toutes les images partagent un palier."""
+        detector = self._detector(fake_model, 'letterbox')
+        images = [
+            np.zeros((1200, 1600, 3), dtype=np.uint8),
+            np.zeros((900, 500, 3), dtype=np.uint8),
+        ]
+        detector.detect_batch(images)
+        assert detector.model.input_shapes == [(2, 300, 300, 3)]
+    
+    def test_cache_key_depends_on_preprocessing(self, fake_model, image):
+        """Vérifie que le cache distingue les modes de prétraitement."""
+        from core.cache import PredictionCache
+        cache = PredictionCache()
+        full = ObjectDetector("SSD MobileNet V2", cache=cache)
+        reduced = ObjectDetector("SSD MobileNet V2", cache=cache, preprocess='resize')
+        full.model = reduced.model = fake_model()
+        
+        full.predict(image)
+        reduced.predict(image)
+        assert len(cache) == 2
+
+
+class TestDetectTiled:
+    """Tests pour la détection par tuiles."""
+    
+    class OracleModel:
+        """Faux modèle qui détecte la zone non nulle de chaque tuile."""
+        
+        def __init__(self, max_batch=None):
+            import tensorflow as tf
+            from types import SimpleNamespace
+            self.input_shapes = []
+            self.max_batch = max_batch
+            if max_batch is not None:
+                spec = tf.TensorSpec([max_batch, None, None, 3], tf.uint8)
+                self.signatures = {'serving_default': SimpleNamespace(
+                    structured_input_signature=((), {'input_tensor': spec})
+                )}
+        
+        def __call__(self, input_tensor):
+            import tensorflow as tf
+            batch = input_tensor.numpy()
+            if self.max_batch is not None and len(batch) > self.max_batch:
+                raise ValueError(f"input_tensor: lot de {len(batch)} images")
+            self.input_shapes.append(batch.shape)
+            count, height, width = batch.shape[:3]
+            boxes = np.zeros((count, 1, 4), dtype=np.float32)
+            scores = np.zeros((count, 1), dtype=np.float32)
+            for row in range(count):
+                ys, xs = np.nonzero(batch[row, :, :, 0])
+                if ys.size:
+                    boxes[row, 0] = [ys.min() / height, xs.min() / width,
+                                     (ys.max() + 1) / height, (xs.max() + 1) / width]
+                    scores[row, 0] = 0.9
+            return {
+                'detection_boxes': tf.constant(boxes),
+                'detection_scores': tf.constant(scores),
+                'detection_classes': tf.constant(np.ones((count, 1), dtype=np.float32)),
+                'detection_masks': tf.constant(np.ones((count, 1, 15, 15), dtype=np.float32)),
+            }
     
     @pytest.fixture
     def detector(self):
-        """Crée un détecteur pour les tests."""
-        return ObjectDetector("SSD MobileNet V2")
+        """Détecteur branché sur le modèle oracle."""
+        detector = ObjectDetector("Mask R-CNN Inception ResNet V2")
+        detector.model = self.OracleModel()
+        return detector
+    
+    @pytest.fixture
+    def image(self):
+        """Image 600x700 avec un rectangle qui traverse plusieurs jonctions."""
+        image = np.zeros((600, 700, 3), dtype=np.uint8)
+        image[200:300, 100:400] = 255
+        return image
+    
+    def test_tiles_are_batched(self, detector, image):
+        """Vérifie que toutes les tuiles ont la même taille et sont groupées."""
+        detector.detect_tiled(image, tile_size=256, overlap=32, batch_size=4)
+        shapes = detector.model.input_shapes
+        # 3 positions en hauteur x 3 en largeur
+        assert [shape[0] for shape in shapes] == [4, 4, 1]
+        assert all(shape[1:] == (256, 256, 3) for shape in shapes)
+    
+    def test_fixed_batch_model_one_tile_per_call(self, detector, image):
+        """Vérifie qu'un modèle à signature [1, None, None, 3] reçoit une tuile par appel."""
+        expected = detector.detect_tiled(image, tile_size=256, overlap=32)
+        detector.model = self.OracleModel(max_batch=1)
+        progress = []
+        detections = detector.detect_tiled(
+            image, tile_size=256, overlap=32, batch_size=4,
+            on_progress=lambda done, total: progress.append(done)
+        )
+        
+        assert detector.model.input_shapes == [(1, 256, 256, 3)] * 9
+        assert progress == list(range(1, 10))
+        assert [d.box for d in detections] == [d.box for d in expected]
+        np.testing.assert_array_equal(detections[0].mask, expected[0].mask)
+    
+    def test_seam_object_merged(self, detector, image):
+        """Vérifie qu'un objet coupé par les jonctions donne une seule détection."""
+        detections = detector.detect_tiled(image, tile_size=256, overlap=32)
+        assert len(detections) == 1
+        assert detections[0].box == (100, 200, 400, 300)
+    
+    def test_mask_fragments_stitched(self, detector, image):
+        """Vérifie que le masque fusionné couvre tout l'objet."""
+        detection = detector.detect_tiled(image, tile_size=256, overlap=32)[0]
+        assert detection.mask_origin == (100, 200)
+        assert detection.mask.shape == (100, 300)
+        assert detection.mask.all()
+        np.testing.assert_array_equal(detection.full_mask(), image[:, :, 0] > 0)
+    
+    def test_allowed_classes(self, detector, image):
+        """Vérifie que les classes écartées sont filtrées dans chaque tuile."""
+        assert detector.detect_tiled(
+            image, tile_size=256, overlap=32, allowed_classes=[2]
+        ) == []
+        detections = detector.detect_tiled(
+            image, tile_size=256, overlap=32, allowed_classes=[1, 2]
+        )
+        assert [d.class_id for d in detections] == [1]
+    
+    def test_small_image_single_tile(self, fake_model, sample_numpy_image):
+        """Vérifie qu'une image plus petite qu'une tuile équivaut à detect()."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model()
+        expected = detector.detect(sample_numpy_image, threshold=0.3)
+        detections = detector.detect_tiled(sample_numpy_image, threshold=0.3)
+        assert [d.box for d in detections] == [d.box for d in expected]
+        assert [d.class_id for d in detections] == [d.class_id for d in expected]
+    
+    def test_invalid_overlap_raises(self, detector, image):
+        """Vérifie qu'un chevauchement plus grand que la tuile est refusé."""
+        with pytest.raises(ValueError):
+            detector.detect_tiled(image, tile_size=256, overlap=256)
+
+
+class TestWarmup:
+    """Tests pour le préchauffage du modèle au chargement."""
+    
+    def _load(self, fake_model, preprocess=None, warmup=True):
+        detector = ObjectDetector("SSD MobileNet V2", preprocess=preprocess)
+        with patch('core.detector.hub.load', return_value=fake_model()):
+            detector.load(warmup=warmup)
+        return detector
+    
+    def test_load_warms_up(self, fake_model):
+        """Vérifie que load() préchauffe le modèle et le déclare prêt."""
+        detector = self._load(fake_model)
+        assert detector.is_ready()
+        assert detector.model.calls > 0
+        assert detector.warmup_time >= 0.0
+    
+    def test_load_without_warmup(self, fake_model):
+        """Vérifie qu'un modèle chargé sans préchauffage n'est pas prêt."""
+        detector = self._load(fake_model, warmup=False)
+        assert detector.is_loaded()
+        assert not detector.is_ready()
+        assert detector.model.calls == 0
+        assert detector.warmup_time is None
+        
+        detector.warmup()
+        assert detector.is_ready()
+    
+    def test_not_ready_before_load(self):
+        """Vérifie qu'un détecteur non chargé n'est pas prêt."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        assert not detector.is_ready()
+        with pytest.raises(RuntimeError):
+            detector.warmup()
+    
+    def test_resize_shapes_match_preprocessing(self, fake_model):
+        """Vérifie que le préchauffage utilise les tailles produites par 'resize'."""
+        detector = self._load(fake_model, preprocess='resize')
+        # Paysage et portrait ; la photo 640x480 donne la même entrée que 4000x3000
+        assert detector.model.input_shapes == [(1, 225, 300, 3), (1, 300, 225, 3)]
+    
+    def test_letterbox_single_shape(self, fake_model):
+        """Vérifie qu'en letterbox une seule taille est préchauffée."""
+        detector = self._load(fake_model, preprocess='letterbox')
+        assert detector.model.input_shapes == [(1, 300, 300, 3)]
     
-    def test_mask_shape(self, detector):
-        """Vérifie les dimensions du masque généré."""
-        mask = detector._generate_ellipse_mask(10, 20, 50, 80, 100, 100)
-        assert mask.shape == (100, 100)
-    
-    def test_mask_dtype(self, detector):
-        """Vérifie le type de données du masque."""
-        mask = detector._generate_ellipse_mask(0, 0, 50, 50, 100, 100)
-        assert mask.dtype == np.float32
-    
-    def test_mask_values(self, detector):
-        """Vérifie que le masque contient des valeurs 0.0 et 1.0."""
-        mask = detector._generate_ellipse_mask(10, 10, 90, 90, 100, 100)
-        unique_values = np.unique(mask)
-        assert 0.0 in unique_values
-        assert 1.0 in unique_values
-    
-    def test_mask_has_ellipse_inside_box(self, detector):
-        """Vérifie que l'ellipse est à l'intérieur de la boîte."""
-        left, top, right, bottom = 20, 30, 80, 70
-        mask = detector._generate_ellipse_mask(left, top, right, bottom, 100, 100)
-        
-        # Les coins de la boîte doivent être vides
-        assert mask[top, left] == 0.0
-        assert mask[top, right-1] == 0.0
-        assert mask[bottom-1, left] == 0.0
-        assert mask[bottom-1, right-1] == 0.0
-        
-        # Le centre doit être rempli
-        center_y = (top + bottom) // 2
-        center_x = (left + right) // 2
-        assert mask[center_y, center_x] == 1.0
+    def test_warmup_does_not_touch_cache(self, fake_model):
+        """Vérifie que le préchauffage ne remplit pas le cache."""
+        from core.cache import PredictionCache
+        detector = ObjectDetector("SSD MobileNet V2", cache=PredictionCache())
+        with patch('core.detector.hub.load', return_value=fake_model()):
+            detector.load()
+        assert len(detector.cache) == 0
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module disk_cache.
+"""
+
+import pytest
+import numpy as np
+import subprocess
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cache import PredictionCache
+from core.detector import ObjectDetector
+from core.disk_cache import DiskPredictionCache, decode_results, encode_results
+
+
+def _results(value: float, with_masks: bool = False):
+    """Construit de fausses sorties de modèle."""
+    results = {
+        'detection_boxes': np.full((1, 4, 4), value, dtype=np.float32),
+        'detection_scores': np.full((1, 4), value, dtype=np.float32),
+        'detection_classes': np.ones((1, 4), dtype=np.float32),
+    }
+    if with_masks:
+        rng = np.random.default_rng(0)
+        results['detection_masks'] = rng.random((1, 4, 15, 15), dtype=np.float32)
+    return results
+
+
+# Écrit 20 entrées depuis un autre processus (sans importer TensorFlow)
+WRITER = """
+import sys
+import numpy as np
+from core.disk_cache import DiskPredictionCache
+cache = DiskPredictionCache(sys.argv[1])
+start = int(sys.argv[2])
+for index in range(start, start + 20):
+    cache.put(f"k{index}", {'detection_scores': np.full((1, 4), index, dtype=np.float32)})
+"""
+
+
+class TestEncoding:
+    """Tests pour la sérialisation des sorties."""
+    
+    def test_round_trip(self):
+        """Vérifie que les sorties relues sont identiques (hors masques)."""
+        results = _results(0.5)
+        decoded = decode_results(encode_results(results))
+        assert decoded.keys() == results.keys() | {'num_detections'}
+        for name, value in results.items():
+            np.testing.assert_array_equal(decoded[name], value)
+    
+    def test_masks_lossless(self):
+        """Vérifie que les masques relus donnent les mêmes masques reprojetés qu'un calcul."""
+        from utils.masks import reproject_masks
+        results = _results(0.5, with_masks=True)
+        masks = results['detection_masks']
+        masks[0, 0, 0, :3] = [0.4999, 0.5, 0.5001]
+        decoded = decode_results(encode_results(results))['detection_masks']
+        
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, masks)
+        boxes = np.array([[3, 5, 70, 41], [0, 0, 9, 120]])
+        for fresh, cached in zip(
+            reproject_masks(masks[0, :2], boxes, (128, 128)),
+            reproject_masks(decoded[0, :2], boxes, (128, 128))
+        ):
+            np.testing.assert_array_equal(fresh, cached)
+    
+    def test_only_readable_detections_stored(self):
+        """Vérifie que les détections sous min_score ne sont pas conservées, sans changer le résultat."""
+        # Sorties au format Mask R-CNN : 100 propositions, masques 33 x 33
+        rng = np.random.default_rng(0)
+        scores = np.sort(rng.random(100, dtype=np.float32))[::-1] ** 8
+        results = {
+            'detection_boxes': np.tile([[[0.1, 0.1, 0.6, 0.5]]], (1, 100, 1)).astype(np.float32),
+            'detection_classes': np.ones((1, 100), dtype=np.float32),
+            'detection_scores': scores[np.newaxis],
+            'detection_masks': rng.random((1, 100, 33, 33), dtype=np.float32),
+            'num_detections': np.array([100], dtype=np.float32),
+        }
+        full = encode_results(results)
+        compact = encode_results(results, min_score=0.05)
+        decoded = decode_results(compact)
+        
+        kept = int(np.count_nonzero(scores >= 0.05))
+        assert decoded['detection_masks'].shape == (1, kept, 33, 33)
+        assert decoded['num_detections'].tolist() == [kept]
+        # 69 propositions sur 100 sous 0.05 : environ 390 Ko -> 120 Ko par entrée
+        assert kept == 31
+        assert len(compact) < 0.35 * len(full)
+        
+        detector = ObjectDetector("Mask R-CNN Inception ResNet V2")
+        for threshold in (0.05, 0.5):
+            fresh = detector.postprocess(results, (64, 64), threshold=threshold, max_detections=100)
+            cached = detector.postprocess(decoded, (64, 64), threshold=threshold, max_detections=100)
+            assert [d.confidence for d in fresh] == [d.confidence for d in cached]
+            for a, b in zip(fresh, cached):
+                np.testing.assert_array_equal(a.mask, b.mask)
+    
+    def test_padding_rows_not_stored(self):
+        """Vérifie que les lignes au-delà de num_detections ne sont pas conservées."""
+        results = _results(0.5)
+        results['num_detections'] = np.array([2], dtype=np.float32)
+        decoded = decode_results(encode_results(results))
+        assert decoded['detection_scores'].shape == (1, 2)
+    
+    def test_unused_outputs_dropped(self):
+        """Vérifie que les sorties non utilisées ne sont pas conservées."""
+        results = _results(0.5)
+        results['raw_detection_scores'] = np.zeros((1, 1917, 91), dtype=np.float32)
+        assert 'raw_detection_scores' not in decode_results(encode_results(results))
+
+
+class TestDiskPredictionCache:
+    """Tests pour la classe DiskPredictionCache."""
+    
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Chemin de la base de test."""
+        return tmp_path / "cache" / "predictions.sqlite3"
+    
+    def test_miss_then_hit(self, path):
+        """Vérifie un défaut de cache suivi d'un succès."""
+        cache = DiskPredictionCache(path)
+        key = ("SSD MobileNet V2", "resize-v1", "abc")
+        assert cache.get(key) is None
+        cache.put(key, _results(0.5))
+        assert key in cache
+        np.testing.assert_array_equal(
+            cache.get(key)['detection_scores'], _results(0.5)['detection_scores']
+        )
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['writes']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+    
+    def test_persists_across_instances(self, path):
+        """Vérifie que les entrées survivent à la réouverture de la base."""
+        DiskPredictionCache(path).put('a', _results(0.3))
+        cache = DiskPredictionCache(path)
+        assert len(cache) == 1
+        assert cache.get('a') is not None
+    
+    def test_size_limit_evicts_least_recently_used(self, path):
+        """Vérifie que les entrées les moins récemment lues sont supprimées."""
+        size = len(encode_results(_results(0.1)))
+        cache = DiskPredictionCache(path, max_bytes=3 * size)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, _results(0.1))
+        cache.get('a')
+        cache.put('d', _results(0.1))
+        
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 3
+        assert cache.size() <= 3 * size
+        assert cache.stats()['evictions'] == 1
+    
+    def test_reads_do_not_write(self, path):
+        """Vérifie que les lectures ne sont écrites dans la base qu'au moment d'évincer."""
+        size = len(encode_results(_results(0.1)))
+        cache = DiskPredictionCache(path, max_bytes=2 * size)
+        cache.put('a', _results(0.1))
+        cache.put('b', _results(0.1))
+        connection = cache._connection()
+        changes = connection.total_changes
+        for _ in range(5):
+            cache.get('a')
+        assert connection.total_changes == changes
+        
+        # La lecture de 'a', encore en attente, protège 'a' de l'éviction
+        cache.put('c', _results(0.1))
+        assert 'a' in cache
+        assert 'b' not in cache
+    
+    def test_clear_keeps_pinned(self, path):
+        """Vérifie que clear() conserve les entrées épinglées sauf demande explicite."""
+        cache = DiskPredictionCache(path)
+        cache.put('a', _results(0.1), pinned=True)
+        cache.put('b', _results(0.1))
+        cache.clear()
+        assert 'a' in cache
+        assert 'b' not in cache
+        
+        cache.clear(include_pinned=True)
+        assert len(cache) == 0
+    
+    def test_concurrent_processes(self, path):
+        """Vérifie les écritures simultanées de plusieurs processus."""
+        DiskPredictionCache(path)
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-c", WRITER, str(path), str(start)],
+                cwd=Path(__file__).parent.parent
+            )
+            for start in (0, 20)
+        ]
+        for worker in workers:
+            assert worker.wait(timeout=60) == 0
+        assert len(DiskPredictionCache(path)) == 40
+    
+    def test_invalid_size_raises(self, path):
+        """Vérifie qu'une taille nulle est refusée."""
+        with pytest.raises(ValueError):
+            DiskPredictionCache(path, max_bytes=0)
+
+
+class TestPredictionCacheStore:
+    """Tests du cache disque utilisé comme second niveau de PredictionCache."""
+    
+    def test_restart_served_from_disk(self, tmp_path, fake_model, sample_numpy_image):
+        """Vérifie qu'après un redémarrage le modèle n'est pas rappelé."""
+        path = tmp_path / "predictions.sqlite3"
+        detector = ObjectDetector(
+            "SSD MobileNet V2", cache=PredictionCache(store=DiskPredictionCache(path))
+        )
+        detector.model = fake_model()
+        expected = detector.detect(sample_numpy_image, threshold=0.3)
+        
+        restarted = ObjectDetector(
+            "SSD MobileNet V2", cache=PredictionCache(store=DiskPredictionCache(path))
+        )
+        restarted.model = fake_model()
+        detections = restarted.detect(sample_numpy_image, threshold=0.3)
+        
+        assert restarted.model.calls == 0
+        assert [d.box for d in detections] == [d.box for d in expected]
+        # Lecture suivante servie par le niveau mémoire
+        restarted.detect(sample_numpy_image)
+        assert restarted.cache.stats()['hits'] == 1
+        assert restarted.cache.store.stats()['hits'] == 1
+    
+    def test_lookup_then_predict_counts_one_miss(self, tmp_path, fake_model, sample_numpy_image):
+        """Vérifie qu'une image nouvelle ne compte qu'un défaut par niveau."""
+        detector = ObjectDetector(
+            "SSD MobileNet V2",
+            cache=PredictionCache(store=DiskPredictionCache(tmp_path / "predictions.sqlite3"))
+        )
+        detector.model = fake_model()
+        
+        # Vérification préalable de l'application, puis inférence
+        assert detector.lookup(sample_numpy_image) is None
+        detector.predict(sample_numpy_image)
+        assert detector.lookup(sample_numpy_image) is not None
+        
+        assert detector.cache.stats()['misses'] == 1
+        assert detector.cache.stats()['hits'] == 1
+        assert detector.cache.store.stats()['misses'] == 1
+        assert detector.cache.store.stats()['hit_rate'] == 0.0
+    
+    def test_key_depends_on_preprocessing_version(self, sample_numpy_image):
+        """Vérifie que la clé contient la version du prétraitement."""
+        from core import detector as detector_module
+        detector = ObjectDetector("SSD MobileNet V2", cache=PredictionCache())
+        key = detector.cache_key(sample_numpy_image)
+        assert key[1].endswith(f"v{detector_module.PREPROCESS_VERSION}")
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module gallery.
+"""
+
+import os
+import pytest
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.gallery import GalleryIndex
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Dossier d'exemples : 'chat' avec 20 images, 'chien' avec une image."""
+    root = tmp_path / "exemple"
+    (root / "chat").mkdir(parents=True)
+    (root / "chien").mkdir()
+    for index in range(20):
+        Image.new('RGB', (800, 600), color=(index, 0, 0)).save(root / "chat" / f"{index:02d}.jpg")
+    Image.new('RGBA', (300, 500)).save(root / "chien" / "a.png")
+    (root / "chat" / "notes.txt").write_text("pas une image")
+    return root
+
+
+@pytest.fixture
+def gallery(root, tmp_path):
+    """Index de test avec des vignettes de 64 pixels."""
+    return GalleryIndex(root, tmp_path / "thumbnails", thumbnail_size=64)
+
+
+def _touch_directory(path: Path) -> None:
+    """Avance la date de modification d'un dossier (résolution des systèmes de fichiers)."""
+    mtime = path.stat().st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(mtime, mtime))
+
+
+class TestIndex:
+    """Tests pour les listes de catégories et d'images."""
+    
+    def test_categories_and_images(self, gallery):
+        """Vérifie les catégories et les images indexées, triées par nom."""
+        assert gallery.categories() == ["chat", "chien"]
+        images = gallery.images("chat")
+        assert len(images) == 20
+        assert images[0].name == "00.jpg"
+        assert gallery.images("inconnue") == []
+    
+    def test_unchanged_folder_not_rescanned(self, gallery):
+        """Vérifie que les réexécutions ne relisent pas les dossiers."""
+        gallery.categories()
+        gallery.images("chat")
+        scans = gallery.stats()['scans']
+        for _ in range(3):
+            gallery.categories()
+            gallery.images("chat")
+        assert gallery.stats()['scans'] == scans
+    
+    def test_new_image_invalidates_category(self, gallery, root):
+        """Vérifie qu'une image ajoutée apparaît dans l'index."""
+        gallery.images("chien")
+        Image.new('RGB', (10, 10)).save(root / "chien" / "b.jpg")
+        _touch_directory(root / "chien")
+        assert [path.name for path in gallery.images("chien")] == ["a.png", "b.jpg"]
+    
+    def test_paging(self, gallery):
+        """Vérifie le découpage d'une catégorie en pages."""
+        assert gallery.page_count("chat", 8) == 3
+        assert [path.name for path in gallery.page("chat", 2, 8)] == [
+            "16.jpg", "17.jpg", "18.jpg", "19.jpg"
+        ]
+        assert gallery.page("chat", 3, 8) == []
+        assert gallery.page_count("inconnue", 8) == 1
+
+
+class TestThumbnails:
+    """Tests pour les vignettes sur disque."""
+    
+    def test_thumbnail_created_once(self, gallery):
+        """Vérifie que la vignette est réduite, en JPEG, et réutilisée."""
+        path = gallery.images("chat")[0]
+        thumbnail = gallery.thumbnail(path)
+        with Image.open(thumbnail) as image:
+            assert image.format == 'JPEG'
+            assert max(image.size) == 64
+        assert gallery.thumbnail(path) == thumbnail
+        assert gallery.stats()['thumbnails_built'] == 1
+    
+    def test_modified_source_rebuilt(self, gallery):
+        """Vérifie qu'une image modifiée a une nouvelle vignette."""
+        path = gallery.images("chat")[0]
+        gallery.thumbnail(path)
+        Image.new('RGB', (600, 800), color=(0, 255, 0)).save(path)
+        mtime = path.stat().st_mtime_ns + 10 ** 9
+        os.utime(path, ns=(mtime, mtime))
+        
+        with Image.open(gallery.thumbnail(path)) as image:
+            assert image.size == (48, 64)
+        assert gallery.stats()['thumbnails_built'] == 2
+    
+    def test_png_with_alpha(self, gallery):
+        """Vérifie la vignette d'une image PNG transparente."""
+        thumbnail = gallery.thumbnail(gallery.images("chien")[0])
+        with Image.open(thumbnail) as image:
+            assert image.mode == 'RGB'
+            assert image.size == (38, 64)
+    
+    def test_exif_orientation_applied(self, gallery, root):
+        """Vérifie que la vignette suit l'orientation EXIF, comme l'image analysée."""
+        from utils.image_utils import decode_image
+        path = root / "chien" / "portrait.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotation de 90° dans le sens horaire à l'affichage
+        Image.new('RGB', (800, 400)).save(path, exif=exif)
+        _touch_directory(root / "chien")
+        
+        with Image.open(gallery.thumbnail(path)) as image:
+            assert image.size == (32, 64)
+        assert decode_image(path.read_bytes()).size == (400, 800)
+    
+    def test_invalid_size_raises(self, root, tmp_path):
+        """Vérifie qu'une taille de vignette nulle est refusée."""
+        with pytest.raises(ValueError):
+            GalleryIndex(root, tmp_path, thumbnail_size=0)
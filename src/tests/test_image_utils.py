@@ -7,6 +7,7 @@ import pytest
 import numpy as np
 from PIL import Image
 import tempfile
+import io
 import os
 import sys
 from pathlib import Path
@@ -14,7 +15,28 @@ from pathlib import Path
 # Ajouter le dossier src au path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.image_utils import load_image, image_to_array, array_to_image
+from utils.image_utils import (
+    DecodedImageCache,
+    array_to_image,
+    decode_image,
+    image_size,
+    image_to_array,
+    load_image
+)
+
+
+def _jpeg(size=(1600, 1200), orientation=None) -> bytes:
+    """Encode un dégradé en JPEG, avec une orientation EXIF optionnelle."""
+    width, height = size
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = np.linspace(0, 255, width, dtype=np.uint8)
+    image = Image.fromarray(pixels)
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=90, exif=exif)
+    return buffer.getvalue()
 
 
 class TestLoadImage:
@@ -139,3 +161,58 @@ class TestArrayToImage:
         
         # Vérifier que les pixels sont identiques
         assert list(original.getdata()) == list(restored.getdata())
+
+
+class TestDecodeImage:
+    """Tests pour image_size et decode_image."""
+    
+    def test_full_resolution_by_default(self):
+        """Vérifie le décodage pleine résolution sans taille visée."""
+        data = _jpeg()
+        assert image_size(data) == (1600, 1200)
+        image = decode_image(data)
+        assert image.mode == 'RGB'
+        assert image.size == (1600, 1200)
+    
+    def test_draft_reduces_jpeg(self):
+        """Vérifie le décodage réduit, jamais plus petit que la taille visée."""
+        image = decode_image(_jpeg(), target_side=400)
+        assert image.size == (400, 300)
+        assert decode_image(_jpeg(), target_side=500).size == (800, 600)
+        assert decode_image(_jpeg(), target_side=4000).size == (1600, 1200)
+    
+    def test_exif_orientation_applied(self):
+        """Vérifie que l'orientation EXIF est appliquée, avec ou sans réduction."""
+        data = _jpeg(orientation=6)
+        assert decode_image(data).size == (1200, 1600)
+        assert decode_image(data, target_side=400).size == (300, 400)
+    
+    def test_png_decoded_full_resolution(self):
+        """Vérifie que les formats autres que JPEG ne sont pas réduits."""
+        buffer = io.BytesIO()
+        Image.new('RGBA', (640, 480)).save(buffer, format='PNG')
+        image = decode_image(buffer.getvalue(), target_side=100)
+        assert image.mode == 'RGB'
+        assert image.size == (640, 480)
+
+
+class TestDecodedImageCache:
+    """Tests pour la classe DecodedImageCache."""
+    
+    def test_second_read_not_decoded(self):
+        """Vérifie qu'une réexécution ne décode pas une seconde fois."""
+        cache = DecodedImageCache()
+        data = _jpeg()
+        first = cache.get(data, 400)
+        assert cache.get(data, 400) is first
+        assert not first.flags.writeable
+        assert cache.stats()['hits'] == 1
+        assert cache.get(data) is not first
+    
+    def test_size_limit(self):
+        """Vérifie que les images les plus anciennes sont supprimées."""
+        cache = DecodedImageCache(max_bytes=300 * 400 * 3 + 1)
+        cache.get(_jpeg(), 400)
+        cache.get(_jpeg(orientation=6), 400)
+        assert len(cache) == 1
+        assert cache.stats()['bytes'] <= cache.max_bytes
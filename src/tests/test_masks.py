@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module masks.
+"""
+
+import pytest
+import numpy as np
+import tensorflow as tf
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.masks import ellipse_masks, reproject_masks, _size_chunks
+
+
+def _tf_reference(mask, box, image_size):
+    """Ancienne implémentation : tf.image.resize par détection."""
+    left, top, right, bottom = box
+    height, width = image_size
+    resized = tf.image.resize(
+        mask[..., tf.newaxis],
+        [max(bottom - top, 1), max(right - left, 1)],
+        method='bilinear'
+    ).numpy()[:, :, 0]
+    mask_h = max(min(height, bottom) - max(0, top), 0)
+    mask_w = max(min(width, right) - max(0, left), 0)
+    return resized[:mask_h, :mask_w] > 0.5
+
+
+@pytest.fixture
+def instances():
+    """Masques bruts et boîtes aléatoires dans une image 240x320."""
+    rng = np.random.default_rng(0)
+    count = 40
+    masks = rng.random((count, 33, 33)).astype(np.float32)
+    left = rng.integers(0, 318, count)
+    top = rng.integers(0, 238, count)
+    right = np.minimum(320, left + rng.integers(1, 200, count))
+    bottom = np.minimum(240, top + rng.integers(1, 200, count))
+    boxes = np.stack([left, top, right, bottom], axis=1)
+    return masks, boxes
+
+
+class TestReprojectMasks:
+    """Tests pour la reprojection groupée des masques Mask R-CNN."""
+    
+    def test_matches_tf_resize(self, instances):
+        """Vérifie l'équivalence avec tf.image.resize suivi du seuillage."""
+        masks, boxes = instances
+        result = reproject_masks(masks, boxes, (240, 320))
+        
+        mismatched = total = 0
+        for mask, raw, box in zip(result, masks, boxes):
+            expected = _tf_reference(raw, box, (240, 320))
+            assert mask.shape == expected.shape
+            mismatched += np.count_nonzero(mask != expected)
+            total += expected.size
+        assert mismatched <= total * 1e-4
+    
+    def test_small_chunks_give_same_result(self, instances):
+        """Vérifie que le découpage en lots ne change pas le résultat."""
+        masks, boxes = instances
+        whole = reproject_masks(masks, boxes, (240, 320))
+        chunked = reproject_masks(masks, boxes, (240, 320), max_pixels=5000)
+        for a, b in zip(whole, chunked):
+            np.testing.assert_array_equal(a, b)
+    
+    def test_box_partially_outside_image(self):
+        """Vérifie qu'une boîte qui dépasse de l'image est tronquée."""
+        masks = np.ones((1, 15, 15), dtype=np.float32)
+        result = reproject_masks(masks, np.array([[90, 80, 130, 120]]), (100, 100))
+        assert result[0].shape == (20, 10)
+        assert result[0].all()
+    
+    def test_degenerate_box(self):
+        """Vérifie qu'une boîte de taille nulle donne un masque vide."""
+        masks = np.ones((1, 15, 15), dtype=np.float32)
+        result = reproject_masks(masks, np.array([[10, 10, 10, 10]]), (100, 100))
+        assert result[0].size == 0
+    
+    def test_empty(self):
+        """Vérifie le cas sans instance."""
+        assert reproject_masks(np.zeros((0, 15, 15)), np.zeros((0, 4)), (10, 10)) == []
+
+
+class TestSizeChunks:
+    """Tests pour le regroupement des instances par taille."""
+    
+    def test_all_indices_once(self):
+        """Vérifie que chaque instance apparaît dans exactement un lot."""
+        rng = np.random.default_rng(1)
+        heights = rng.integers(1, 500, 100)
+        widths = rng.integers(1, 500, 100)
+        chunks = list(_size_chunks(heights, widths, max_pixels=100000))
+        assert sorted(np.concatenate(chunks).tolist()) == list(range(100))
+    
+    def test_budget_respected(self):
+        """Vérifie que les lots de plus d'une instance respectent le budget."""
+        rng = np.random.default_rng(2)
+        heights = rng.integers(1, 500, 100)
+        widths = rng.integers(1, 500, 100)
+        for chunk in _size_chunks(heights, widths, max_pixels=100000):
+            if len(chunk) > 1:
+                assert len(chunk) * heights[chunk].max() * widths[chunk].max() <= 100000
+
+
+class TestEllipseMasks:
+    """Tests pour le générateur vectorisé de masques elliptiques."""
+    
+    @staticmethod
+    def _pil_reference(box, image_size):
+        """Ancienne implémentation : ellipse tracée par PIL, recadrée sur la boîte."""
+        from PIL import Image, ImageDraw
+        left, top, right, bottom = box
+        height, width = image_size
+        mask_img = Image.new('L', (width, height), 0)
+        padding_x = int((right - left) * 0.05)
+        padding_y = int((bottom - top) * 0.05)
+        ImageDraw.Draw(mask_img).ellipse(
+            [left + padding_x, top + padding_y, right - padding_x, bottom - padding_y],
+            fill=255
+        )
+        full = np.array(mask_img) > 0
+        return full[max(top, 0):max(bottom + 1, 0), max(left, 0):max(right + 1, 0)]
+    
+    def test_mask_is_cropped_to_box(self):
+        """Vérifie que le masque est recadré sur la boîte (bornes incluses)."""
+        mask = ellipse_masks([(10, 20, 50, 80)], (100, 100))[0]
+        assert mask.shape == (61, 41)
+        assert mask.dtype == bool
+    
+    def test_mask_has_ellipse_inside_box(self):
+        """Vérifie que l'ellipse est à l'intérieur de la boîte."""
+        left, top, right, bottom = 20, 30, 80, 70
+        mask = ellipse_masks([(left, top, right, bottom)], (100, 100))[0]
+        
+        # Les coins de la boîte doivent être vides
+        assert not mask[0, 0]
+        assert not mask[0, -1]
+        assert not mask[-1, 0]
+        assert not mask[-1, -1]
+        
+        # Le centre doit être rempli
+        assert mask[(bottom - top) // 2, (right - left) // 2]
+    
+    def test_matches_pil_within_tolerance(self):
+        """Vérifie l'écart au tracé PIL : seuls des pixels du contour diffèrent."""
+        rng = np.random.default_rng(3)
+        image_size = (240, 320)
+        left = rng.integers(-10, 300, 200)
+        top = rng.integers(-10, 220, 200)
+        boxes = np.stack([
+            left, top,
+            left + rng.integers(0, 150, 200),
+            top + rng.integers(0, 150, 200)
+        ], axis=1)
+        
+        masks = ellipse_masks(boxes, image_size)
+        mismatched = total = 0
+        for mask, box in zip(masks, boxes):
+            expected = self._pil_reference(tuple(box), image_size)
+            assert mask.shape == expected.shape
+            errors = np.count_nonzero(mask != expected)
+            # Au plus une demi-rangée de pixels du contour
+            assert errors <= 0.5 * (box[2] - box[0] + box[3] - box[1] + 2)
+            mismatched += errors
+            total += np.count_nonzero(expected)
+        assert mismatched <= 0.005 * total
+    
+    def test_box_outside_image(self):
+        """Vérifie le cas d'une boîte hors de l'image."""
+        mask = ellipse_masks([(120, 120, 150, 150)], (100, 100))[0]
+        assert mask.size == 0
+    
+    def test_empty(self):
+        """Vérifie le cas sans boîte."""
+        assert ellipse_masks(np.zeros((0, 4)), (10, 10)) == []
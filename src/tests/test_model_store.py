@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module model_store.
+"""
+
+import pytest
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.model_store import ModelStore, ModelStoreError, main
+
+
+MODEL_NAME = "SSD MobileNet V2"
+
+
+@pytest.fixture
+def saved_model(tmp_path):
+    """Crée un petit SavedModel qui double son entrée."""
+    import tensorflow as tf
+    
+    class Double(tf.Module):
+        @tf.function(input_signature=[tf.TensorSpec([None], tf.float32)])
+        def __call__(self, x):
+            return {'output': 2.0 * x}
+    
+    path = tmp_path / "source"
+    tf.saved_model.save(Double(), str(path))
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, saved_model):
+    """Dépôt contenant le SavedModel de test sous le nom MODEL_NAME."""
+    store = ModelStore(tmp_path / "models")
+    store.import_model(MODEL_NAME, source=saved_model)
+    return store
+
+
+class TestModelStore:
+    """Tests pour ModelStore."""
+    
+    def test_import_writes_manifest(self, store):
+        """Vérifie que l'import écrit un manifeste avec taille et empreinte."""
+        manifest = store.manifest(MODEL_NAME)
+        assert manifest["model_name"] == MODEL_NAME
+        assert "saved_model.pb" in manifest["files"]
+        for info in manifest["files"].values():
+            assert len(info["sha256"]) == 64
+            assert info["size"] >= 0
+    
+    def test_has(self, store):
+        """Vérifie la présence des modèles dans le dépôt."""
+        assert store.has(MODEL_NAME)
+        assert not store.has("EfficientDet D0")
+    
+    def test_unknown_model_raises(self, store):
+        """Vérifie qu'un modèle inconnu est refusé."""
+        with pytest.raises(ValueError):
+            store.path("Modèle Inexistant")
+    
+    def test_import_requires_saved_model(self, tmp_path):
+        """Vérifie qu'un dossier sans SavedModel est refusé."""
+        with pytest.raises(ModelStoreError):
+            ModelStore(tmp_path / "models").import_model(MODEL_NAME, source=tmp_path)
+    
+    def test_list_models(self, store):
+        """Vérifie la liste des modèles et leur taille."""
+        entries = {entry["model_name"]: entry for entry in store.list_models()}
+        assert entries[MODEL_NAME]["stored"]
+        assert entries[MODEL_NAME]["size"] > 0
+        assert not entries["EfficientDet D0"]["stored"]
+    
+    def test_verify_intact(self, store):
+        """Vérifie qu'un modèle intact ne présente aucun problème."""
+        assert store.verify(MODEL_NAME) == []
+    
+    def test_verify_detects_corruption(self, store):
+        """Vérifie la détection d'un fichier modifié sans changer sa taille."""
+        file = store.path(MODEL_NAME) / "saved_model.pb"
+        data = bytearray(file.read_bytes())
+        data[-1] ^= 0xFF
+        file.write_bytes(bytes(data))
+        
+        assert store.verify(MODEL_NAME, checksums=False) == []
+        assert store.verify(MODEL_NAME) == ["empreinte incorrecte : saved_model.pb"]
+    
+    def test_load_refuses_missing_file(self, store):
+        """Vérifie que le chargement d'une copie incomplète est refusé."""
+        (store.path(MODEL_NAME) / "saved_model.pb").unlink()
+        with pytest.raises(ModelStoreError):
+            store.load(MODEL_NAME)
+    
+    def test_load_offline(self, store):
+        """Vérifie que le modèle se charge depuis le dépôt."""
+        import tensorflow as tf
+        model = store.load(MODEL_NAME)
+        result = model(tf.constant([1.0, 2.0]))
+        assert result['output'].numpy().tolist() == [2.0, 4.0]
+    
+    def test_benchmark_load(self, store):
+        """Vérifie les mesures de chargement à froid et à chaud."""
+        timings = store.benchmark_load(MODEL_NAME)
+        assert timings["warm"] > 0
+        assert timings["cold"] is None or timings["cold"] > 0
+
+
+class TestCommandLine:
+    """Tests pour la ligne de commande."""
+    
+    def test_import_list_verify(self, tmp_path, saved_model, capsys):
+        """Vérifie l'enchaînement import, list et verify."""
+        root = str(tmp_path / "models")
+        assert main(["--root", root, "import", MODEL_NAME, "--source", str(saved_model)]) == 0
+        assert main(["--root", root, "list"]) == 0
+        assert main(["--root", root, "verify"]) == 0
+        output = capsys.readouterr().out
+        assert MODEL_NAME in output
+        assert "❌" not in output
+    
+    def test_verify_fails_on_corruption(self, store, capsys):
+        """Vérifie que verify échoue sur une copie modifiée."""
+        manifest_path = store.path(MODEL_NAME) / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["files"]["saved_model.pb"]["sha256"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest))
+        assert main(["--root", str(store.root), "verify", MODEL_NAME]) == 1
+
+
+class TestDetectorLoad:
+    """Tests pour le chargement du détecteur depuis le dépôt."""
+    
+    def test_prefers_store(self, fake_model):
+        """Vérifie que load() utilise la copie locale sans appeler TF Hub."""
+        from core.detector import ObjectDetector
+        store = Mock()
+        store.has.return_value = True
+        store.load.return_value = fake_model()
+        detector = ObjectDetector(MODEL_NAME, model_store=store)
+        
+        with patch('core.detector.hub.load') as hub_load:
+            detector.load(warmup=False)
+        
+        hub_load.assert_not_called()
+        store.load.assert_called_once_with(MODEL_NAME)
+        assert detector.load_source == 'store'
+        assert detector.load_time >= 0.0
+    
+    def test_falls_back_to_hub(self, tmp_path, fake_model):
+        """Vérifie le repli sur TF Hub pour un modèle absent du dépôt."""
+        from core.detector import ObjectDetector
+        detector = ObjectDetector(MODEL_NAME, model_store=ModelStore(tmp_path))
+        with patch('core.detector.hub.load', return_value=fake_model()) as hub_load:
+            detector.load(warmup=False)
+        hub_load.assert_called_once_with(detector.model_url)
+        assert detector.load_source == 'hub'
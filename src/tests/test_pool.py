@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module pool.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pool import DetectorPool, resident_memory
+
+
+MB = 1 << 20
+
+# Mémoire prise par le chargement de chaque modèle de test
+SIZES = {"A": 300 * MB, "B": 500 * MB, "C": 400 * MB, "D": 2000 * MB}
+
+
+class FakeProcess:
+    """Simule la mémoire résidente d'un processus qui charge des modèles."""
+    
+    def __init__(self):
+        self.memory = 100 * MB
+        self.loaded = []
+    
+    def factory(self, model_name):
+        self.memory += SIZES[model_name]
+        self.loaded.append(model_name)
+        return Mock(model_name=model_name)
+    
+    def measure(self):
+        return self.memory
+
+
+@pytest.fixture
+def process():
+    return FakeProcess()
+
+
+@pytest.fixture
+def pool(process):
+    """Pool de 1 Go."""
+    return DetectorPool(process.factory, memory_budget=1024 * MB, measure=process.measure)
+
+
+class TestDetectorPool:
+    """Tests pour DetectorPool."""
+    
+    def test_hit_returns_same_detector(self, pool, process):
+        """Vérifie qu'un modèle déjà chargé n'est pas rechargé."""
+        first = pool.get("A")
+        assert pool.get("A") is first
+        assert process.loaded == ["A"]
+        assert pool.stats()['hits'] == 1
+        assert pool.stats()['misses'] == 1
+    
+    def test_measures_loaded_size(self, pool):
+        """Vérifie la mesure de la mémoire prise par chaque chargement."""
+        pool.get("A")
+        pool.get("B")
+        assert pool.size_of("A") == SIZES["A"]
+        assert pool.memory_used() == SIZES["A"] + SIZES["B"]
+    
+    def test_evicts_least_recently_used(self, pool):
+        """Vérifie l'éviction du modèle le moins récemment utilisé."""
+        pool.get("A")
+        pool.get("B")
+        pool.get("A")
+        pool.get("C")  # 300 + 500 + 400 Mo > 1 Go : B est évincé
+        assert pool.models() == ["A", "C"]
+        assert pool.stats()['evictions'] == 1
+        assert pool.memory_used() <= pool.memory_budget
+    
+    def test_oversized_model_is_kept(self, pool):
+        """Vérifie qu'un modèle plus gros que le budget reste utilisable."""
+        pool.get("A")
+        detector = pool.get("D")
+        assert pool.models() == ["D"]
+        assert detector.model_name == "D"
+        assert pool.stats()['evictions'] == 1
+    
+    def test_reload_after_eviction(self, pool, process):
+        """Vérifie qu'un modèle évincé est rechargé à la demande."""
+        pool.get("A")
+        pool.get("D")
+        pool.get("A")
+        assert process.loaded == ["A", "D", "A"]
+        assert pool.stats()['misses'] == 3
+    
+    def test_clear(self, pool):
+        """Vérifie la libération de tous les détecteurs."""
+        pool.get("A")
+        pool.clear()
+        assert len(pool) == 0
+        assert "A" not in pool
+    
+    def test_on_evict_called(self, process):
+        """Vérifie que le rappel d'éviction reçoit chaque détecteur libéré."""
+        evicted = []
+        pool = DetectorPool(
+            process.factory,
+            memory_budget=1024 * MB,
+            measure=process.measure,
+            on_evict=lambda name, detector: evicted.append((name, detector.model_name))
+        )
+        pool.get("A")
+        pool.get("D")
+        assert evicted == [("A", "A")]
+        pool.clear()
+        assert evicted == [("A", "A"), ("D", "D")]
+    
+    def test_invalid_budget_raises(self, process):
+        """Vérifie qu'un budget nul est refusé."""
+        with pytest.raises(ValueError):
+            DetectorPool(process.factory, memory_budget=0)
+
+
+class TestResidentMemory:
+    """Tests pour resident_memory."""
+    
+    def test_positive_on_linux(self):
+        """Vérifie la lecture de la mémoire résidente sous Linux."""
+        if not Path("/proc/self/statm").exists():
+            pytest.skip("/proc indisponible")
+        assert resident_memory() > 0
+
+
+class TestBackgroundLoading:
+    """Tests pour le chargement en arrière-plan."""
+    
+    @pytest.fixture
+    def gate(self):
+        """Bloque le chargement jusqu'à l'appel de gate.set()."""
+        import threading
+        return threading.Event()
+    
+    @pytest.fixture
+    def slow_pool(self, process, gate):
+        def factory(model_name):
+            assert gate.wait(timeout=5)
+            return process.factory(model_name)
+        pool = DetectorPool(factory, memory_budget=1024 * MB, measure=process.measure)
+        yield pool
+        gate.set()
+        pool.shutdown()
+    
+    def test_preload_returns_immediately(self, slow_pool, gate):
+        """Vérifie que preload() rend la main avant la fin du chargement."""
+        future = slow_pool.preload("A")
+        assert not future.done()
+        assert slow_pool.status("A") == 'loading'
+        
+        gate.set()
+        assert future.result(timeout=5).model_name == "A"
+        assert slow_pool.status("A") == 'ready'
+    
+    def test_single_load_per_model(self, slow_pool, process, gate):
+        """Vérifie qu'un modèle en cours de chargement n'est pas rechargé."""
+        first = slow_pool.preload("A")
+        second = slow_pool.preload("A")
+        assert first is second
+        gate.set()
+        assert slow_pool.get("A", timeout=5) is first.result()
+        assert process.loaded == ["A"]
+        assert slow_pool.stats()['misses'] == 1
+    
+    def test_get_times_out_while_loading(self, slow_pool):
+        """Vérifie que get() peut abandonner l'attente d'un chargement."""
+        from concurrent.futures import TimeoutError
+        with pytest.raises(TimeoutError):
+            slow_pool.get("A", timeout=0.01)
+    
+    def test_load_error_propagates(self, process):
+        """Vérifie qu'une erreur de chargement est remontée et permet de réessayer."""
+        attempts = []
+        
+        def factory(model_name):
+            attempts.append(model_name)
+            if len(attempts) == 1:
+                raise OSError("réseau indisponible")
+            return process.factory(model_name)
+        
+        pool = DetectorPool(factory, memory_budget=1024 * MB, measure=process.measure)
+        with pytest.raises(OSError):
+            pool.get("A")
+        assert pool.status("A") == 'absent'
+        assert pool.get("A").model_name == "A"
+        pool.shutdown()
+    
+    def test_status_absent(self, pool):
+        """Vérifie le statut d'un modèle jamais demandé."""
+        assert pool.status("A") == 'absent'
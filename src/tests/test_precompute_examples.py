@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le précalcul des images d'exemple.
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from PIL import Image
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import INPUT_PREPROCESSING
+from core.cache import PredictionCache
+from core.detector import ObjectDetector
+from core.disk_cache import DiskPredictionCache
+from precompute_examples import list_example_images, main, precompute_model
+from utils.image_utils import image_to_array, load_image
+
+
+MODEL_NAME = "SSD MobileNet V2"
+
+
+@pytest.fixture
+def examples(tmp_path):
+    """Dossier d'exemples avec deux catégories et trois images."""
+    root = tmp_path / "exemple"
+    for category, values in (("chat", (10, 20)), ("chien", (30,))):
+        (root / category).mkdir(parents=True)
+        for value in values:
+            Image.new('RGB', (64, 48), color=(value, value, value)).save(
+                root / category / f"{value}.png"
+            )
+    (root / "chat" / ".DS_Store").write_bytes(b"")
+    return root
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Cache disque de test."""
+    return DiskPredictionCache(tmp_path / "predictions.sqlite3")
+
+
+class TestPrecompute:
+    """Tests pour precompute_model."""
+    
+    def test_list_example_images(self, examples):
+        """Vérifie que seules les images sont listées, toutes catégories confondues."""
+        paths = list_example_images(examples)
+        assert [path.name for path in paths] == ["10.png", "20.png", "30.png"]
+    
+    def test_results_pinned_and_reused(self, examples, store, fake_model):
+        """Vérifie que les résultats sont épinglés et que les images connues ne sont pas recalculées."""
+        model = fake_model()
+        paths = list_example_images(examples)
+        with patch('core.detector.hub.load', return_value=model):
+            first = precompute_model(MODEL_NAME, paths, store, batch_size=2)
+            second = precompute_model(MODEL_NAME, paths, store, batch_size=2)
+        
+        assert first == {'computed': 3, 'cached': 0, 'skipped': 0, 'unpinned': 0}
+        assert second == {'computed': 0, 'cached': 3, 'skipped': 0, 'unpinned': 0}
+        assert model.calls == 2
+        assert store.stats()['pinned'] == 3
+    
+    def test_fixed_batch_model_one_image_per_call(self, examples, store, fake_model):
+        """Vérifie qu'un modèle à signature [1, None, None, 3] reçoit une image par appel."""
+        model = fake_model(max_batch=1)
+        with patch('core.detector.hub.load', return_value=model):
+            counts = precompute_model(MODEL_NAME, list_example_images(examples), store)
+        
+        assert counts['computed'] == 3
+        assert model.input_shapes == [(1, 48, 64, 3)] * 3
+        assert store.stats()['pinned'] == 3
+    
+    def test_modified_image_recomputed(self, examples, store, fake_model):
+        """Vérifie qu'une image modifiée est recalculée et son ancienne entrée désépinglée."""
+        with patch('core.detector.hub.load', return_value=fake_model()):
+            precompute_model(MODEL_NAME, list_example_images(examples), store)
+            Image.new('RGB', (64, 48), color=(99, 0, 0)).save(examples / "chat" / "10.png")
+            counts = precompute_model(MODEL_NAME, list_example_images(examples), store)
+        
+        assert counts == {'computed': 1, 'cached': 2, 'skipped': 0, 'unpinned': 1}
+        assert store.stats()['pinned'] == 3
+        assert len(store) == 4
+    
+    def test_served_without_model(self, examples, store, fake_model):
+        """Vérifie qu'un détecteur non chargé sert les résultats précalculés."""
+        paths = list_example_images(examples)
+        with patch('core.detector.hub.load', return_value=fake_model()):
+            precompute_model(MODEL_NAME, paths, store)
+        
+        reader = ObjectDetector(
+            MODEL_NAME, cache=PredictionCache(store=store), preprocess=INPUT_PREPROCESSING
+        )
+        image = image_to_array(load_image(str(paths[0])))
+        results = reader.lookup(image)
+        assert not reader.is_loaded()
+        assert results is not None
+        assert len(reader.postprocess(results, image.shape[:2], threshold=0.3)) == 3
+    
+    def test_pinned_entries_not_evicted(self, examples, tmp_path, fake_model):
+        """Vérifie que la limite de taille ne supprime pas les résultats précalculés."""
+        store = DiskPredictionCache(tmp_path / "small.sqlite3", max_bytes=1)
+        with patch('core.detector.hub.load', return_value=fake_model()):
+            precompute_model(MODEL_NAME, list_example_images(examples), store)
+        store.put('autre', {'detection_scores': np.zeros((1, 4), dtype=np.float32)})
+        
+        assert len(store) == 3
+        assert store.stats()['pinned'] == 3
+
+
+class TestMain:
+    """Tests pour la ligne de commande."""
+    
+    def test_unknown_model(self, tmp_path, capsys):
+        """Vérifie qu'un modèle inconnu est refusé."""
+        assert main(["--models", "inconnu", "--cache", str(tmp_path / "c.sqlite3")]) == 1
+        assert "inconnu" in capsys.readouterr().err
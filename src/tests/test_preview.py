@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module preview.
+"""
+
+import io
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+from utils.preview import (
+    PreviewEncoder,
+    TransferStats,
+    column_width,
+    encode_image,
+    preview_size,
+    resize_for_preview,
+    scale_detections
+)
+
+
+class TestPreviewSize:
+    """Tests pour preview_size et resize_for_preview."""
+    
+    def test_small_image_unchanged(self, sample_rgb_image):
+        """Vérifie qu'une image plus étroite que l'affichage n'est pas réduite."""
+        assert preview_size((100, 80), 1280) == (100, 80)
+        assert resize_for_preview(sample_rgb_image, 1280) is sample_rgb_image
+    
+    def test_large_image_reduced(self):
+        """Vérifie que la réduction conserve les proportions."""
+        image = Image.new('RGB', (4000, 3000))
+        assert preview_size(image.size, 1280) == (1280, 960)
+        assert resize_for_preview(image, 1280).size == (1280, 960)
+    
+    def test_column_width(self):
+        """Vérifie la largeur d'une colonne, écarts entre colonnes déduits."""
+        assert column_width(1280, 1) == 1280
+        assert column_width(1280, 2) == 632
+        assert column_width(10, 20) == 1
+
+
+class TestScaleDetections:
+    """Tests pour scale_detections."""
+    
+    def test_boxes_and_masks_scaled(self):
+        """Vérifie la remise à l'échelle des boîtes et des masques recadrés."""
+        mask = np.zeros((40, 80), dtype=np.float32)
+        mask[:, 40:] = 1.0
+        detection = Detection(
+            3, 'voiture', 0.9, (100, 200, 180, 240),
+            mask=mask, mask_origin=(100, 200), image_size=(400, 800)
+        )
+        scaled, = scale_detections([detection], 0.5, 0.25)
+        
+        assert scaled.box == (50, 50, 90, 60)
+        assert scaled.mask_origin == (50, 50)
+        assert scaled.image_size == (100, 400)
+        assert scaled.mask.shape == (10, 40)
+        assert not scaled.mask[:, :20].any()
+        assert scaled.mask[:, 20:].all()
+    
+    def test_masks_stay_lazy(self):
+        """Vérifie que le masque d'origine n'est lu qu'à la lecture du masque réduit."""
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return np.ones((10, 10), dtype=np.float32)
+        
+        detection = Detection(1, 'chat', 0.8, (0, 0, 10, 10), mask_loader=loader)
+        scaled, = scale_detections([detection], 0.5, 0.5)
+        assert scaled.has_mask
+        assert calls == []
+        assert scaled.mask.shape == (5, 5)
+        assert calls == [1]
+    
+    def test_detection_without_mask(self, sample_detection):
+        """Vérifie qu'une détection sans masque reste sans masque."""
+        scaled, = scale_detections([sample_detection], 0.5, 0.5)
+        assert not scaled.has_mask
+
+
+class TestEncoding:
+    """Tests pour encode_image, PreviewEncoder et TransferStats."""
+    
+    def test_jpeg_smaller_than_png(self):
+        """Vérifie qu'un aperçu JPEG est bien plus léger qu'un PNG."""
+        rng = np.random.default_rng(0)
+        smooth = np.repeat(np.linspace(0, 255, 640, dtype=np.uint8)[np.newaxis], 480, axis=0)
+        noise = rng.integers(0, 8, (480, 640), dtype=np.uint8)
+        image = Image.fromarray(np.stack([smooth + noise] * 3, axis=-1))
+        
+        jpeg = encode_image(image, 'JPEG', quality=85)
+        assert Image.open(io.BytesIO(jpeg)).format == 'JPEG'
+        assert len(jpeg) < len(encode_image(image, 'png')) / 2
+    
+    def test_unknown_format_raises(self):
+        """Vérifie qu'un format non transmis tel quel par st.image est refusé."""
+        with pytest.raises(ValueError):
+            PreviewEncoder('WEBP')
+    
+    def test_encoder_records_bytes_and_time(self, sample_rgb_image):
+        """Vérifie le cumul des octets et du temps d'encodage par exécution."""
+        encoder = PreviewEncoder('JPEG', 80)
+        first = encoder.encode(sample_rgb_image)
+        second = encoder.encode(sample_rgb_image)
+        assert encoder.images == 2
+        assert encoder.bytes == len(first) + len(second)
+        assert encoder.encode_time > 0
+        
+        stats = TransferStats()
+        stats.record(encoder)
+        stats.record(PreviewEncoder())
+        result = stats.stats()
+        assert result['runs'] == 2
+        assert result['bytes'] == encoder.bytes
+        assert result['bytes_per_run'] == encoder.bytes / 2
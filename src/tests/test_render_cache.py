@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module render_cache.
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+from unittest.mock import patch
+from PIL import Image
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+from utils import render_cache
+from utils.render_cache import RenderCache, detections_signature
+from utils.visualization import draw_detections, draw_masks_only
+
+
+@pytest.fixture
+def image():
+    """Image aléatoire 300x400."""
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (300, 400, 3), dtype=np.uint8))
+
+
+@pytest.fixture
+def detections():
+    """Quatre détections masquées dont les labels ne chevauchent aucune boîte."""
+    rng = np.random.default_rng(1)
+    result = []
+    for index, (left, top) in enumerate([(10, 40), (200, 40), (10, 180), (220, 190)]):
+        mask = rng.random((80, 120)).astype(np.float32)
+        result.append(Detection(
+            index * 7 + 1, 'chat', 0.87, (left, top, left + 120, top + 80),
+            mask=mask, mask_origin=(left, top)
+        ))
+    return result
+
+
+class TestDetectionsSignature:
+    """Tests pour la fonction detections_signature."""
+    
+    def test_same_detections_same_signature(self, detections):
+        """Vérifie que la signature ne dépend que du contenu des détections."""
+        copies = [
+            Detection(d.class_id, d.class_name, d.confidence, d.box, mask_origin=d.mask_origin,
+                      mask_loader=lambda: None)
+            for d in detections
+        ]
+        assert detections_signature(copies) == detections_signature(detections)
+    
+    def test_masks_not_loaded(self, detections):
+        """Vérifie que les masques paresseux ne sont pas construits."""
+        loader_calls = []
+        lazy = Detection(1, 'chat', 0.5, (0, 0, 10, 10),
+                         mask_loader=lambda: loader_calls.append(1))
+        detections_signature([lazy])
+        assert loader_calls == []
+    
+    def test_different_detections_different_signature(self, detections):
+        """Vérifie qu'un post-traitement différent change la signature."""
+        assert detections_signature(detections[:3]) != detections_signature(detections)
+
+
+class TestRenderCache:
+    """Tests pour la classe RenderCache."""
+    
+    @pytest.mark.parametrize("options", [
+        {},
+        {'show_boxes': False},
+        {'show_labels': False},
+        {'show_masks': False},
+        {'mask_alpha': 200, 'box_thickness': 5, 'font_size': 20},
+    ])
+    def test_matches_draw_detections(self, image, detections, options):
+        """Vérifie que la recombinaison des calques donne le rendu direct."""
+        result = RenderCache().render(image, detections, **options)
+        np.testing.assert_array_equal(
+            np.array(result), np.array(draw_detections(image, detections, **options))
+        )
+    
+    def test_masks_only(self, image, detections):
+        """Vérifie la vue segmentation (masques seuls)."""
+        result = RenderCache().render(
+            image, detections, show_boxes=False, show_labels=False, mask_alpha=180
+        )
+        np.testing.assert_array_equal(
+            np.array(result), np.array(draw_masks_only(image, detections, alpha=180))
+        )
+    
+    def test_same_options_share_result(self, image, detections):
+        """Vérifie que deux vues avec les mêmes options partagent un seul rendu."""
+        cache = RenderCache()
+        first = cache.render(image, detections)
+        second = cache.render(image, detections)
+        assert second is first
+        assert cache.stats()['hits'] == 1
+    
+    def test_option_change_only_recombines(self, image, detections):
+        """Vérifie qu'une option d'affichage ne reconstruit aucun calque."""
+        cache = RenderCache()
+        cache.render(image, detections, mask_alpha=100)
+        built = cache.stats()['layers_built']
+        
+        with patch.object(render_cache, 'build_mask_layer') as build_masks, \
+                patch.object(render_cache, 'draw_overlay_layer') as draw_overlay:
+            cache.render(image, detections, mask_alpha=30)
+            cache.render(image, detections, show_boxes=False)
+            cache.render(image, detections, show_masks=False, show_labels=False)
+        
+        build_masks.assert_not_called()
+        draw_overlay.assert_not_called()
+        assert cache.stats()['layers_built'] == built == 3
+    
+    def test_new_detections_new_layers(self, image, detections):
+        """Vérifie qu'un autre ensemble de détections a ses propres calques."""
+        cache = RenderCache()
+        cache.render(image, detections)
+        cache.render(image, detections[:2])
+        assert len(cache) == 2
+        assert cache.stats()['layers_built'] == 6
+    
+    def test_image_key_reused(self, image, detections):
+        """Vérifie qu'une empreinte fournie évite de hacher l'image."""
+        cache = RenderCache()
+        with patch.object(render_cache, 'hash_image') as hash_image:
+            cache.render(image, detections, image_key='abc')
+        hash_image.assert_not_called()
+    
+    def test_lru_eviction(self, image, detections):
+        """Vérifie que les entrées les plus anciennes sont supprimées."""
+        cache = RenderCache(max_entries=2)
+        for count in (1, 2, 3):
+            cache.render(image, detections[:count])
+        assert len(cache) == 2
+    
+    def test_invalid_size_raises(self):
+        """Vérifie qu'une taille nulle est refusée."""
+        with pytest.raises(ValueError):
+            RenderCache(max_entries=0)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module rle.
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+from utils.rle import (
+    encode_mask,
+    decode_mask,
+    rle_area,
+    rle_iou,
+    compress_rle,
+    decompress_rle
+)
+
+
+@pytest.fixture
+def small_mask():
+    """Petit masque 6x5 avec deux composantes."""
+    mask = np.zeros((6, 5), dtype=bool)
+    mask[1:4, 1:3] = True
+    mask[5, 4] = True
+    return mask
+
+
+@pytest.fixture
+def random_masks():
+    """Masques aléatoires de tailles et densités variées."""
+    rng = np.random.default_rng(0)
+    masks = []
+    for _ in range(50):
+        height, width = rng.integers(1, 40, 2)
+        masks.append(rng.random((height, width)) < rng.random())
+    masks.append(np.ones((7, 3), dtype=bool))
+    masks.append(np.zeros((7, 3), dtype=bool))
+    return masks
+
+
+class TestEncodeDecode:
+    """Tests pour l'encodage et le décodage."""
+    
+    def test_column_major_counts(self, small_mask):
+        """Vérifie les counts COCO (ordre colonne, zéros en premier)."""
+        rle = encode_mask(small_mask)
+        assert rle == {'size': [6, 5], 'counts': [7, 3, 3, 3, 13, 1]}
+    
+    def test_starts_with_foreground(self):
+        """Vérifie qu'un masque qui commence par un pixel actif débute par 0."""
+        mask = np.zeros((2, 2), dtype=bool)
+        mask[0, 0] = True
+        assert encode_mask(mask)['counts'] == [0, 1, 3]
+    
+    def test_roundtrip(self, random_masks):
+        """Vérifie l'aller-retour encodage/décodage."""
+        for mask in random_masks:
+            np.testing.assert_array_equal(decode_mask(encode_mask(mask)), mask)
+    
+    def test_float_mask_is_thresholded(self):
+        """Vérifie qu'un masque flottant est seuillé à 0.5."""
+        mask = np.array([[0.2, 0.7], [0.5, 0.9]], dtype=np.float32)
+        np.testing.assert_array_equal(decode_mask(encode_mask(mask)), mask > 0.5)
+    
+    def test_cropped_mask_matches_full_mask(self, random_masks):
+        """Vérifie qu'un masque recadré s'encode comme le masque pleine image."""
+        rng = np.random.default_rng(1)
+        for crop in random_masks:
+            height, width = 50, 45
+            left, top = rng.integers(0, 30, 2)
+            full = np.zeros((height, width), dtype=bool)
+            visible = crop[:height - top, :width - left]
+            full[top:top + visible.shape[0], left:left + visible.shape[1]] = visible
+            
+            assert encode_mask(crop, (left, top), (height, width)) == encode_mask(full)
+    
+    def test_empty_mask(self):
+        """Vérifie l'encodage d'un masque vide."""
+        rle = encode_mask(np.zeros((4, 5), dtype=bool))
+        assert rle['counts'] == [20]
+        assert rle_area(rle) == 0
+    
+    def test_invalid_counts_raise(self):
+        """Vérifie qu'un RLE incohérent est refusé."""
+        with pytest.raises(ValueError):
+            decode_mask({'size': [2, 2], 'counts': [1, 1]})
+
+
+class TestCompression:
+    """Tests pour la forme compressée COCO."""
+    
+    def test_known_string(self, small_mask):
+        """Vérifie la chaîne produite par pycocotools pour un masque connu."""
+        assert compress_rle(encode_mask(small_mask))['counts'] == '7330:N'
+    
+    def test_roundtrip(self, random_masks):
+        """Vérifie l'aller-retour compression/décompression."""
+        for mask in random_masks:
+            rle = encode_mask(mask)
+            compressed = compress_rle(rle)
+            assert isinstance(compressed['counts'], str)
+            assert decompress_rle(compressed) == rle
+            np.testing.assert_array_equal(decode_mask(compressed), mask)
+    
+    def test_compressed_is_small(self):
+        """Vérifie qu'un grand masque plein se compresse fortement."""
+        mask = np.zeros((3000, 4000), dtype=bool)
+        mask[500:2500, 1000:3000] = True
+        compressed = compress_rle(encode_mask(mask))
+        assert len(compressed['counts']) < mask.size / 1000
+
+
+class TestMeasures:
+    """Tests pour l'aire et l'IoU calculées sur RLE."""
+    
+    def test_area(self, random_masks):
+        """Vérifie l'aire calculée sur RLE."""
+        for mask in random_masks:
+            assert rle_area(encode_mask(mask)) == mask.sum()
+            assert rle_area(compress_rle(encode_mask(mask))) == mask.sum()
+    
+    def test_iou_matches_dense(self):
+        """Vérifie l'IoU calculée sur RLE face au calcul dense."""
+        rng = np.random.default_rng(2)
+        for _ in range(50):
+            a = rng.random((20, 30)) < rng.random()
+            b = rng.random((20, 30)) < rng.random()
+            union = np.logical_or(a, b).sum()
+            expected = np.logical_and(a, b).sum() / union if union else 0.0
+            assert rle_iou(encode_mask(a), compress_rle(encode_mask(b))) == pytest.approx(expected)
+    
+    def test_iou_identical(self, small_mask):
+        """Vérifie que l'IoU d'un masque avec lui-même vaut 1."""
+        rle = encode_mask(small_mask)
+        assert rle_iou(rle, rle) == 1.0
+    
+    def test_iou_size_mismatch_raises(self, small_mask):
+        """Vérifie qu'une différence de taille est refusée."""
+        with pytest.raises(ValueError):
+            rle_iou(encode_mask(small_mask), encode_mask(np.ones((2, 2))))
+
+
+class TestDetectionExport:
+    """Tests pour l'export des masques de Detection."""
+    
+    def test_to_dict_includes_rle(self):
+        """Vérifie que to_dict peut inclure le masque encodé."""
+        crop = np.ones((3, 4), dtype=bool)
+        detection = Detection(
+            1, 'person', 0.9, (5, 2, 9, 5),
+            mask=crop, mask_origin=(5, 2), image_size=(10, 12)
+        )
+        result = detection.to_dict(include_mask=True)
+        
+        assert result['mask']['size'] == [10, 12]
+        assert isinstance(result['mask']['counts'], str)
+        np.testing.assert_array_equal(decode_mask(result['mask']), detection.full_mask())
+    
+    def test_to_dict_excludes_mask_by_default(self):
+        """Vérifie que le masque n'est pas exporté par défaut."""
+        detection = Detection(1, 'person', 0.9, (0, 0, 2, 2), mask=np.ones((2, 2)))
+        assert 'mask' not in detection.to_dict()
+    
+    def test_mask_rle_without_mask(self):
+        """Vérifie mask_rle sans masque."""
+        assert Detection(1, 'person', 0.9, (0, 0, 2, 2)).mask_rle() is None
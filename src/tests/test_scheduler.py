@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module scheduler.
+"""
+
+import pytest
+import numpy as np
+import sys
+import threading
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.detector import ObjectDetector
+from core.scheduler import InferenceScheduler
+
+
+@pytest.fixture
+def detector(fake_model):
+    """Détecteur branché sur le faux modèle."""
+    detector = ObjectDetector("SSD MobileNet V2")
+    detector.model = fake_model()
+    return detector
+
+
+@pytest.fixture
+def images():
+    """Quatre images différentes, de la taille d'un palier (sans complétion)."""
+    return [np.full((64, 128, 3), value, dtype=np.uint8) for value in range(4)]
+
+
+class TestInferenceScheduler:
+    """Tests pour InferenceScheduler."""
+    
+    def test_requests_grouped_in_one_batch(self, detector, images):
+        """Vérifie que des requêtes simultanées forment un seul micro-lot."""
+        scheduler = InferenceScheduler(detector, max_batch_size=8, max_wait=0.5)
+        futures = [scheduler.submit(image) for image in images]
+        results = [future.result(timeout=5) for future in futures]
+        scheduler.close()
+        
+        assert detector.model.calls == 1
+        assert detector.model.input_shapes == [(4, 64, 128, 3)]
+        assert len(results) == 4
+        assert scheduler.stats()['batch_sizes'] == {4: 1}
+    
+    def test_batch_size_limit(self, detector, images):
+        """Vérifie que les lots ne dépassent pas max_batch_size."""
+        scheduler = InferenceScheduler(detector, max_batch_size=2, max_wait=0.5)
+        futures = [scheduler.submit(image) for image in images + images[:1]]
+        for future in futures:
+            future.result(timeout=5)
+        scheduler.close()
+        
+        stats = scheduler.stats()
+        assert max(stats['batch_sizes']) <= 2
+        assert sum(size * count for size, count in stats['batch_sizes'].items()) == 5
+        assert stats['requests'] == 5
+    
+    def test_fixed_batch_model_one_request_per_call(self, fake_model, images):
+        """Vérifie qu'un modèle à signature [1, None, None, 3] reçoit une image par appel."""
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = fake_model(max_batch=1)
+        scheduler = InferenceScheduler(detector, max_batch_size=8, max_wait=0.5)
+        futures = [scheduler.submit(image) for image in images]
+        results = [future.result(timeout=5) for future in futures]
+        scheduler.close()
+        
+        assert scheduler.max_batch_size == 1
+        assert detector.model.input_shapes == [(1, 64, 128, 3)] * 4
+        assert len(results) == 4
+        assert scheduler.stats()['batch_sizes'] == {1: 4}
+    
+    def test_workers_overlap_on_fixed_batch_model(self, fake_model, images):
+        """Vérifie que deux requêtes s'exécutent en même temps sur un modèle à lot de 1."""
+        model = fake_model(max_batch=1)
+        # Chaque appel attend le suivant : des appels sérialisés dépasseraient le délai
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def overlapping(input_tensor):
+            barrier.wait()
+            return model(input_tensor)
+        
+        detector = ObjectDetector("SSD MobileNet V2")
+        detector.model = overlapping
+        detector.model.signatures = model.signatures
+        scheduler = InferenceScheduler(detector, max_wait=0.0, workers=2)
+        futures = [scheduler.submit(image) for image in images[:2]]
+        results = [future.result(timeout=10) for future in futures]
+        scheduler.close()
+        
+        assert len(results) == 2
+        assert model.input_shapes == [(1, 64, 128, 3)] * 2
+        assert scheduler.stats()['batch_sizes'] == {1: 2}
+    
+    def test_results_match_predict(self, detector, images):
+        """Vérifie que les résultats sont ceux de predict(), dans l'ordre."""
+        scheduler = InferenceScheduler(detector, max_wait=0.1)
+        got = scheduler.detect(images[0], threshold=0.3)
+        scheduler.close()
+        expected = detector.detect(images[0], threshold=0.3)
+        assert [d.box for d in got] == [d.box for d in expected]
+    
+    def test_queue_depth_histogram(self, detector, images):
+        """Vérifie l'histogramme de profondeur de file."""
+        scheduler = InferenceScheduler(detector, max_wait=0.5)
+        for future in [scheduler.submit(image) for image in images]:
+            future.result(timeout=5)
+        scheduler.close()
+        depths = scheduler.stats()['queue_depths']
+        assert sum(depths.values()) == scheduler.stats()['batches']
+        assert all(depth >= 1 for depth in depths)
+    
+    def test_errors_propagate(self, detector, images):
+        """Vérifie qu'une erreur du modèle est remontée à chaque requête du lot."""
+        def failing(_):
+            raise RuntimeError("échec du modèle")
+        detector.model = failing
+        scheduler = InferenceScheduler(detector, max_wait=0.1)
+        future = scheduler.submit(images[0])
+        with pytest.raises(RuntimeError, match="échec du modèle"):
+            future.result(timeout=5)
+        scheduler.close()
+    
+    def test_cancelled_request_skipped(self, detector, images):
+        """Vérifie qu'une requête annulée avant son exécution n'est pas traitée."""
+        scheduler = InferenceScheduler(detector, max_wait=0.3)
+        first = scheduler.submit(images[0])
+        second = scheduler.submit(images[1])
+        assert second.cancel()
+        first.result(timeout=5)
+        scheduler.close()
+        assert scheduler.stats()['batch_sizes'] == {1: 1}
+    
+    def test_submit_after_close_raises(self, detector, images):
+        """Vérifie qu'un ordonnanceur arrêté refuse les requêtes."""
+        scheduler = InferenceScheduler(detector)
+        scheduler.close()
+        with pytest.raises(RuntimeError):
+            scheduler.submit(images[0])
+    
+    def test_invalid_parameters(self, detector):
+        """Vérifie les paramètres invalides."""
+        with pytest.raises(ValueError):
+            InferenceScheduler(detector, max_batch_size=0)
+        with pytest.raises(ValueError):
+            InferenceScheduler(detector, max_wait=-1)
+        with pytest.raises(ValueError):
+            InferenceScheduler(detector, workers=0)
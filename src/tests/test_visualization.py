@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le module visualization.
+"""
+
+import pytest
+import numpy as np
+from PIL import Image, ImageDraw
+import sys
+from pathlib import Path
+
+# Ajouter le dossier src au path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+from utils.visualization import draw_detections, draw_masks_only, create_mask_overlay
+
+
+@pytest.fixture
+def image():
+    """Image de test avec un dégradé."""
+    arr = np.zeros((60, 80, 3), dtype=np.uint8)
+    arr[..., 0] = np.arange(80, dtype=np.uint8)[np.newaxis, :] * 3
+    arr[..., 1] = np.arange(60, dtype=np.uint8)[:, np.newaxis] * 4
+    return Image.fromarray(arr)
+
+
+@pytest.fixture
+def cropped_and_full():
+    """Même détection avec un masque recadré et un masque pleine image."""
+    crop = np.zeros((20, 30), dtype=bool)
+    crop[5:15, 5:25] = True
+    full = np.zeros((60, 80), dtype=np.float32)
+    full[15:35, 10:40] = crop
+    cropped = Detection(18, 'dog', 0.9, (10, 15, 40, 35), mask=crop, mask_origin=(10, 15))
+    legacy = Detection(18, 'dog', 0.9, (10, 15, 40, 35), mask=full)
+    return cropped, legacy
+
+
+class TestCroppedMasks:
+    """Tests pour le rendu des masques recadrés."""
+    
+    def test_draw_detections(self, image, cropped_and_full):
+        """Vérifie que le rendu est identique au masque pleine image."""
+        cropped, legacy = cropped_and_full
+        a = draw_detections(image, [cropped])
+        b = draw_detections(image, [legacy])
+        assert np.array_equal(np.array(a), np.array(b))
+    
+    def test_draw_masks_only(self, image, cropped_and_full):
+        """Vérifie le rendu des masques seuls."""
+        cropped, legacy = cropped_and_full
+        a = draw_masks_only(image, [cropped])
+        b = draw_masks_only(image, [legacy])
+        assert np.array_equal(np.array(a), np.array(b))
+    
+    def test_create_mask_overlay(self, image, cropped_and_full):
+        """Vérifie l'overlay de masques."""
+        cropped, legacy = cropped_and_full
+        a = create_mask_overlay(image, [cropped])
+        b = create_mask_overlay(image, [legacy])
+        assert np.array_equal(np.array(a), np.array(b))
+    
+    def test_crop_outside_image_is_clipped(self, image):
+        """Vérifie qu'un recadrage qui dépasse de l'image ne lève pas d'erreur."""
+        detection = Detection(
+            1, 'person', 0.9, (70, 50, 90, 70),
+            mask=np.ones((20, 20), dtype=bool), mask_origin=(70, 50)
+        )
+        result = draw_masks_only(image, [detection])
+        assert result.size == image.size
+
+
+def _legacy_masks(image, detections, alpha, selected_classes=None, blend=True):
+    """Ancien rendu : un calque RGBA et un collage par détection."""
+    from utils.colors import get_color_rgba
+    result = image.copy().convert('RGBA')
+    layer = Image.new('RGBA', result.size, (0, 0, 0, 0)) if blend else result
+    for detection in detections:
+        if detection.mask is None:
+            continue
+        if selected_classes is not None and detection.class_id not in selected_classes:
+            continue
+        mask_image = Image.fromarray((detection.mask > 0.5).astype(np.uint8) * 255, mode='L')
+        color_image = Image.new('RGBA', mask_image.size, get_color_rgba(detection.class_id, alpha))
+        layer.paste(color_image, detection.mask_origin, mask_image)
+    if blend:
+        result = Image.alpha_composite(result, layer)
+    return result.convert('RGB')
+
+
+class TestCompositingGolden:
+    """Compare le compositeur en une passe à l'ancien rendu par collages."""
+    
+    @pytest.fixture
+    def crowd(self):
+        """60 détections qui se chevauchent, dont certaines débordent de l'image."""
+        rng = np.random.default_rng(7)
+        detections = []
+        for index in range(60):
+            height, width = rng.integers(5, 40, 2)
+            left, top = int(rng.integers(-10, 75)), int(rng.integers(-10, 55))
+            mask = rng.random((height, width)).astype(np.float32)
+            class_id = int(rng.integers(1, 91))
+            detections.append(Detection(
+                class_id, 'objet', 0.5, (left, top, left + int(width), top + int(height)),
+                mask=mask, mask_origin=(left, top)
+            ))
+        detections.append(Detection(1, 'person', 0.5, (0, 0, 10, 10)))
+        return detections
+    
+    @pytest.mark.parametrize("alpha", [0, 1, 100, 150, 254, 255])
+    def test_draw_masks_only(self, image, crowd, alpha):
+        """Vérifie le rendu au pixel près pour plusieurs opacités."""
+        expected = _legacy_masks(image, crowd, alpha)
+        np.testing.assert_array_equal(
+            np.array(draw_masks_only(image, crowd, alpha=alpha)), np.array(expected)
+        )
+    
+    def test_transparent_image(self, image, crowd):
+        """Vérifie le mélange sur une image dont l'alpha n'est pas opaque."""
+        rgba = image.convert('RGBA')
+        rgba.putalpha(Image.fromarray(
+            (np.arange(60 * 80) % 256).astype(np.uint8).reshape(60, 80)
+        ))
+        expected = _legacy_masks(rgba, crowd, 120)
+        np.testing.assert_array_equal(
+            np.array(draw_masks_only(rgba, crowd, alpha=120)), np.array(expected)
+        )
+    
+    def test_draw_detections(self, image, crowd):
+        """Vérifie le rendu complet (masques, boîtes et labels)."""
+        from utils import visualization
+        expected = _legacy_masks(image, crowd, 100)
+        draw = ImageDraw.Draw(expected)
+        font = visualization._load_font(16)
+        for detection in crowd:
+            color = visualization.get_color_hex(detection.class_id)
+            visualization._draw_box(draw, detection, color, 3)
+            visualization._draw_label(draw, detection, color, font)
+        np.testing.assert_array_equal(
+            np.array(draw_detections(image, crowd)), np.array(expected)
+        )
+    
+    def test_create_mask_overlay(self, image, crowd):
+        """Vérifie l'overlay filtré par classe."""
+        selected = sorted({d.class_id for d in crowd[::2]})
+        expected = _legacy_masks(image, crowd, 128, selected, blend=False)
+        np.testing.assert_array_equal(
+            np.array(create_mask_overlay(image, crowd, selected)), np.array(expected)
+        )
+    
+    def test_more_masks_than_palette(self, image):
+        """Vérifie le rendu au-delà de 255 masques (carte d'indices 16 bits)."""
+        rng = np.random.default_rng(3)
+        detections = [
+            Detection(
+                int(rng.integers(1, 91)), 'objet', 0.5, (left, top, left + 8, top + 8),
+                mask=rng.random((8, 8)).astype(np.float32), mask_origin=(left, top)
+            )
+            for left, top in zip(rng.integers(0, 72, 300), rng.integers(0, 52, 300))
+        ]
+        np.testing.assert_array_equal(
+            np.array(draw_masks_only(image, detections)),
+            np.array(_legacy_masks(image, detections, 150))
+        )
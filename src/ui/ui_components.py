@@ -4,17 +4,26 @@ Composants UI Streamlit réutilisables.
 """
 
 import streamlit as st
-import pathlib
 from PIL import Image
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Union
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config import (
+    COMPARISON_COLUMNS,
+    DATA_DIR,
+    GALLERY_PAGE_SIZE,
+    GALLERY_THUMBNAIL_DIR,
+    GALLERY_THUMBNAIL_SIZE,
+    MIN_THRESHOLD,
+    SEGMENTATION_VIEW_ALPHA
+)
 from core.data_types import Detection
 from core.constants import COCO_LABELS, AVAILABLE_MODELS
 from core.detector import get_model_info
+from utils.gallery import GalleryIndex
 from utils.helpers import get_available_models
 from utils.visualization import draw_detections, draw_masks_only
 
@@ -106,7 +115,7 @@ def _render_parameters() -> Dict:
     
     threshold = st.slider(
         "Seuil de confiance",
-        min_value=0.0,
+        min_value=MIN_THRESHOLD,
         max_value=1.0,
         value=0.5,
         step=0.05,
@@ -135,8 +144,8 @@ def _render_display_options(model_name: str) -> Dict:
     show_labels = st.checkbox("Labels", value=True)
     show_masks = st.checkbox("Masques de segmentation", value=True)
     
-    # Options de masques
-    generate_approx_masks = True
+    # Options de masques (aucun masque approximatif si les masques sont masqués)
+    generate_approx_masks = False
     mask_opacity = 100
     
     if show_masks:
@@ -210,10 +219,17 @@ def render_header():
     ''', unsafe_allow_html=True)
 
 
-def render_image_upload() -> Optional[Image.Image]:
+def render_image_upload(
+    decode: Optional[Callable[[bytes], Image.Image]] = None,
+    gallery: Optional[GalleryIndex] = None
+) -> Optional[Image.Image]:
     """
     Affiche la zone de chargement d'image.
     
+    Args:
+        decode: Décodage du fichier chargé (par défaut Image.open)
+        gallery: Index des images d'exemple (par défaut un index sur data/exemple)
+    
     Returns:
         Image PIL ou None si aucune image chargée
     """
@@ -227,14 +243,16 @@ def render_image_upload() -> Optional[Image.Image]:
         )
         
         if uploaded_file:
+            if decode is not None:
+                return decode(uploaded_file.getvalue())
             return Image.open(uploaded_file)
     
     with tab2:
-        # Remonter au dossier racine du projet (JM_C) puis aller dans data/exemple
-        data_path = pathlib.Path(__file__).parent.parent.parent / "data" / "exemple"
+        if gallery is None:
+            gallery = GalleryIndex(DATA_DIR / "exemple", GALLERY_THUMBNAIL_DIR, GALLERY_THUMBNAIL_SIZE)
         
-        # Lister les sous-dossiers (catégories d'animaux)
-        categories = sorted([d.name for d in data_path.iterdir() if d.is_dir()])
+        # Sous-dossiers (catégories d'animaux), relus seulement s'ils ont changé
+        categories = gallery.categories()
         
         if categories:
             # Emoji pour chaque catégorie
@@ -251,25 +269,34 @@ def render_image_upload() -> Optional[Image.Image]:
                 format_func=lambda x: f"{category_emojis.get(x.lower(), '🐾')} {x.capitalize()}"
             )
             
-            # Charger les images de la catégorie sélectionnée
-            category_path = data_path / selected_category
-            extensions = ['*.jpg', '*.jpeg', '*.png', '*.webp']
-            sample_images = []
-            for ext in extensions:
-                sample_images.extend(category_path.glob(ext))
+            # Images de la catégorie sélectionnée, par pages
+            sample_images = gallery.images(selected_category)
             
             if sample_images:
-                # Limiter à 8 images max et afficher en grille
-                num_images = min(len(sample_images), 8)
+                page_count = gallery.page_count(selected_category, GALLERY_PAGE_SIZE)
+                page = 0
+                if page_count > 1:
+                    page = st.number_input(
+                        f"Page (sur {page_count})",
+                        min_value=1,
+                        max_value=page_count,
+                        value=1,
+                        key=f"gallery_page_{selected_category}"
+                    ) - 1
                 st.caption(f"{len(sample_images)} image(s) disponible(s)")
                 
+                # Grille de vignettes précalculées
                 cols = st.columns(4)
-                for idx, img_path in enumerate(sample_images[:num_images]):
-                    with cols[idx % 4]:
-                        img = Image.open(img_path)
-                        st.image(img, caption=img_path.stem[:15], use_container_width=True)
+                first = page * GALLERY_PAGE_SIZE
+                for offset, img_path in enumerate(
+                    gallery.page(selected_category, page, GALLERY_PAGE_SIZE)
+                ):
+                    idx = first + offset
+                    with cols[offset % 4]:
+                        st.image(str(gallery.thumbnail(img_path)), caption=img_path.stem[:15],
+                                 width="stretch")
                         if st.button("Utiliser", key=f"sample_{selected_category}_{idx}"):
-                            return img
+                            return Image.open(img_path)
             else:
                 st.info(f"Aucune image dans le dossier {selected_category}/")
         else:
@@ -317,7 +344,7 @@ def render_stats(detections: List[Detection]):
         """, unsafe_allow_html=True)
     
     with col4:
-        masks_count = sum(1 for d in detections if d.mask is not None)
+        masks_count = sum(1 for d in detections if d.has_mask)
         st.markdown(f"""
         <div class="stat-card">
             <div class="stat-number">{masks_count}</div>
@@ -329,24 +356,45 @@ def render_stats(detections: List[Detection]):
 def render_detection_results(
     image: Image.Image,
     detections: List[Detection],
-    config: dict
+    config: dict,
+    result_image: Optional[Union[Image.Image, bytes]] = None,
+    download_data: Optional[Callable[[], bytes]] = None
 ):
-    """Affiche les résultats de détection."""
+    """
+    Affiche les résultats de détection.
+    
+    Args:
+        image: Image originale
+        detections: Liste des détections
+        config: Configuration de la barre latérale
+        result_image: Rendu déjà calculé, image ou aperçu encodé (sinon dessiné ici)
+        download_data: Rendu pleine résolution en PNG, calculé au téléchargement
+    """
     
     # Dessiner les détections
-    result_image = draw_detections(
-        image,
-        detections,
-        show_boxes=config['show_boxes'],
-        show_labels=config['show_labels'],
-        show_masks=config['show_masks'],
-        mask_alpha=config['mask_opacity']
-    )
+    if result_image is None:
+        result_image = draw_detections(
+            image,
+            detections,
+            show_boxes=config['show_boxes'],
+            show_labels=config['show_labels'],
+            show_masks=config['show_masks'],
+            mask_alpha=config['mask_opacity']
+        )
     
     # Afficher l'image résultat
     st.image(result_image, caption="Résultat de la détection", 
              width="stretch")
     
+    if download_data is not None:
+        st.download_button(
+            "⬇️ Télécharger en pleine résolution (PNG)",
+            data=download_data,
+            file_name="detections.png",
+            mime="image/png",
+            on_click="ignore"
+        )
+    
     # Afficher les statistiques
     render_stats(detections)
     
@@ -358,7 +406,7 @@ def render_detection_results(
             col1, col2, col3 = st.columns([3, 1, 1])
             
             with col1:
-                mask_icon = "🎭" if det.mask is not None else ""
+                mask_icon = "🎭" if det.has_mask else ""
                 st.markdown(f"**{i}. {det.class_name}** {mask_icon}")
             
             with col2:
@@ -371,33 +419,50 @@ def render_detection_results(
 def render_comparison_view(
     image: Image.Image,
     detections: List[Detection],
-    config: dict
+    config: dict,
+    result_image: Optional[Union[Image.Image, bytes]] = None,
+    mask_image: Optional[Union[Image.Image, bytes]] = None,
+    original_image: Optional[bytes] = None
 ):
-    """Affiche une vue comparée original/détections."""
+    """
+    Affiche une vue comparée original/détections.
+    
+    Args:
+        image: Image originale
+        detections: Liste des détections
+        config: Configuration de la barre latérale
+        result_image: Rendu déjà calculé à la largeur d'une colonne, image ou
+            aperçu encodé (sinon dessiné ici)
+        mask_image: Rendu des masques seuls déjà calculé, pleine largeur (sinon dessiné ici)
+        original_image: Aperçu encodé de l'image originale à la largeur d'une
+            colonne (sinon l'image elle-même)
+    """
     
-    col1, col2 = st.columns(2)
+    col1, col2 = st.columns(COMPARISON_COLUMNS)
     
     with col1:
         st.markdown("#### 📷 Image originale")
-        st.image(image, width="stretch")
+        st.image(original_image if original_image is not None else image, width="stretch")
     
     with col2:
         st.markdown("#### 🎯 Détections")
-        result_image = draw_detections(
-            image,
-            detections,
-            show_boxes=config['show_boxes'],
-            show_labels=config['show_labels'],
-            show_masks=config['show_masks'],
-            mask_alpha=config['mask_opacity']
-        )
+        if result_image is None:
+            result_image = draw_detections(
+                image,
+                detections,
+                show_boxes=config['show_boxes'],
+                show_labels=config['show_labels'],
+                show_masks=config['show_masks'],
+                mask_alpha=config['mask_opacity']
+            )
         st.image(result_image, width="stretch")
     
     # Vue masques uniquement si disponible
-    has_masks = any(d.mask is not None for d in detections)
+    has_masks = any(d.has_mask for d in detections)
     if has_masks and config['show_masks']:
         st.markdown("#### 🎭 Vue segmentation")
-        mask_image = draw_masks_only(image, detections, alpha=180)
+        if mask_image is None:
+            mask_image = draw_masks_only(image, detections, alpha=SEGMENTATION_VIEW_ALPHA)
         st.image(mask_image, width="stretch")
 
 
@@ -3,25 +3,69 @@
 Package utils - Fonctions utilitaires.
 """
 
-from .colors import get_color_rgb, get_color_hex, get_color_rgba
-from .image_utils import load_image, image_to_array, array_to_image
-from .visualization import draw_detections, draw_masks_only, create_mask_overlay
+from .colors import get_color_rgb, get_color_hex, get_color_rgba, get_color_table
+from .image_utils import (
+    load_image, image_to_array, array_to_image, image_size, decode_image, DecodedImageCache
+)
+from .visualization import (
+    draw_detections, draw_masks_only, create_mask_overlay,
+    MaskLayer, build_mask_layer, apply_mask_layer, draw_overlay_layer
+)
+from .gallery import GalleryIndex
+from .render_cache import RenderCache, detections_signature
+from .preview import (
+    PreviewEncoder, TransferStats, column_width, encode_image, preview_size,
+    resize_for_preview, scale_detections
+)
 from .helpers import get_label, get_available_models
+from .boxes import box_iou, cluster_boxes
+from .rle import encode_mask, decode_mask, rle_area, rle_iou, compress_rle, decompress_rle
 
 __all__ = [
     # Colors
     'get_color_rgb',
     'get_color_hex',
     'get_color_rgba',
+    'get_color_table',
     # Image
     'load_image',
     'image_to_array',
     'array_to_image',
+    'image_size',
+    'decode_image',
+    'DecodedImageCache',
     # Visualization
     'draw_detections',
     'draw_masks_only',
     'create_mask_overlay',
+    'MaskLayer',
+    'build_mask_layer',
+    'apply_mask_layer',
+    'draw_overlay_layer',
+    # Render cache
+    'RenderCache',
+    'detections_signature',
+    # Preview
+    'PreviewEncoder',
+    'TransferStats',
+    'column_width',
+    'encode_image',
+    'preview_size',
+    'resize_for_preview',
+    'scale_detections',
+    # Gallery
+    'GalleryIndex',
     # Helpers
     'get_label',
     'get_available_models',
+    # Boxes
+    'box_iou',
+    'cluster_boxes',
+    # RLE
+    'encode_mask',
+    'decode_mask',
+    'rle_area',
+    'rle_iou',
+    'compress_rle',
+    'decompress_rle',
 ]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Opérations vectorisées sur les boîtes englobantes.
+
+Les boîtes sont en pixels au format (left, top, right, bottom).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """
+    Calcule l'IoU d'une boîte avec un ensemble de boîtes.
+
+    Args:
+        box: Boîte de référence (4,) ou boîtes (N, 4) comparées une à une
+        boxes: Boîtes à comparer (N, 4)
+
+    Returns:
+        IoU de chaque boîte (N,), 0.0 pour les boîtes vides
+    """
+    box = np.asarray(box, dtype=np.float64)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    inter_w = np.minimum(box[..., 2], boxes[:, 2]) - np.maximum(box[..., 0], boxes[:, 0])
+    inter_h = np.minimum(box[..., 3], boxes[:, 3]) - np.maximum(box[..., 1], boxes[:, 1])
+    intersection = np.maximum(inter_w, 0) * np.maximum(inter_h, 0)
+
+    area = np.maximum(box[..., 2] - box[..., 0], 0) * np.maximum(box[..., 3] - box[..., 1], 0)
+    areas = np.maximum(boxes[:, 2] - boxes[:, 0], 0) * np.maximum(boxes[:, 3] - boxes[:, 1], 0)
+
+    union = area + areas - intersection
+    return np.divide(intersection, union, out=np.zeros_like(union), where=intersection > 0)
+
+
+def cluster_boxes(
+    boxes: np.ndarray,
+    scores: np.ndarray,
+    classes: Optional[np.ndarray] = None,
+    iou_threshold: float = 0.5,
+    regions: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Regroupe les détections d'un même objet et retient la meilleure de chaque groupe.
+
+    Suppression des non-maxima : les boîtes sont parcourues par score
+    décroissant, et chaque boîte encore libre devient la représentante d'un
+    groupe qui absorbe les boîtes libres de même classe dont l'IoU avec elle
+    dépasse iou_threshold. Le recouvrement est toujours mesuré avec la
+    représentante : une chaîne de boîtes qui se chevauchent deux à deux
+    (une foule) n'est pas réduite à une seule détection.
+
+    Si regions donne la zone de l'image vue par chaque détection (sa tuile),
+    deux boîtes issues de zones différentes sont comparées après découpage à
+    l'intersection des deux zones : les fragments d'un objet coupé par la
+    jonction y coïncident, même si l'objet dépasse largement le chevauchement.
+
+    Args:
+        boxes: Boîtes (N, 4)
+        scores: Scores (N,)
+        classes: Classes (N,) ; toutes les boîtes sont comparées si None
+        iou_threshold: Recouvrement au-delà duquel une boîte est absorbée
+        regions: Zone (left, top, right, bottom) de chaque détection (N, 4)
+
+    Returns:
+        Tuple (indices retenus par score décroissant, indice de la détection
+        retenue du groupe de chaque boîte (N,))
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    scores = np.asarray(scores)
+    count = len(boxes)
+    if count == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    classes = np.zeros(count) if classes is None else np.asarray(classes)
+    parents = np.full(count, -1, dtype=np.int64)
+    keep = []
+
+    for index in np.argsort(-scores, kind='stable'):
+        if parents[index] >= 0:
+            continue
+        parents[index] = index
+        keep.append(index)
+        others = np.flatnonzero((parents < 0) & (classes == classes[index]))
+        if others.size == 0:
+            continue
+
+        box = boxes[index]
+        candidates = boxes[others]
+        if regions is not None:
+            # Comparaison limitée à la zone vue par les deux détections
+            area = np.concatenate([
+                np.maximum(regions[index, :2], regions[others, :2]),
+                np.minimum(regions[index, 2:], regions[others, 2:]),
+            ], axis=1)
+            box = np.concatenate([
+                np.maximum(box[:2], area[:, :2]), np.minimum(box[2:], area[:, 2:])
+            ], axis=1)
+            candidates = np.concatenate([
+                np.maximum(candidates[:, :2], area[:, :2]),
+                np.minimum(candidates[:, 2:], area[:, 2:]),
+            ], axis=1)
+        parents[others[box_iou(box, candidates) > iou_threshold]] = index
+
+    return np.array(keep, dtype=np.int64), parents
@@ -4,7 +4,9 @@ Gestion des couleurs pour la visualisation.
 """
 
 import colorsys
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+import numpy as np
 
 
 def generate_colors(n: int) -> List[Tuple[int, int, int]]:
@@ -30,6 +32,9 @@ def generate_colors(n: int) -> List[Tuple[int, int, int]]:
 # Palette de 100 couleurs pré-générées pour les classes
 CLASS_COLORS = generate_colors(100)
 
+# Même palette sous forme de table (100, 3) uint8, pour l'indexation NumPy
+CLASS_COLOR_TABLE = np.array(CLASS_COLORS, dtype=np.uint8)
+
 
 def get_color_rgb(class_id: int) -> Tuple[int, int, int]:
     """Retourne une couleur RGB pour un ID de classe."""
@@ -46,3 +51,17 @@ def get_color_rgba(class_id: int, alpha: int = 100) -> Tuple[int, int, int, int]
     """Retourne une couleur RGBA pour un ID de classe."""
     r, g, b = get_color_rgb(class_id)
     return (r, g, b, alpha)
+
+
+def get_color_table(class_ids: Sequence[int]) -> np.ndarray:
+    """
+    Retourne les couleurs RGB de plusieurs classes en une seule indexation.
+    
+    Args:
+        class_ids: IDs de classe
+        
+    Returns:
+        Tableau (N, 3) uint8, ligne i = get_color_rgb(class_ids[i])
+    """
+    class_ids = np.asarray(class_ids, dtype=np.int64)
+    return CLASS_COLOR_TABLE[class_ids % len(CLASS_COLOR_TABLE)]
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Index de la galerie d'images d'exemple.
+
+La liste des catégories et celle des images de chaque catégorie sont
+conservées en mémoire et invalidées par la date de modification du dossier
+concerné (ajout, suppression ou renommage d'une image). Les vignettes sont
+précalculées sur disque au premier affichage et régénérées seulement si la
+date de modification de l'image source change : l'affichage d'une page ne
+dépend plus de la taille des images d'origine.
+"""
+
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+
+# Version du calcul des vignettes, incluse dans leur nom : la changer
+# régénère les vignettes déjà écrites (2 : orientation EXIF appliquée)
+THUMBNAIL_VERSION = 2
+
+
+class GalleryIndex:
+    """
+    Index paginé des images d'exemple, avec vignettes sur disque.
+
+    ``root`` contient un sous-dossier par catégorie ; les vignettes sont
+    écrites dans ``thumbnail_dir`` avec la même arborescence.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        thumbnail_dir: Path,
+        thumbnail_size: int = 256,
+        extensions: Sequence[str] = ('jpg', 'jpeg', 'png', 'webp')
+    ):
+        """
+        Initialise l'index.
+
+        Args:
+            root: Dossier des exemples (un sous-dossier par catégorie)
+            thumbnail_dir: Dossier des vignettes
+            thumbnail_size: Plus grand côté des vignettes (pixels)
+            extensions: Extensions des images indexées
+        """
+        if thumbnail_size < 1:
+            raise ValueError("thumbnail_size doit être supérieur ou égal à 1")
+
+        self.root = Path(root)
+        self.thumbnail_dir = Path(thumbnail_dir)
+        self.thumbnail_size = thumbnail_size
+        self.extensions = {f".{extension.lower()}" for extension in extensions}
+        self._categories: Tuple[int, List[str]] = (-1, [])
+        self._images: Dict[str, Tuple[int, List[Path]]] = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+        self.thumbnails_built = 0
+
+    def categories(self) -> List[str]:
+        """
+        Liste les catégories, triées.
+
+        Returns:
+            Noms des sous-dossiers (liste vide si le dossier n'existe pas)
+        """
+        try:
+            mtime = self.root.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            if self._categories[0] == mtime:
+                return self._categories[1]
+        categories = sorted(path.name for path in self.root.iterdir() if path.is_dir())
+        with self._lock:
+            self._categories = (mtime, categories)
+            self.scans += 1
+        return categories
+
+    def images(self, category: str) -> List[Path]:
+        """
+        Liste les images d'une catégorie, triées par nom.
+
+        Args:
+            category: Nom de la catégorie
+
+        Returns:
+            Chemins des images (liste vide si la catégorie n'existe pas)
+        """
+        folder = self.root / category
+        try:
+            mtime = folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        with self._lock:
+            cached = self._images.get(category)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        images = sorted(
+            path for path in folder.iterdir()
+            if path.suffix.lower() in self.extensions and path.is_file()
+        )
+        with self._lock:
+            self._images[category] = (mtime, images)
+            self.scans += 1
+        return images
+
+    def page_count(self, category: str, page_size: int) -> int:
+        """Nombre de pages d'une catégorie (au moins une)."""
+        return max(1, math.ceil(len(self.images(category)) / page_size))
+
+    def page(self, category: str, page: int, page_size: int) -> List[Path]:
+        """
+        Retourne les images d'une page.
+
+        Args:
+            category: Nom de la catégorie
+            page: Numéro de page, à partir de 0
+            page_size: Nombre d'images par page
+
+        Returns:
+            Chemins des images de la page (liste vide au-delà de la dernière)
+        """
+        start = page * page_size
+        return self.images(category)[start:start + page_size]
+
+    def thumbnail(self, path: Path) -> Path:
+        """
+        Retourne la vignette d'une image, créée ou mise à jour si nécessaire.
+
+        La vignette porte la date de modification de sa source : elle est
+        régénérée dès que les deux diffèrent.
+
+        Args:
+            path: Chemin d'une image indexée
+
+        Returns:
+            Chemin de la vignette JPEG
+        """
+        path = Path(path)
+        target = self.thumbnail_dir / path.relative_to(self.root)
+        target = target.with_name(f"{target.name}.v{THUMBNAIL_VERSION}.jpg")
+        source_mtime = path.stat().st_mtime_ns
+        try:
+            if target.stat().st_mtime_ns == source_mtime:
+                return target
+        except FileNotFoundError:
+            pass
+
+        with Image.open(path) as image:
+            # Décodage réduit des JPEG (mise à l'échelle DCT)
+            image.draft('RGB', (self.thumbnail_size, self.thumbnail_size))
+            # Même orientation que l'image analysée (voir decode_image)
+            thumbnail = ImageOps.exif_transpose(image).convert('RGB')
+        thumbnail.thumbnail((self.thumbnail_size, self.thumbnail_size))
+
+        # Écriture atomique : plusieurs sessions peuvent afficher la même page
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}")
+        thumbnail.save(temporary, format='JPEG', quality=85)
+        os.utime(temporary, ns=(source_mtime, source_mtime))
+        os.replace(temporary, target)
+        with self._lock:
+            self.thumbnails_built += 1
+        return target
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les statistiques de l'index."""
+        with self._lock:
+            return {
+                'categories': len(self._categories[1]),
+                'scans': self.scans,
+                'thumbnails_built': self.thumbnails_built,
+            }
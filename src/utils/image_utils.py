@@ -3,8 +3,14 @@
 Utilitaires pour la manipulation d'images.
 """
 
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
 import numpy as np
-from PIL import Image
+from PIL import Image, ImageOps
 
 
 def load_image(path: str) -> Image.Image:
@@ -47,3 +53,123 @@ def array_to_image(array: np.ndarray) -> Image.Image:
         Image PIL
     """
     return Image.fromarray(array)
+
+
+def image_size(data: bytes) -> Tuple[int, int]:
+    """
+    Lit les dimensions d'une image encodée sans la décoder.
+    
+    Args:
+        data: Contenu du fichier image
+        
+    Returns:
+        Dimensions (largeur, hauteur) stockées dans le fichier
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+def decode_image(data: bytes, target_side: Optional[int] = None) -> Image.Image:
+    """
+    Décode une image chargée, réorientée selon ses métadonnées EXIF.
+    
+    Pour un JPEG, target_side active le mode brouillon de Pillow : la mise
+    à l'échelle DCT (1/2, 1/4 ou 1/8) décode directement une image réduite,
+    la plus petite dont le grand côté reste au moins égal à target_side.
+    Les autres formats sont décodés en pleine résolution.
+    
+    Args:
+        data: Contenu du fichier image
+        target_side: Grand côté minimal de l'image décodée (None = pleine résolution)
+        
+    Returns:
+        Image PIL en mode RGB
+    """
+    image = Image.open(io.BytesIO(data))
+    if target_side is not None and image.format == 'JPEG':
+        width, height = image.size
+        scale = target_side / max(width, height)
+        if scale < 1:
+            image.draft('RGB', (int(np.ceil(width * scale)), int(np.ceil(height * scale))))
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+class DecodedImageCache:
+    """
+    Cache LRU des images chargées décodées, borné en octets.
+    
+    La clé est l'empreinte du fichier et la taille visée : les réexécutions
+    du script ne décodent pas une seconde fois la même image. Les tableaux
+    stockés sont en lecture seule et partagés entre les sessions.
+    """
+    
+    def __init__(self, max_bytes: int = 256 << 20):
+        """
+        Initialise le cache.
+        
+        Args:
+            max_bytes: Taille maximale des tableaux conservés (octets)
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes doit être supérieur ou égal à 1")
+        
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(data: bytes, target_side: Optional[int] = None) -> Tuple[str, Optional[int]]:
+        """Construit la clé d'un fichier chargé pour une taille visée."""
+        return (hashlib.blake2b(data, digest_size=16).hexdigest(), target_side)
+    
+    def get(self, data: bytes, target_side: Optional[int] = None) -> np.ndarray:
+        """
+        Retourne le tableau décodé d'un fichier, décodé au premier appel.
+        
+        Args:
+            data: Contenu du fichier image
+            target_side: Grand côté minimal de l'image décodée (None = pleine résolution)
+            
+        Returns:
+            Tableau (H, W, 3) uint8 en lecture seule
+        """
+        key = self.make_key(data, target_side)
+        with self._lock:
+            array = self._entries.get(key)
+            if array is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return array
+            self.misses += 1
+        
+        array = np.asarray(decode_image(data, target_side))
+        array.flags.writeable = False
+        
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = array
+                self._bytes += array.nbytes
+            # Garder au moins l'entrée la plus récente
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return array
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, int]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Aperçus à la résolution d'affichage.
+
+st.image() reçoit par défaut des images PIL pleine résolution, que le
+serveur encode puis réduit avant de les envoyer. Les aperçus sont ici
+rendus à la largeur d'affichage (image réduite, détections remises à
+l'échelle) puis encodés une seule fois en JPEG (ou PNG) ; les octets sont transmis
+tels quels par st.image(). La pleine résolution n'est rendue que pour le
+téléchargement.
+"""
+
+import io
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_types import Detection
+
+
+# Formats transmis sans réencodage par st.image() (WebP y est converti en JPEG)
+PREVIEW_FORMATS = ('JPEG', 'PNG')
+
+
+def preview_size(size: Tuple[int, int], max_width: int) -> Tuple[int, int]:
+    """
+    Calcule les dimensions d'un aperçu.
+
+    Args:
+        size: Dimensions (largeur, hauteur) de l'image
+        max_width: Largeur d'affichage maximale
+
+    Returns:
+        Dimensions (largeur, hauteur), inchangées si l'image est assez petite
+    """
+    width, height = size
+    if width <= max_width:
+        return size
+    return max_width, max(1, round(height * max_width / width))
+
+
+def column_width(max_width: int, columns: int, gap: int = 16) -> int:
+    """
+    Calcule la largeur d'une colonne de st.columns().
+
+    Args:
+        max_width: Largeur de la zone découpée en colonnes
+        columns: Nombre de colonnes de même largeur
+        gap: Écart entre deux colonnes (1rem, valeur par défaut de Streamlit)
+
+    Returns:
+        Largeur d'une colonne, au moins un pixel
+    """
+    return max(1, (max_width - gap * (columns - 1)) // columns)
+
+
+def resize_for_preview(image: Image.Image, max_width: int) -> Image.Image:
+    """
+    Réduit une image à la largeur d'affichage.
+
+    Args:
+        image: Image PIL
+        max_width: Largeur d'affichage maximale
+
+    Returns:
+        Image réduite (l'image elle-même si elle est assez petite)
+    """
+    size = preview_size(image.size, max_width)
+    if size == image.size:
+        return image
+    return image.resize(size, Image.BILINEAR, reducing_gap=3.0)
+
+
+def _scale_mask(mask: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """Redimensionne un masque binaire (plus proche voisin) à (largeur, hauteur)."""
+    binary = Image.fromarray((mask > 0.5).astype(np.uint8) * 255)
+    return np.asarray(binary.resize(size, Image.NEAREST)) > 127
+
+
+def scale_detections(
+    detections: List[Detection],
+    scale_x: float,
+    scale_y: float
+) -> List[Detection]:
+    """
+    Remet des détections à l'échelle d'une image redimensionnée.
+
+    Les masques restent paresseux : chacun n'est lu et redimensionné qu'à
+    la première lecture du masque de la détection réduite.
+
+    Args:
+        detections: Détections dans l'image d'origine
+        scale_x: Rapport largeur de l'aperçu / largeur de l'image
+        scale_y: Rapport hauteur de l'aperçu / hauteur de l'image
+
+    Returns:
+        Nouvelles détections, dans le repère de l'aperçu
+    """
+    scaled = []
+    for detection in detections:
+        left, top, right, bottom = detection.box
+        box = (round(left * scale_x), round(top * scale_y),
+               round(right * scale_x), round(bottom * scale_y))
+        image_size = None
+        if detection.image_size is not None:
+            height, width = detection.image_size
+            image_size = (max(1, round(height * scale_y)), max(1, round(width * scale_x)))
+
+        mask_origin = detection.mask_origin
+        mask_loader = None
+        if detection.has_mask:
+            mask_left, mask_top = detection.mask_origin
+            mask_origin = (round(mask_left * scale_x), round(mask_top * scale_y))
+
+            def mask_loader(detection=detection, origin=mask_origin):
+                mask = detection.mask
+                if mask is None:
+                    return None
+                # Bords du masque remis à l'échelle, au moins un pixel
+                mask_left, mask_top = detection.mask_origin
+                width = max(1, round((mask_left + mask.shape[1]) * scale_x) - origin[0])
+                height = max(1, round((mask_top + mask.shape[0]) * scale_y) - origin[1])
+                return _scale_mask(mask, (width, height))
+
+        scaled.append(Detection(
+            detection.class_id,
+            detection.class_name,
+            detection.confidence,
+            box,
+            mask_origin=mask_origin,
+            image_size=image_size,
+            mask_loader=mask_loader
+        ))
+    return scaled
+
+
+def _check_format(image_format: str) -> str:
+    """Valide un format d'aperçu et le retourne en majuscules."""
+    image_format = image_format.upper()
+    if image_format not in PREVIEW_FORMATS:
+        raise ValueError(
+            f"Format d'aperçu inconnu : {image_format} (attendu : {', '.join(PREVIEW_FORMATS)})"
+        )
+    return image_format
+
+
+def encode_image(image: Image.Image, image_format: str = 'JPEG', quality: int = 85) -> bytes:
+    """
+    Encode une image pour l'envoi au navigateur.
+
+    Args:
+        image: Image PIL
+        image_format: 'JPEG' ou 'PNG'
+        quality: Qualité JPEG (1-95)
+
+    Returns:
+        Octets de l'image encodée
+    """
+    image_format = _check_format(image_format)
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        image.convert('RGB').save(buffer, format='JPEG', quality=quality)
+    else:
+        image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class PreviewEncoder:
+    """
+    Encode les aperçus d'une exécution et mesure ce qu'ils coûtent.
+
+    Un encodeur par exécution du script : ``images``, ``bytes`` et
+    ``encode_time`` cumulent les aperçus envoyés pendant cette exécution.
+    """
+
+    def __init__(self, image_format: str = 'JPEG', quality: int = 85):
+        """
+        Initialise l'encodeur.
+
+        Args:
+            image_format: 'JPEG' ou 'PNG'
+            quality: Qualité JPEG (1-95)
+        """
+        self.image_format = _check_format(image_format)
+        self.quality = quality
+        self.images = 0
+        self.bytes = 0
+        self.encode_time = 0.0
+
+    def encode(self, image: Image.Image) -> bytes:
+        """Encode un aperçu et comptabilise sa taille et son temps d'encodage."""
+        start = time.perf_counter()
+        data = encode_image(image, self.image_format, self.quality)
+        self.encode_time += time.perf_counter() - start
+        self.images += 1
+        self.bytes += len(data)
+        return data
+
+
+class TransferStats:
+    """Octets d'aperçus envoyés et temps d'encodage, cumulés sur les exécutions."""
+
+    def __init__(self):
+        """Initialise des statistiques vides."""
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.images = 0
+        self.bytes = 0
+        self.encode_time = 0.0
+
+    def record(self, encoder: PreviewEncoder) -> None:
+        """Ajoute les aperçus d'une exécution."""
+        with self._lock:
+            self.runs += 1
+            self.images += encoder.images
+            self.bytes += encoder.bytes
+            self.encode_time += encoder.encode_time
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les totaux et les moyennes par exécution."""
+        with self._lock:
+            runs = max(self.runs, 1)
+            return {
+                'runs': self.runs,
+                'images': self.images,
+                'bytes': self.bytes,
+                'encode_time': self.encode_time,
+                'bytes_per_run': self.bytes / runs,
+                'encode_time_per_run': self.encode_time / runs,
+            }
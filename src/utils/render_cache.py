@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Cache des calques de rendu des détections.
+
+Le rendu est découpé en calques indépendants des options d'affichage :
+masques (sans opacité), boîtes et labels. Ils sont conservés par image et
+par ensemble de détections, si bien qu'afficher ou masquer les boîtes, les
+labels ou changer l'opacité des masques ne fait que recombiner des calques
+déjà construits. La dernière image composée est aussi conservée : les
+onglets d'un même affichage partagent un seul rendu.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.cache import hash_image
+from core.data_types import Detection
+from .visualization import apply_mask_layer, build_mask_layer, draw_overlay_layer
+
+
+# Images composées conservées par entrée (vue principale et vue segmentation)
+MAX_RESULTS_PER_ENTRY = 2
+
+
+def detections_signature(detections: List[Detection]) -> str:
+    """
+    Calcule une empreinte d'un ensemble de détections.
+
+    Les masques ne sont pas lus (ils peuvent être paresseux) : une détection
+    est identifiée par sa classe, son score, sa boîte et l'emplacement de
+    son masque, qui suffisent à distinguer deux post-traitements.
+
+    Args:
+        detections: Liste des détections
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for detection in detections:
+        digest.update(repr((
+            detection.class_id,
+            detection.class_name,
+            float(detection.confidence),
+            tuple(detection.box),
+            detection.has_mask,
+            tuple(detection.mask_origin)
+        )).encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Cache LRU borné des calques de rendu, partagé entre les sessions.
+
+    Les images retournées sont partagées : elles ne doivent pas être
+    modifiées par l'appelant.
+    """
+
+    def __init__(self, max_entries: int = 4):
+        """
+        Initialise le cache.
+
+        Args:
+            max_entries: Nombre maximum de couples (image, détections) conservés
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries doit être supérieur ou égal à 1")
+
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.layers_built = 0
+
+    @staticmethod
+    def make_key(
+        image: Image.Image,
+        detections: List[Detection],
+        image_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Construit la clé d'un couple (image, détections).
+
+        Args:
+            image: Image PIL
+            detections: Liste des détections
+            image_key: Empreinte de l'image si elle est déjà connue
+        """
+        if image_key is None:
+            image_key = hash_image(np.asarray(image))
+        return (image_key, detections_signature(detections))
+
+    def _entry(self, key: Hashable) -> Dict:
+        """Retourne (ou crée) l'entrée d'une clé et la marque comme récente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {'layers': {}, 'results': OrderedDict()}
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _layer(self, entry: Dict, name: Hashable, build: Callable):
+        """Retourne un calque de l'entrée, construit au premier usage."""
+        layers = entry['layers']
+        with self._lock:
+            if name in layers:
+                return layers[name]
+        layer = build()
+        with self._lock:
+            self.layers_built += 1
+            return layers.setdefault(name, layer)
+
+    def render(
+        self,
+        image: Image.Image,
+        detections: List[Detection],
+        show_boxes: bool = True,
+        show_labels: bool = True,
+        show_masks: bool = True,
+        mask_alpha: int = 100,
+        box_thickness: int = 3,
+        font_size: int = 16,
+        image_key: Optional[str] = None
+    ) -> Image.Image:
+        """
+        Retourne l'image des détections pour des options d'affichage.
+
+        Mêmes options que draw_detections() ; les labels sont toujours
+        dessinés au-dessus de l'ensemble des boîtes.
+
+        Args:
+            image: Image PIL
+            detections: Liste des détections
+            show_boxes: Afficher les boîtes englobantes
+            show_labels: Afficher les labels
+            show_masks: Afficher les masques de segmentation
+            mask_alpha: Opacité des masques (0-255)
+            box_thickness: Épaisseur des boîtes
+            font_size: Taille de la police
+            image_key: Empreinte de l'image si elle est déjà connue
+
+        Returns:
+            Image RGB composée (partagée, à ne pas modifier)
+        """
+        entry = self._entry(self.make_key(image, detections, image_key))
+        # Opacité nulle = pas de masques
+        mask_alpha = mask_alpha if show_masks else 0
+        options = (show_boxes, show_labels, mask_alpha, box_thickness, font_size)
+
+        results = entry['results']
+        with self._lock:
+            result = results.get(options)
+            if result is not None:
+                results.move_to_end(options)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Recombiner les calques, construits seulement au premier usage
+        if mask_alpha > 0:
+            masks = self._layer(
+                entry, 'masks', lambda: build_mask_layer(image.size, detections)
+            )
+            result = apply_mask_layer(image, masks, mask_alpha)
+        else:
+            result = image.convert('RGB')
+
+        overlays = []
+        if show_boxes:
+            overlays.append(self._layer(
+                entry, ('boxes', box_thickness),
+                lambda: draw_overlay_layer(
+                    image.size, detections, show_labels=False, box_thickness=box_thickness
+                )
+            ))
+        if show_labels:
+            overlays.append(self._layer(
+                entry, ('labels', font_size),
+                lambda: draw_overlay_layer(
+                    image.size, detections, show_boxes=False, font_size=font_size
+                )
+            ))
+        for overlay in overlays:
+            if overlay is not None:
+                layer, origin = overlay
+                result.paste(layer, origin, layer)
+
+        with self._lock:
+            results[options] = result
+            while len(results) > MAX_RESULTS_PER_ENTRY:
+                results.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les statistiques du cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'layers_built': self.layers_built,
+            }
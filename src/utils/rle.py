@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Encodage RLE (run-length encoding) des masques, compatible COCO.
+
+Un RLE décrit un masque binaire (H, W) parcouru colonne par colonne (ordre
+Fortran) par la longueur des suites alternées de 0 et de 1, en commençant
+par les 0 : ``{'size': [H, W], 'counts': [...]}``. Les ``counts`` peuvent
+être une liste d'entiers (forme non compressée) ou la chaîne compressée
+produite par pycocotools (``maskUtils.encode``).
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+RLE = Dict[str, Union[List[int], str]]
+
+
+# =============================================================================
+# ENCODAGE / DÉCODAGE
+# =============================================================================
+
+def encode_mask(
+    mask: np.ndarray,
+    origin: Tuple[int, int] = (0, 0),
+    image_size: Optional[Tuple[int, int]] = None
+) -> RLE:
+    """
+    Encode un masque en RLE non compressé.
+
+    Le masque peut être recadré : il est alors placé à ``origin`` dans une
+    image de taille ``image_size`` sans allouer le masque pleine image.
+
+    Args:
+        mask: Masque (H, W) booléen, uint8 ou float (seuil 0.5)
+        origin: Position (left, top) du masque dans l'image
+        image_size: Dimensions (hauteur, largeur) de l'image ; par défaut
+            le plus petit cadre contenant le masque
+
+    Returns:
+        RLE ``{'size': [H, W], 'counts': [...]}``
+    """
+    crop = np.asarray(mask) > 0.5
+    left, top = origin
+    if image_size is None:
+        image_size = (top + crop.shape[0], left + crop.shape[1])
+    height, width = image_size
+    total = height * width
+
+    # Limiter le recadrage à l'image
+    crop = crop[:max(height - top, 0), :max(width - left, 0)]
+    crop_h, crop_w = crop.shape
+    if not crop.any():
+        return {'size': [height, width], 'counts': [total] if total else []}
+
+    # Une colonne par ligne, encadrée de zéros pour isoler les suites par colonne
+    padded = np.zeros((crop_w, crop_h + 2), dtype=np.int8)
+    padded[:, 1:-1] = crop.T
+    diff = np.diff(padded.ravel())
+    starts = np.flatnonzero(diff == 1) + 1
+    ends = np.flatnonzero(diff == -1) + 1
+
+    # Positions dans l'image complète, parcourue en ordre Fortran
+    stride = crop_h + 2
+    starts = (starts // stride + left) * height + starts % stride - 1 + top
+    ends = (ends // stride + left) * height + ends % stride - 1 + top
+
+    # Fusionner les suites qui se prolongent d'une colonne à la suivante
+    joined = starts[1:] == ends[:-1]
+    starts = starts[np.r_[True, ~joined]]
+    ends = ends[np.r_[~joined, True]]
+
+    boundaries = np.empty(2 * len(starts), dtype=np.int64)
+    boundaries[0::2] = starts
+    boundaries[1::2] = ends
+    counts = np.diff(np.r_[0, boundaries, total])
+    if counts[-1] == 0:
+        counts = counts[:-1]
+
+    return {'size': [height, width], 'counts': counts.tolist()}
+
+
+def decode_mask(rle: RLE) -> np.ndarray:
+    """
+    Décode un RLE (compressé ou non) en masque booléen.
+
+    Args:
+        rle: RLE ``{'size': [H, W], 'counts': ...}``
+
+    Returns:
+        Masque booléen (H, W)
+    """
+    height, width = rle['size']
+    counts = _counts_array(rle)
+    values = np.zeros(len(counts), dtype=bool)
+    values[1::2] = True
+    flat = np.repeat(values, counts)
+    if flat.size != height * width:
+        raise ValueError("RLE invalide : la somme des counts ne correspond pas à la taille")
+    return np.ascontiguousarray(flat.reshape(width, height).T)
+
+
+# =============================================================================
+# MESURES SUR RLE
+# =============================================================================
+
+def rle_area(rle: RLE) -> int:
+    """Retourne le nombre de pixels du masque, sans le décoder."""
+    return int(_counts_array(rle)[1::2].sum())
+
+
+def rle_iou(rle_a: RLE, rle_b: RLE) -> float:
+    """
+    Calcule l'IoU de deux masques directement sur leurs RLE.
+
+    Les frontières des deux RLE découpent l'image en segments sur lesquels
+    chaque masque est constant ; l'intersection est la somme des segments
+    couverts par les deux masques.
+
+    Args:
+        rle_a: Premier RLE
+        rle_b: Second RLE de même taille
+
+    Returns:
+        Intersection sur union (0.0 si les deux masques sont vides)
+    """
+    if list(rle_a['size']) != list(rle_b['size']):
+        raise ValueError("Les deux RLE doivent avoir la même taille")
+
+    counts_a = _counts_array(rle_a)
+    counts_b = _counts_array(rle_b)
+    total = int(rle_a['size'][0]) * int(rle_a['size'][1])
+
+    bounds_a = np.cumsum(counts_a)
+    bounds_b = np.cumsum(counts_b)
+    points = np.union1d(np.r_[0, bounds_a], bounds_b)
+    points = points[points < total]
+    lengths = np.diff(np.r_[points, total])
+
+    # Nombre impair de frontières franchies : pixel dans le masque
+    in_a = np.searchsorted(bounds_a, points, side='right') % 2 == 1
+    in_b = np.searchsorted(bounds_b, points, side='right') % 2 == 1
+
+    intersection = int(lengths[in_a & in_b].sum())
+    union = int(counts_a[1::2].sum()) + int(counts_b[1::2].sum()) - intersection
+    return intersection / union if union else 0.0
+
+
+# =============================================================================
+# FORMAT COMPRESSÉ COCO
+# =============================================================================
+
+def compress_rle(rle: RLE) -> RLE:
+    """
+    Convertit un RLE en forme compressée COCO (counts sous forme de chaîne).
+
+    Reprend l'encodage de pycocotools (``rleToString``) : chaque count, à
+    partir du troisième, est stocké en différence avec celui de rang i-2,
+    par groupes de 5 bits en ASCII.
+    """
+    if isinstance(rle['counts'], str):
+        return dict(rle)
+
+    counts = rle['counts']
+    chars = []
+    for i, value in enumerate(counts):
+        x = int(value)
+        if i > 2:
+            x -= int(counts[i - 2])
+        more = True
+        while more:
+            c = x & 0x1f
+            x >>= 5
+            more = x != -1 if c & 0x10 else x != 0
+            if more:
+                c |= 0x20
+            chars.append(chr(c + 48))
+
+    return {'size': list(rle['size']), 'counts': ''.join(chars)}
+
+
+def decompress_rle(rle: RLE) -> RLE:
+    """Convertit un RLE compressé COCO en forme non compressée."""
+    if not isinstance(rle['counts'], str):
+        return {'size': list(rle['size']), 'counts': list(rle['counts'])}
+
+    string = rle['counts']
+    counts: List[int] = []
+    p = 0
+    while p < len(string):
+        x = 0
+        k = 0
+        more = True
+        while more:
+            c = ord(string[p]) - 48
+            x |= (c & 0x1f) << (5 * k)
+            more = bool(c & 0x20)
+            p += 1
+            k += 1
+            if not more and (c & 0x10):
+                x |= -1 << (5 * k)
+        if len(counts) > 2:
+            x += counts[-2]
+        counts.append(x)
+
+    return {'size': list(rle['size']), 'counts': counts}
+
+
+def _counts_array(rle: RLE) -> np.ndarray:
+    """Retourne les counts d'un RLE sous forme de tableau int64."""
+    counts = rle['counts']
+    if isinstance(counts, str):
+        counts = decompress_rle(rle)['counts']
+    return np.asarray(counts, dtype=np.int64)